@@ -0,0 +1,269 @@
+import argparse
+import json
+import os
+import sys
+
+from src.constants.app_constants import (
+    FRAME_DURATION_MS, VAD_SENSITIVITY, BENCHMARK_REPEAT, BENCHMARK_REGRESSION_THRESHOLD,
+    BENCHMARK_SYNTHETIC_DURATIONS_S, VAD_SAMPLE_RATE, LIVE_BUFFER_SECONDS, LIVE_MAX_LAG_MS,
+    LIVE_FRAME_DURATIONS_MS, LIVE_FRAME_RATES, VAD_FRAME_OVERLAP, EXPORT_PADDING_MS, SERVER_HOST,
+    SERVER_PORT, SERVER_MAX_CONNECTIONS, SERVER_MAX_QUEUE, LOADGEN_REQUESTS, LOADGEN_CONCURRENCY
+)
+
+
+def run_batch(args):
+    """Run VAD over a folder of audio files and write per-file results."""
+    from src.services.batch_service import BatchVADService, find_audio_files
+
+    file_paths = find_audio_files(args.folder, recursive=args.recursive)
+    service = BatchVADService(sensitivity=args.sensitivity, frame_duration=args.frame_duration,
+                              workers=args.workers, energy_gate=args.energy_gate,
+                              overlap=args.overlap)
+    summary = service.run(file_paths, args.output, output_format=args.format,
+                          resume=not args.no_resume)
+    print(json.dumps(summary, indent=2))
+    return 0 if summary["failed"] == 0 else 1
+
+
+def run_bench(args):
+    """Benchmark load, VAD, segment and render stages; optionally compare with a baseline."""
+    import tempfile
+    from src.services.benchmark_service import (
+        BenchmarkRunner, compare_to_baseline, default_benchmark_files, prepare_synthetic_files
+    )
+
+    file_paths = args.files or ([] if args.no_samples else default_benchmark_files())
+    if args.synthetic:
+        work_dir = args.work_dir or os.path.join(tempfile.gettempdir(), "vad-benchmark")
+        file_paths += prepare_synthetic_files(work_dir, args.synthetic)
+
+    report = BenchmarkRunner(sensitivity=args.sensitivity, repeat=args.repeat).run(file_paths)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as baseline_file:
+        regressions = compare_to_baseline(report, json.load(baseline_file), args.threshold)
+    for regression in regressions:
+        before_ms, after_ms = regression["baseline_s"] * 1000, regression["current_s"] * 1000
+        print(f"REGRESSION {regression['file']} {regression['stage']}: {before_ms:.1f} ms -> "
+              f"{after_ms:.1f} ms ({regression['slowdown']:.2f}x)", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def run_live(args):
+    """Run VAD on a live PCM stream, printing one JSON line per frame and stats at the end."""
+    from src.services.live_vad_service import LiveVADSession
+    from src.services.vad_service import VADService
+    from src.utils.live_sources import FileReplaySource, SocketSource, StdinSource
+
+    if args.source == "file":
+        if not args.file:
+            raise SystemExit("--file is required with --source file")
+        source = FileReplaySource(args.file, args.rate, speed=args.speed)
+    elif args.source == "socket":
+        source = SocketSource(args.host, args.port, args.rate)
+        print(f"Listening on {source.address[0]}:{source.address[1]}", file=sys.stderr)
+    else:
+        source = StdinSource(args.rate)
+
+    session = LiveVADSession(VADService(args.sensitivity), source, frame_rate=args.rate,
+                             frame_duration=args.frame_duration,
+                             buffer_seconds=args.buffer_seconds, max_lag_ms=args.max_lag_ms)
+    session.start()
+    try:
+        for decision in session.decisions():
+            if not args.quiet:
+                print(json.dumps(decision._asdict()), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        session.stop()
+    print(json.dumps(session.get_stats(), indent=2), file=sys.stderr)
+    return 0
+
+
+def run_export(args):
+    """Export the speech of WAV files as a speech-only WAV, clips and a segment manifest."""
+    from src.services.export_service import SpeechExporter, export_speech
+    from src.services.vad_service import VADService
+
+    vad_service = VADService(args.sensitivity, energy_gate=args.energy_gate, overlap=args.overlap)
+    exporter = SpeechExporter(padding_ms=args.padding_ms, speech_only=not args.no_speech_file,
+                              clips=args.clips, manifest_format=args.manifest)
+    failed = 0
+    for file_path in args.files:
+        try:
+            summary = export_speech(file_path, vad_service, args.output, exporter,
+                                    frame_duration=args.frame_duration)
+        except (OSError, ValueError) as exc:
+            print(f"Failed {file_path}: {exc}", file=sys.stderr)
+            failed += 1
+            continue
+        print(json.dumps(summary))
+    return 0 if failed == 0 else 1
+
+
+def run_serve(args):
+    """Serve VAD over HTTP on a local port until interrupted."""
+    import asyncio
+    from src.services.vad_server import serve
+
+    def ready(address):
+        print(f"Listening on http://{address[0]}:{address[1]}", file=sys.stderr, flush=True)
+
+    try:
+        asyncio.run(serve(args.host, args.port, ready, workers=args.workers,
+                          use_processes=not args.threads, sensitivity=args.sensitivity,
+                          energy_gate=args.energy_gate, overlap=args.overlap,
+                          max_connections=args.max_connections, max_queue=args.max_queue))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def run_loadgen(args):
+    """Send concurrent VAD requests to a running server and report throughput and latency."""
+    import asyncio
+    from urllib.parse import urlencode
+    from src.services.load_generator import run_load
+
+    with open(args.file, "rb") as upload_file:
+        body = upload_file.read()
+    query = {"sensitivity": args.sensitivity} if args.sensitivity is not None else {}
+    if not body.startswith(b"RIFF"):
+        query["rate"] = args.rate
+    path = "/vad?" + urlencode(query) if query else "/vad"
+    report = asyncio.run(run_load(body, args.host, args.port, path, args.requests,
+                                  args.concurrency, args.chunked))
+    print(json.dumps(report, indent=2))
+    return 0 if report["errors"] == 0 else 1
+
+
+def build_parser():
+    """Build the argument parser for the headless entry points."""
+    parser = argparse.ArgumentParser(description="Headless Voice Activity Detection tools.")
+    parser.add_argument("--profile", metavar="TRACE_JSON",
+                        help="Record timing spans, print a summary and write a Chrome trace.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch = subparsers.add_parser("batch", help="Run VAD over a folder of WAV files.")
+    batch.add_argument("folder", help="Folder containing the audio files.")
+    batch.add_argument("-o", "--output", required=True, help="Output file (.jsonl or .csv).")
+    batch.add_argument("--format", choices=["jsonl", "csv"],
+                       help="Output format (default: from extension).")
+    batch.add_argument("-w", "--workers", type=int, help="Worker processes (default: all cores).")
+    batch.add_argument("-r", "--recursive", action="store_true", help="Include sub-folders.")
+    batch.add_argument("--no-resume", action="store_true",
+                       help="Overwrite output instead of resuming.")
+    batch.add_argument("--sensitivity", type=int, choices=range(4), default=VAD_SENSITIVITY)
+    batch.add_argument("--frame-duration", type=int, choices=[10, 20, 30],
+                       default=FRAME_DURATION_MS)
+    batch.add_argument("--overlap", type=float, default=VAD_FRAME_OVERLAP,
+                       help="Fraction of each VAD frame shared with the next (0 for none).")
+    batch.add_argument("--energy-gate", action="store_true",
+                       help="Skip webrtcvad on frames near the noise floor (faster, slightly "
+                            "different results).")
+    batch.set_defaults(handler=run_batch)
+
+    bench = subparsers.add_parser("bench", help="Benchmark the load, VAD and render stages.")
+    bench.add_argument("files", nargs="*", help="WAV files to benchmark (default: sample_audio/).")
+    bench.add_argument("--synthetic", type=float, nargs="*", metavar="SECONDS",
+                       default=BENCHMARK_SYNTHETIC_DURATIONS_S,
+                       help="Durations of generated speech-like files to add (e.g. 60 7200).")
+    bench.add_argument("--no-samples", action="store_true", help="Skip the bundled sample files.")
+    bench.add_argument("--work-dir", help="Where generated files are kept between runs.")
+    bench.add_argument("--repeat", type=int, default=BENCHMARK_REPEAT,
+                       help="Timed runs per stage; the median is reported.")
+    bench.add_argument("-o", "--output", help="Write the JSON report here instead of stdout.")
+    bench.add_argument("--baseline", help="Earlier JSON report to check for regressions.")
+    bench.add_argument("--threshold", type=float, default=BENCHMARK_REGRESSION_THRESHOLD,
+                       help="Relative slowdown that counts as a regression.")
+    bench.add_argument("--sensitivity", type=int, choices=range(4), default=VAD_SENSITIVITY)
+    bench.set_defaults(handler=run_bench)
+
+    live = subparsers.add_parser("live", help="Run VAD on live 16-bit mono PCM in real time.")
+    live.add_argument("--source", choices=["stdin", "socket", "file"], default="stdin")
+    live.add_argument("--file", help="Audio file replayed in real time with --source file.")
+    live.add_argument("--speed", type=float, default=1.0, help="Replay speed for --source file.")
+    live.add_argument("--host", default="127.0.0.1", help="Address to listen on (socket).")
+    live.add_argument("--port", type=int, default=0, help="TCP port to listen on (0 = any free).")
+    live.add_argument("--rate", type=int, choices=LIVE_FRAME_RATES, default=VAD_SAMPLE_RATE)
+    live.add_argument("--frame-duration", type=int, choices=LIVE_FRAME_DURATIONS_MS,
+                      default=FRAME_DURATION_MS)
+    live.add_argument("--buffer-seconds", type=float, default=LIVE_BUFFER_SECONDS)
+    live.add_argument("--max-lag-ms", type=float, default=LIVE_MAX_LAG_MS,
+                      help="Backlog beyond which frames are dropped to stay real time.")
+    live.add_argument("--sensitivity", type=int, choices=range(4), default=VAD_SENSITIVITY)
+    live.add_argument("-q", "--quiet", action="store_true", help="Only print the final stats.")
+    live.set_defaults(handler=run_live)
+
+    export = subparsers.add_parser("export", help="Write the speech of WAV files to disk.")
+    export.add_argument("files", nargs="+", help="WAV files to export.")
+    export.add_argument("-o", "--output", required=True, help="Output folder.")
+    export.add_argument("--padding-ms", type=float, default=EXPORT_PADDING_MS,
+                        help="Audio kept before and after each segment.")
+    export.add_argument("--clips", action="store_true", help="Also write one WAV per segment.")
+    export.add_argument("--no-speech-file", action="store_true",
+                        help="Skip the concatenated speech-only WAV.")
+    export.add_argument("--manifest", choices=["json", "csv"], default="json")
+    export.add_argument("--sensitivity", type=int, choices=range(4), default=VAD_SENSITIVITY)
+    export.add_argument("--frame-duration", type=int, choices=[10, 20, 30],
+                        default=FRAME_DURATION_MS)
+    export.add_argument("--overlap", type=float, default=VAD_FRAME_OVERLAP)
+    export.add_argument("--energy-gate", action="store_true")
+    export.set_defaults(handler=run_export)
+
+    serve = subparsers.add_parser("serve", help="Serve VAD to local processes over HTTP.")
+    serve.add_argument("--host", default=SERVER_HOST, help="Address to listen on.")
+    serve.add_argument("--port", type=int, default=SERVER_PORT, help="TCP port (0 = any free).")
+    serve.add_argument("-w", "--workers", type=int, help="Worker processes (default: all cores).")
+    serve.add_argument("--threads", action="store_true",
+                       help="Use worker threads instead of processes.")
+    serve.add_argument("--max-connections", type=int, default=SERVER_MAX_CONNECTIONS)
+    serve.add_argument("--max-queue", type=int, default=SERVER_MAX_QUEUE,
+                       help="Requests waiting for a worker beyond which the server answers 503.")
+    serve.add_argument("--sensitivity", type=int, choices=range(4), default=VAD_SENSITIVITY,
+                       help="Default for requests without ?sensitivity=.")
+    serve.add_argument("--overlap", type=float, default=VAD_FRAME_OVERLAP)
+    serve.add_argument("--energy-gate", action="store_true")
+    serve.set_defaults(handler=run_serve)
+
+    loadgen = subparsers.add_parser("loadgen", help="Load-test a running VAD server.")
+    loadgen.add_argument("file", help="WAV file, or raw 16-bit mono PCM, sent with each request.")
+    loadgen.add_argument("--host", default=SERVER_HOST)
+    loadgen.add_argument("--port", type=int, default=SERVER_PORT)
+    loadgen.add_argument("-n", "--requests", type=int, default=LOADGEN_REQUESTS)
+    loadgen.add_argument("-c", "--concurrency", type=int, default=LOADGEN_CONCURRENCY)
+    loadgen.add_argument("--chunked", action="store_true",
+                         help="Stream bodies with chunked transfer encoding.")
+    loadgen.add_argument("--rate", type=int, choices=LIVE_FRAME_RATES, default=VAD_SAMPLE_RATE,
+                         help="Sample rate of a raw PCM file.")
+    loadgen.add_argument("--sensitivity", type=int, choices=range(4))
+    loadgen.set_defaults(handler=run_loadgen)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not args.profile:
+        return args.handler(args)
+
+    from src.utils.instrumentation import profiler
+
+    profiler.enable()
+    try:
+        return args.handler(args)
+    finally:
+        # Only this process is traced; batch worker processes keep their own spans
+        print(profiler.format_summary(), file=sys.stderr)
+        profiler.export_chrome_trace(args.profile)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+import os
+
 # Audio-related constants
 AUDIO_FILE_TYPES = [("WAV files", "*.wav")]
 
@@ -5,6 +7,11 @@ AUDIO_FILE_TYPES = [("WAV files", "*.wav")]
 PLAY_BUTTON_LABEL = "Play"
 PAUSE_BUTTON_LABEL = "Pause"
 LOAD_BUTTON_LABEL = "Load Audio"
+LOADING_LABEL = "Loading..."
+ANALYZING_LABEL = "Detecting speech..."
+LOAD_FAILED_LABEL = "Could not load file"
+SENSITIVITY_LABEL = "VAD Sensitivity"
+SCANNING_LABEL = "Indexed {analyzed}/{files} files"
 
 # App Name
 APP_NAME = "Voice Activity Detection"
@@ -17,6 +24,130 @@ WINDOW_HEIGHT = 900
 # VAD Constants
 VAD_SENSITIVITY = 1  # Sensitivity level for VAD (0 to 3)
 FRAME_DURATION_MS = 30  # Frame duration in milliseconds for VAD processing
+VAD_SAMPLE_RATE = 16000  # Sample rate audio is converted to before VAD
+# Rates analyzed as they are. webrtcvad also takes 32 and 48 kHz, but downsamples them
+# internally at a higher cost than resampling to VAD_SAMPLE_RATE first
+VAD_NATIVE_RATES = (8000, 16000)
+STREAM_CHUNK_FRAMES = 16000  # Frames read per chunk when streaming audio from disk
+DECODE_CHUNK_FRAMES = 1 << 20  # Frames converted per block by the native WAV loader
+VAD_FRAME_OVERLAP = 0.5  # Fraction of each VAD frame shared with the next one
+VAD_HANGOVER_FRAMES = 2  # Frame steps a speech segment is held open after its last speech frame
+VAD_MIN_SPEECH_MS = 60  # Speech segments shorter than this are discarded
+VAD_MODES = (0, 1, 2, 3)  # webrtcvad aggressiveness levels evaluated by the all-modes analysis
+VAD_MODE_BATCH_FRAMES = 4096  # Frames sliced at a time and shared by all modes
+VAD_ENERGY_GATE = False  # Skip webrtcvad calls on frames close to the noise floor
+VAD_GATE_RATIO = 2.0  # Frames below this multiple of the noise floor RMS are non-speech
+VAD_GATE_MIN_RMS = 8.0  # Frames below this RMS (int16 units) are always non-speech
+VAD_GATE_MAX_RMS = 64.0  # Frames at or above this RMS always go to webrtcvad
+VAD_GATE_WINDOW_FRAMES = 200  # Frames the noise floor is tracked over (3 s at 30 ms, 50%)
+VAD_GATE_HANGOVER_FRAMES = 8  # Frames still sent to webrtcvad after a loud one, for its hangover
+RESAMPLE_HALF_LENGTH = 10  # Resampling filter half-length, in multiples of max(up, down)
+RESAMPLE_KAISER_BETA = 5.0  # Kaiser window shape of the resampling filter
+RESAMPLE_BLOCK_ROWS = 1024  # Output rows computed per matrix product while resampling
+RESAMPLE_MIN_ROW_OUTPUTS = 64  # Minimum outputs per resampler row, for wide matrix products
+
+# Cache
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "voice-activity-detection")
+CACHE_MAX_BYTES = 2 * 1024 ** 3  # Least recently used entries are evicted beyond this size
+CACHE_VERSION = 2  # Bump when decoding or VAD output changes so stale entries are ignored
+
+# Batch Processing
+BATCH_PROGRESS_INTERVAL_S = 5  # Seconds between progress reports
+BATCH_CHUNKSIZE = 8  # Files handed to a worker process at a time
+
+# Library Index
+LIBRARY_DB_PATH = os.path.join(CACHE_DIR, "library.sqlite3")
+LIBRARY_SCHEMA_VERSION = 1  # Bump when the table layout changes; the index is then rebuilt
+LIBRARY_COMMIT_BATCH = 256  # Scan results written per transaction
+LIBRARY_COMMIT_INTERVAL_S = 1.0  # Longest wait before analyzed files are written to the index
+LIBRARY_SENSITIVITY = VAD_SENSITIVITY  # Fixed, so the player's selector never stales the index
+LIBRARY_SCAN_START_METHOD = "spawn"  # Scan workers must not fork the GUI's audio thread
+LIBRARY_STOP_POLL_S = 0.1  # How often a scan waiting on its workers checks for cancellation
+LIBRARY_STOP_TIMEOUT_S = 1.0  # Longest wait in stop() for the scan to wind down
+LIBRARY_VISIBLE_ROWS = 20  # Rows of the file list built at a time; the rest are queried on scroll
+LIBRARY_REFRESH_MS = 1000  # How often the file list picks up scan progress (re-sorts it)
+LIBRARY_FILTER_HINT = "Filter: name duration>60 speech>50% segments<10"
+
+# Prefetch
+PREFETCH_RADIUS = 2  # Files before and after the selected one prepared in the background
+PREFETCH_MAX_BYTES = 512 * 1024 ** 2  # Memory for prepared files (PCM, VAD masks, envelopes)
+
+# Export
+EXPORT_PADDING_MS = 100  # Audio kept before and after each speech segment
+EXPORT_CHUNK_BYTES = 4 * 1024 ** 2  # Source bytes copied at a time
+EXPORT_BUTTON_LABEL = "Export Speech"
+EXPORTING_LABEL = "Exporting speech..."
+EXPORTED_LABEL = "Segments exported: {segments}"
+EXPORT_FAILED_LABEL = "Export failed"
+
+# Benchmarks
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", ".."))
+SAMPLE_AUDIO_DIR = os.path.join(PROJECT_ROOT, "sample_audio")
+BENCHMARK_SYNTHETIC_DURATIONS_S = [60, 600]  # Generated file lengths; add 7200 for a 2 h run
+BENCHMARK_REPEAT = 3  # Timed runs per stage; the median is reported
+BENCHMARK_REGRESSION_THRESHOLD = 0.2  # Relative slowdown against the baseline that fails a run
+BENCHMARK_NOISE_FLOOR_S = 0.005  # Absolute slowdowns below this are treated as jitter
+
+# Instrumentation
+PROFILE_ENV_VAR = "VAD_PROFILE"  # Set to 1 to record timing spans from startup
+PROFILE_TRACE_FILE = "vad_trace.json"  # Chrome trace written when the app closes while profiling
+PROFILE_MAX_EVENTS = 100000  # Trace events kept; older ones are dropped
+PROFILE_MAX_SAMPLES = 10000  # Duration samples kept per span name for the percentiles
+
+# Live Stream VAD
+LIVE_CHUNK_MS = 20  # Audio read from a live source per chunk
+LIVE_BUFFER_SECONDS = 2.0  # Ring buffer size; older samples are overwritten
+LIVE_MAX_LAG_MS = 200  # Backlog beyond which the oldest frames are skipped to catch up
+LIVE_WAIT_TIMEOUT_S = 0.1  # How long the VAD thread waits for samples before rechecking
+LIVE_SOCKET_TIMEOUT_S = 0.5  # Socket accept/recv timeout, so a closed source stops promptly
+LIVE_LATENCY_WINDOW = 1000  # Recent frame latencies kept for percentiles
+LIVE_PLOT_SECONDS = 10  # Width of the scrolling live view
+LIVE_PLOT_BLOCK_MS = 10  # Samples per min/max point of the live waveform
+LIVE_REFRESH_MS = 50  # Live view redraw interval
+LIVE_DECISION_QUEUE_SIZE = 1000  # Decisions waiting for the UI; newer ones are dropped beyond this
+LIVE_BUTTON_LABEL = "Live Replay"
+STOP_LIVE_BUTTON_LABEL = "Stop Live"
+LIVE_FRAME_DURATIONS_MS = (10, 20, 30)  # Frame lengths supported by webrtcvad
+LIVE_FRAME_RATES = (8000, 16000, 32000, 48000)  # Sample rates supported by webrtcvad
+
+# VAD Server
+SERVER_HOST = "127.0.0.1"  # Only local processes can reach the server by default
+SERVER_PORT = 8765
+SERVER_START_METHOD = "spawn"  # Worker processes start fresh instead of forking the server
+SERVER_MAX_CONNECTIONS = 64  # Open connections; further ones are answered with 503 and closed
+SERVER_MAX_QUEUE = 128  # Requests waiting for a worker; further ones are answered with 503
+SERVER_MAX_BODY_BYTES = 64 * 1024 ** 2  # Largest upload (about 35 min of 16 kHz PCM)
+SERVER_MAX_HELD_BYTES = 256 * 1024 ** 2  # Upload bytes held at once, read, queued or analyzed
+SERVER_DISCARD_BYTES = 64 * 1024  # Piece size when the body of a rejected request is skipped
+SERVER_MAX_LINE_BYTES = 64 * 1024  # Longest request or header line
+SERVER_READ_TIMEOUT_S = 30  # Longest wait for the rest of a request, or for the next one
+SERVER_RETRY_AFTER_S = 1  # Retry-After sent with 503 responses
+SERVER_BATCH_MAX_REQUESTS = 16  # Queued requests handed to a worker in one task
+SERVER_BATCH_MAX_BYTES = 1024 ** 2  # Bodies of a batch beyond its first request stay below this
+SERVER_LATENCY_WINDOW = 1000  # Recent request latencies kept for percentiles
+SERVER_RATE_WINDOW_S = 10  # Requests/s is averaged over this many seconds
+LOADGEN_REQUESTS = 200
+LOADGEN_CONCURRENCY = 8  # Connections sending requests at the same time
+LOADGEN_CHUNK_BYTES = 64 * 1024  # Body piece per chunk when sending chunked uploads
+
+# Startup
+STARTUP_IMPORT_BUDGET_S = 0.6  # Importing the GUI's startup path (measured: about 0.25 s)
+STARTUP_DEFERRED_MODULES = ("matplotlib", "pygame", "pydub", "webrtcvad")  # Loaded on first use
+
+# Background Loading
+LOAD_POLL_INTERVAL_MS = 20  # How often the Tk loop checks for finished background work
+
+# Playback
+PLAYBACK_CHUNK_MS = 20  # Audio handed to the output device at a time; also the seek latency
+PLAYBACK_POLL_S = 0.005  # How often the output thread checks whether the device needs audio
+
+# Playback UI Ticks
+TICK_MIN_INTERVAL_MS = 16  # Fastest playback UI refresh (about 60 per second)
+TICK_MAX_INTERVAL_MS = 100  # Slowest refresh while the window is visible
+TICK_HIDDEN_INTERVAL_MS = 500  # While hidden, nothing is drawn; ticks only follow the playback
+TICK_RENDER_SHARE = 0.25  # Share of the Tk thread that redraws may use; sets the tick interval
+TICK_COST_SMOOTHING = 0.2  # Weight of the latest redraw cost in its running average
+TICK_STATS_WINDOW = 200  # Recent ticks kept for jitter and render-cost percentiles
 
 # Slider Configuration
 SEEKBAR_MIN = 0
@@ -26,6 +157,10 @@ SEEKBAR_MAX = 100
 WAVEFORM_COLOR = 'blue'
 VAD_HIGHLIGHT_COLOR = 'red'
 VAD_HIGHLIGHT_ALPHA = 0.3
+WAVEFORM_POINTS_PER_PIXEL = 2  # Envelope points drawn per horizontal pixel of the axes
+PYRAMID_REDUCTION_FACTOR = 4  # Samples merged per block between pyramid levels
+PYRAMID_MIN_BLOCKS = 1024  # Stop building coarser levels below this many blocks
+CURSOR_STATS_WINDOW = 200  # Recent playback cursor updates kept for frame-time stats
 
 # Plot labels
 PLOT_X_LABEL = "Time [s]"
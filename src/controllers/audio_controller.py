@@ -1,51 +1,306 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.constants.app_constants import (
+    LOAD_POLL_INTERVAL_MS, LOADING_LABEL, ANALYZING_LABEL, LOAD_FAILED_LABEL,
+    LIVE_REFRESH_MS, LIVE_DECISION_QUEUE_SIZE, LIBRARY_REFRESH_MS, SCANNING_LABEL,
+    EXPORTING_LABEL, EXPORTED_LABEL, EXPORT_FAILED_LABEL
+)
+from src.services.export_service import SpeechExporter
+from src.services.library_service import LibraryScanner
+from src.services.live_vad_service import LiveVADSession
+from src.services.prefetch_service import PreparedFile, PreparedFileCache, Prefetcher
+from src.services.vad_service import VADService
+from src.utils.instrumentation import profiler
+from src.utils.live_sources import FileReplaySource
+from src.utils.logger import get_logger
+from src.utils.tick_scheduler import TickScheduler
+
+
 class AudioPlayerController:
-    def __init__(self, model, audio_frame, plot_frame):
-        """Initialize the controller with model and view frames."""
+    def __init__(self, model, audio_frame, plot_frame, library=None):
+        """Initialize the controller with model and view frames, and an optional LibraryIndex."""
+        self.logger = get_logger(__name__)
         self.model = model
         self.audio_frame = audio_frame
         self.plot_frame = plot_frame
         self.current_audio_file = None
-        self.update_interval = 50
+        self.vad_modes = None  # (all-sensitivity frame mask, frame rate) of the current file
+
+        # One loop refreshes all playback views from a single clock read per tick
+        self.ticker = TickScheduler(plot_frame, lambda: self.model.get_current_playback_time(),
+                                    lambda: self.model.is_playing, plot_frame.winfo_viewable)
+        self.ticker.subscribe(plot_frame.update_playback_position)
+        self.ticker.subscribe(self._show_progress)
+
+        # Decoding and VAD run on a single loader thread; results come back through a queue
+        # that the Tk loop polls, since widgets may only be touched from the main thread
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-loader")
+        self.results = queue.Queue()
+        self.load_id = 0  # Increases with every selection; results of older loads are dropped
+        self.cancel_event = None
+        self.load_future = None
+        self.polling = False
+
+        # Exports stream from disk on their own thread, so loading other files is not held up
+        self.export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export")
+
+        # Files next to the selection are prepared ahead of time and kept in memory
+        self.prepared_files = PreparedFileCache()
+        self.prefetcher = Prefetcher(model, self.prepared_files)
+
+        # Live mode: a VAD thread feeds decisions to the Tk loop through a bounded queue
+        self.live_session = None
+        self.live_decisions = queue.Queue(maxsize=LIVE_DECISION_QUEUE_SIZE)
+        self.live_position = 0  # Next sample to hand to the live view
+
+        # Opened folders are indexed in the background; the file list reads from the index
+        self.library = library
+        self.scanner = LibraryScanner(library, model.vad_service) if library else None
+        self.scan_version = -1  # Index version the file list last showed
+        self.scan_polling = False
+
+    def load_audio(self, file_name, adjacent_files=()):
+        """Load the selected audio file in the background, replacing any load in progress.
+
+        The waveform is plotted as soon as the audio is decoded; speech highlights are added
+        when VAD finishes. Selecting another file cancels the pending work for this one.
+        Once it is loaded, adjacent_files (nearest first) are prepared in the background, so
+        moving on to one of them is immediate.
+        """
+        self.stop_live()
+        if self.cancel_event:
+            self.cancel_event.set()
+        # The selected file gets the CPU first, unless it is the one being prefetched
+        self.prefetcher.cancel(keep=file_name)
+        self.load_id += 1
+        self.cancel_event = threading.Event()
+        self.audio_frame.set_status(LOADING_LABEL)
+        self.load_future = self.executor.submit(self._load_in_background, self.load_id, file_name,
+                                                self.cancel_event, list(adjacent_files))
+        if not self.polling:
+            self.polling = True
+            self.plot_frame.after(LOAD_POLL_INTERVAL_MS, self._poll_results)
+
+    def open_folder(self, folder):
+        """List folder from the index right away and scan it for new or changed files."""
+        self.scanner.start(folder)
+        self.scan_version = -1
+        self.audio_frame.show_folder(self.library, folder)
+        if not self.scan_polling:
+            self.scan_polling = True
+            self.plot_frame.after(LIBRARY_REFRESH_MS, self._poll_scan)
+
+    def _poll_scan(self):
+        """Main thread: refresh the file list while the scan adds files and metadata."""
+        progress = self.scanner.get_progress()
+        if self.scanner.version != self.scan_version or not progress["running"]:
+            self.scan_version = self.scanner.version
+            status = SCANNING_LABEL.format(**progress) if progress["running"] else ""
+            self.audio_frame.refresh_library(status)
+        self.scan_polling = progress["running"]
+        if self.scan_polling:
+            self.plot_frame.after(LIBRARY_REFRESH_MS, self._poll_scan)
+
+    def shutdown(self):
+        """Cancel background work and stop the loader thread, e.g. when the window closes."""
+        self.stop_live()
+        self.ticker.stop()
+        self.logger.info(f"Playback UI ticks: {self.ticker.get_stats()}")
+        if self.scanner:
+            self.scanner.stop()
+        self.prefetcher.close()
+        self.export_executor.shutdown(wait=True)  # Let a running export finish its files
+        self.logger.info(f"Prefetch cache: {self.prepared_files.get_stats()}")
+        if self.cancel_event:
+            self.cancel_event.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def set_sensitivity(self, sensitivity):
+        """Switch VAD aggressiveness; the current file is re-highlighted without new analysis."""
+        self.model.vad_service.set_sensitivity(sensitivity)
+        if self.vad_modes is not None:
+            self._highlight_sensitivity()
+
+    def _highlight_sensitivity(self):
+        speech_segments, frame_rate = self._current_segments()
+        self.plot_frame.highlight_speech_segments(speech_segments, frame_rate)
+
+    def _current_segments(self):
+        """Speech segments of the current file at the selected sensitivity, and their rate."""
+        mode_mask, frame_rate = self.vad_modes
+        vad_results = VADService.decisions_for_mode(mode_mask, self.model.vad_service.sensitivity)
+        return self.model.get_speech_segments(vad_results, frame_rate), frame_rate
+
+    def export_speech(self, output_dir, exporter=None):
+        """Write the current file's speech-only WAV, clips and manifest to output_dir.
 
-    def load_audio(self, file_name):
-        """Load the selected audio file and prepare to plot."""
-        self.model.load_audio(file_name)
-        self.current_audio_file = file_name
-        self.plot_audio()
+        Uses the highlighted segments, so the export matches what is shown. Returns whether
+        an export was started (the file must be loaded and analyzed).
+        """
+        if not self.current_audio_file or self.vad_modes is None:
+            return False
+        exporter = exporter or SpeechExporter(clips=True)
+        speech_segments, frame_rate = self._current_segments()
+        self.audio_frame.set_status(EXPORTING_LABEL)
+        future = self.export_executor.submit(exporter.export, self.current_audio_file,
+                                             speech_segments, frame_rate, output_dir)
+        self.plot_frame.after(LOAD_POLL_INTERVAL_MS, lambda: self._poll_export(future))
+        return True
+
+    def _poll_export(self, future):
+        if not future.done():
+            self.plot_frame.after(LOAD_POLL_INTERVAL_MS, lambda: self._poll_export(future))
+            return
+        try:
+            summary = future.result()
+        except Exception as error:  # pylint: disable=broad-except
+            # e.g. struct.error from a malformed file; the status must not stay on "Exporting"
+            self.logger.error(f"Export failed: {error}")
+            self.audio_frame.set_status(EXPORT_FAILED_LABEL)
+            return
+        self.audio_frame.set_status(EXPORTED_LABEL.format(**summary))
+
+    def toggle_live(self):
+        """Start or stop a real-time replay of the current file through live VAD.
+
+        Returns whether live mode is now active.
+        """
+        if self.live_session:
+            self.stop_live()
+            return False
+        if not self.current_audio_file:
+            return False
+        self.start_live(FileReplaySource(self.current_audio_file))
+        return True
+
+    def start_live(self, source):
+        """Show live VAD of source (stdin, socket or file replay) in the scrolling view."""
+        self.stop_live()
+        self.live_session = LiveVADSession(self.model.vad_service, source,
+                                           frame_rate=source.frame_rate).start()
+        self.live_position = 0
+        self.plot_frame.start_live_view(source.frame_rate)
+        threading.Thread(target=self._run_live, args=(self.live_session,), name="live-vad",
+                         daemon=True).start()
+        self.plot_frame.after(LIVE_REFRESH_MS, self._poll_live)
+
+    def stop_live(self):
+        if self.live_session:
+            self.live_session.stop()
+            self.live_session = None
+            self.audio_frame.set_live_active(False)
+
+    def _run_live(self, session):
+        """Live VAD thread: decide frames as audio arrives, never blocking on the UI."""
+        for decision in session.decisions():
+            try:
+                self.live_decisions.put_nowait((session, decision))
+            except queue.Full:
+                profiler.count("live.ui_dropped_decisions")  # The UI is behind; skip drawing it
+        self.live_decisions.put((session, None))  # End of stream
+
+    def _poll_live(self):
+        """Main thread: hand new audio and decisions to the scrolling view."""
+        session = self.live_session
+        if session is None:
+            return
+
+        decisions, ended = [], False
+        while True:
+            try:
+                owner, decision = self.live_decisions.get_nowait()
+            except queue.Empty:
+                break
+            if owner is not session:
+                continue  # Left over from an earlier stream
+            if decision is None:
+                ended = True
+            else:
+                decisions.append(decision)
+
+        start, samples = session.read_samples(self.live_position, session.ring.written)
+        self.live_position = start + len(samples)
+        self.plot_frame.update_live_view(start, samples, decisions)
+
+        stats = session.get_stats()
+        self.audio_frame.set_status(f"Live: p95 latency {stats['latency_p95_ms']:.1f} ms, "
+                                    f"{stats['dropped_frames']} frames dropped")
+        if ended:
+            self.stop_live()
+        else:
+            self.plot_frame.after(LIVE_REFRESH_MS, self._poll_live)
+
+    def _load_in_background(self, load_id, file_name, cancel_event, adjacent_files):
+        """Loader thread: decode, build the envelope pyramid and frame energy, then run VAD.
+
+        A file the prefetcher already prepared, or is preparing, is handed over as it is.
+        """
+        try:
+            self.prefetcher.wait_for(file_name)
+            if cancel_event.is_set():
+                return
+            prepared = self.prepared_files.get(file_name) or PreparedFile.decode(self.model,
+                                                                                 file_name)
+            if cancel_event.is_set():
+                return
+            self.results.put((load_id, "audio", prepared))
+
+            if prepared.mode_mask is None:
+                if prepared.compute_vad_modes(self.model, cancel_event) is None:
+                    return
+                self.prepared_files.put(prepared)
+            self.results.put((load_id, "vad", (prepared.mode_mask, prepared.frame_rate)))
+            self.prefetcher.schedule(adjacent_files)
+        except Exception as error:  # pylint: disable=broad-except
+            # Reported on the main thread instead of killing the loader
+            self.results.put((load_id, "error", (file_name, error)))
+
+    def _poll_results(self):
+        """Main thread: apply finished background stages of the current load."""
+        while True:
+            try:
+                load_id, stage, payload = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if load_id != self.load_id:
+                continue  # Superseded by a newer selection
+
+            if stage == "audio":
+                prepared = payload
+                self.model.set_audio(prepared.file_path, prepared.audio_data, prepared.frame_rate)
+                self.current_audio_file = prepared.file_path
+                self.vad_modes = None
+                self.audio_frame.set_status(ANALYZING_LABEL)
+                self.plot_frame.plot_waveform(prepared.audio_data, prepared.frame_rate, [],
+                                              pyramid=prepared.pyramid,
+                                              frame_energy=prepared.frame_energy)
+            elif stage == "vad":
+                self.vad_modes = payload
+                self._highlight_sensitivity()
+                self.audio_frame.set_status("")
+            else:
+                file_name, error = payload
+                self.logger.error(f"Failed to load {file_name}: {error}")
+                self.audio_frame.set_status(LOAD_FAILED_LABEL)
+
+        # Keep polling only while the current load may still deliver results
+        self.polling = not self.load_future.done() or not self.results.empty()
+        if self.polling:
+            self.plot_frame.after(LOAD_POLL_INTERVAL_MS, self._poll_results)
 
     def play_audio(self):
-        """Play the current audio file and start updating the playback line."""
+        """Play or pause the current audio file; the playback views follow while it plays."""
         if self.current_audio_file:
             self.model.play_pause()
-            if self.model.is_playing:
-                self.update_playback_line()
-                self.update_progress_bar()
-
-    def plot_audio(self):
-        """Plot the waveform and VAD results."""
-        audio_data, frame_rate = self.model.get_audio_data()
-        vad_result = self.model.detect_voice_activity()
-        self.plot_frame.plot_waveform(audio_data, frame_rate, vad_result)
-
-    def update_playback_line(self):
-        """Update the playback line on the plot every 100ms."""
-        if self.model.is_playing:
-            current_time = self.model.get_current_playback_time()  # Get current playback time in seconds
-            self.plot_frame.update_playback_position(current_time)
-
-            # Schedule the next update after 100ms
-            self.plot_frame.after(self.update_interval, self.update_playback_line)
-
-    def update_progress_bar(self):
-        """Update the progress bar and time labels every 100ms."""
-        if self.model.is_playing:
-            current_time = self.model.get_current_playback_time()  # Get current playback time in seconds
-            total_time = self.model.get_audio_duration()  # Get total duration of the audio
-            self.audio_frame.update_progress_bar(current_time, total_time)
-
-            # Schedule the next update after 100ms
-            self.audio_frame.after(self.update_interval, self.update_progress_bar)
+            # Does nothing while the loop runs; after a pause its next tick is the last one
+            self.ticker.start()
+
+    def _show_progress(self, current_time):
+        self.audio_frame.update_progress_bar(current_time, self.model.get_audio_duration())
 
     def seek_audio(self, new_time):
-        """Seek the audio to a new position."""
+        """Seek the audio to a new position, in seconds; works while paused too."""
         self.model.seek(new_time)
+        self.ticker.refresh()
@@ -1,5 +1,9 @@
-from src.views.main_frame import MainFrame
+import time
+
+STARTED_AT = time.perf_counter()  # Taken before the app's imports, so they count as startup
+
+from src.views.main_frame import MainFrame  # noqa: E402
 
 if __name__ == "__main__":
-    app = MainFrame()
+    app = MainFrame(started_at=STARTED_AT)
     app.mainloop()
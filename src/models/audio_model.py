@@ -1,52 +1,173 @@
-import pygame
-from pydub import AudioSegment
+import time
+
 import numpy as np
+from src.constants.app_constants import FRAME_DURATION_MS, VAD_SAMPLE_RATE, VAD_NATIVE_RATES
+from src.services.playback_service import PlaybackEngine, PygameDevice
+from src.utils.instrumentation import profiler
+from src.utils.logger import get_logger
+from src.utils.wav_reader import load_wav, read_wav_info
+
+logger = get_logger(__name__)
+
+
+def vad_frame_rate(file_path):
+    """Rate to analyze a file at: its own rate if in VAD_NATIVE_RATES, else VAD_SAMPLE_RATE.
+
+    Only WAV headers are inspected; other formats are always converted to VAD_SAMPLE_RATE.
+    """
+    if file_path.lower().endswith(".wav"):
+        try:
+            frame_rate = read_wav_info(file_path).frame_rate
+        except (OSError, ValueError):
+            return VAD_SAMPLE_RATE
+        if frame_rate in VAD_NATIVE_RATES:
+            return frame_rate
+    return VAD_SAMPLE_RATE
+
+
+def decode_audio(file_path, frame_rate=None, timings=None):
+    """Decode an audio file into mono 16-bit PCM samples at the given frame rate.
+
+    Without a frame rate, the file's own rate is kept when VAD can run on it directly (see
+    vad_frame_rate), so no resampling is needed. PCM/float WAVs go through the native
+    memory-mapped loader; anything else, or a WAV it cannot parse, falls back to pydub.
+    Per-stage seconds are added to timings if given.
+    """
+    frame_rate = frame_rate or vad_frame_rate(file_path)
+    with profiler.span("decode"):
+        if file_path.lower().endswith(".wav"):
+            try:
+                return load_wav(file_path, frame_rate, timings=timings)
+            except ValueError as exc:
+                logger.debug(f"Native WAV loader declined {file_path} ({exc}); using pydub.")
+
+        from pydub import AudioSegment  # Only needed for non-WAV files; slow to import
+
+        start = time.perf_counter()
+        audio = AudioSegment.from_file(file_path)
+        audio = audio.set_frame_rate(frame_rate).set_channels(1).set_sample_width(2)
+        if timings is not None:
+            timings["pydub"] = timings.get("pydub", 0.0) + time.perf_counter() - start
+        return np.frombuffer(audio.raw_data, dtype=np.int16), frame_rate
 
 
 class AudioPlayerModel:
-    def __init__(self, vad_service):
-        pygame.mixer.init()
+    def __init__(self, vad_service, cache=None, device=None):
         self.audio_data = None
         self.frame_rate = None
-        self.is_playing = False
+        self.file_path = None
+        self.load_timings = {}  # Seconds per decode stage of the last load
+        # Plays the decoded samples directly; the output device is only opened on first load
+        self.player = PlaybackEngine(device or PygameDevice())
         self.vad_service = vad_service
+        self.cache = cache  # Optional AudioCache for decoded PCM and VAD results
 
     def load_audio(self, file_path):
         """Load and preprocess the audio file."""
-        audio = AudioSegment.from_file(file_path)
-        audio = audio.set_frame_rate(16000).set_channels(1).set_sample_width(2)
+        audio_data, frame_rate = self.prepare_audio(file_path)
+        self.set_audio(file_path, audio_data, frame_rate)
+
+    def prepare_audio(self, file_path):
+        """Decode (or fetch from cache) the audio file without touching the player state.
+
+        Safe to call from a worker thread; returns (audio_data, frame_rate).
+        """
+        timings = {}
+        start = time.perf_counter()
+        frame_rate = vad_frame_rate(file_path)
+        audio_data = self.cache.load_audio(file_path, frame_rate) if self.cache else None
+        if audio_data is not None:
+            timings["cache"] = time.perf_counter() - start
+        else:
+            audio_data, frame_rate = decode_audio(file_path, frame_rate, timings=timings)
+            if self.cache:
+                self.cache.store_audio(file_path, frame_rate, audio_data)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stages = ", ".join(f"{stage} {seconds * 1000:.1f} ms" for stage, seconds in timings.items())
+        logger.info(f"Loaded {file_path} in {elapsed_ms:.1f} ms ({stages}).")
+        self.load_timings = timings
+        return audio_data, frame_rate
+
+    def set_audio(self, file_path, audio_data, frame_rate):
+        """Make prepared audio the current file and load it for playback."""
+        self.file_path = file_path
+        self.audio_data = audio_data
+        self.frame_rate = frame_rate
 
-        raw_data = audio.raw_data
-        self.audio_data = np.frombuffer(raw_data, dtype=np.int16)
-        self.frame_rate = 16000
+        # Play the samples already in memory instead of decoding the file a second time;
+        # this stops whatever was playing
+        self.player.load(audio_data, frame_rate)
 
-        # Load the audio for playback using pygame
-        pygame.mixer.music.load(file_path)
+    @property
+    def is_playing(self):
+        return self.player.playing
 
     def play_pause(self):
         """Toggle play and pause for the audio."""
         if self.is_playing:
-            pygame.mixer.music.pause()
+            self.player.pause()
         else:
-            pygame.mixer.music.unpause() if pygame.mixer.music.get_busy() else pygame.mixer.music.play()
-        self.is_playing = not self.is_playing
+            self.player.play()
         return self.is_playing
 
     def seek(self, position):
-        """Seek the audio to the selected position."""
+        """Seek the audio to position, in seconds."""
         if self.audio_data is not None:
-            pygame.mixer.music.play(start=position / self.frame_rate)
+            self.player.seek(position)
 
     def get_audio_data(self):
         return self.audio_data, self.frame_rate
 
     def get_current_playback_time(self):
         """Get the current playback time in seconds."""
-        return pygame.mixer.music.get_pos() / 1000.0  # get_pos() returns milliseconds
+        return self.player.get_position()
 
     def detect_voice_activity(self):
         """Detect voice activity in the preprocessed audio."""
-        return self.vad_service.detect_voice_activity(self.audio_data, self.frame_rate)
+        return self.compute_voice_activity(self.file_path, self.audio_data, self.frame_rate)
+
+    def compute_voice_activity(self, file_path, audio_data, frame_rate):
+        """Run (or fetch cached) VAD at the current sensitivity for the given audio."""
+        use_cache = self.cache is not None and file_path is not None
+        vad_params = (frame_rate, self.vad_service.sensitivity, FRAME_DURATION_MS)
+        variant = {"energy_gate": self.vad_service.energy_gate,
+                   "overlap": self.vad_service.overlap}
+        vad_results = self.cache.load_vad(file_path, *vad_params, **variant) if use_cache else None
+        if vad_results is not None:
+            return vad_results
+
+        vad_results = self.vad_service.detect_voice_activity(audio_data, frame_rate)
+        if use_cache:
+            self.cache.store_vad(file_path, *vad_params, vad_results, **variant)
+        return vad_results
+
+    def compute_vad_modes(self, file_path, audio_data, frame_rate, cancel_event=None,
+                          frame_energy=None):
+        """Run (or fetch cached) VAD for all four sensitivities as a per-frame bit mask.
+
+        frame_energy is the per-frame RMS, if already computed, reused by the energy gate.
+        Returns None if cancel_event is set before the analysis finishes.
+        """
+        use_cache = self.cache is not None and file_path is not None
+        variant = {"energy_gate": self.vad_service.energy_gate,
+                   "overlap": self.vad_service.overlap}
+        mode_mask = (self.cache.load_vad_modes(file_path, frame_rate, FRAME_DURATION_MS, **variant)
+                     if use_cache else None)
+        if mode_mask is not None:
+            return mode_mask
+
+        mode_mask = self.vad_service.detect_all_modes(audio_data, frame_rate,
+                                                      cancel_event=cancel_event,
+                                                      frame_energy=frame_energy)
+        if mode_mask is not None and use_cache:
+            self.cache.store_vad_modes(file_path, frame_rate, FRAME_DURATION_MS, mode_mask,
+                                       **variant)
+        return mode_mask
+
+    def get_speech_segments(self, vad_results, frame_rate=None):
+        """Smoothed speech segments of the audio as (start_sample, end_sample) pairs."""
+        return self.vad_service.get_speech_segments(vad_results, frame_rate or self.frame_rate,
+                                                    overlap=self.vad_service.overlap)
 
     def get_audio_duration(self):
         """Get the total duration of the audio in seconds."""
@@ -0,0 +1,173 @@
+import csv
+import json
+import os
+import time
+from multiprocessing import Pool
+
+from src.constants.app_constants import (
+    FRAME_DURATION_MS, VAD_SENSITIVITY, VAD_ENERGY_GATE, VAD_FRAME_OVERLAP,
+    BATCH_PROGRESS_INTERVAL_S, BATCH_CHUNKSIZE
+)
+from src.models.audio_model import decode_audio
+from src.services.vad_service import VADService
+from src.utils.logger import get_logger
+
+CSV_FIELDS = ["file", "duration_s", "frame_rate", "speech_ratio", "num_segments", "segments",
+              "error"]
+
+_worker_vad_service = None  # One VADService per pool process, created by _init_worker
+
+
+def _init_worker(sensitivity, energy_gate, overlap):
+    global _worker_vad_service
+    _worker_vad_service = VADService(sensitivity, energy_gate=energy_gate, overlap=overlap)
+
+
+def _analyze_in_worker(args):
+    file_path, frame_duration = args
+    return analyze_file(file_path, _worker_vad_service, frame_duration)
+
+
+def analyze_file(file_path, vad_service, frame_duration=FRAME_DURATION_MS):
+    """Decode one file and return its VAD summary as a plain dict."""
+    try:
+        audio_data, frame_rate = decode_audio(file_path)
+        vad_results = vad_service.detect_voice_activity(audio_data, frame_rate, frame_duration)
+        segments = VADService.get_speech_segments(vad_results, frame_rate, frame_duration,
+                                                  overlap=vad_service.overlap)
+    except Exception as exc:  # pylint: disable=broad-except
+        return {"file": file_path, "error": f"{type(exc).__name__}: {exc}"}
+
+    return {
+        "file": file_path,
+        "duration_s": len(audio_data) / frame_rate,
+        "frame_rate": frame_rate,
+        "speech_ratio": sum(vad_results) / len(vad_results) if vad_results else 0.0,
+        "num_segments": len(segments),
+        "segments": (segments / frame_rate).tolist(),
+        "error": None,
+    }
+
+
+def find_audio_files(folder_path, recursive=False, extension=".wav"):
+    """List audio files in a folder, sorted so runs are reproducible."""
+    if not recursive:
+        names = [f for f in os.listdir(folder_path) if f.lower().endswith(extension)]
+        return [os.path.join(folder_path, f) for f in sorted(names)]
+
+    found = []
+    for root, dirs, files in os.walk(folder_path):
+        dirs.sort()
+        found.extend(os.path.join(root, f) for f in sorted(files) if f.lower().endswith(extension))
+    return found
+
+
+class BatchVADService:
+    """Run VAD headless over many files with a process pool, writing JSON Lines or CSV."""
+
+    def __init__(self, sensitivity=VAD_SENSITIVITY, frame_duration=FRAME_DURATION_MS, workers=None,
+                 energy_gate=VAD_ENERGY_GATE, overlap=VAD_FRAME_OVERLAP):
+        self.logger = get_logger(__name__)
+        self.sensitivity = sensitivity
+        self.energy_gate = energy_gate
+        self.overlap = overlap
+        self.frame_duration = frame_duration
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(self, file_paths, output_path, output_format=None, resume=True):
+        """Analyze file_paths and append one record per file to output_path.
+
+        With resume enabled, files already present in output_path are skipped, so an
+        interrupted run can simply be restarted. Returns a summary dict with throughput.
+        """
+        output_format = output_format or self._format_from_path(output_path)
+        done = self._completed_files(output_path, output_format) if resume else set()
+        pending = [f for f in file_paths if f not in done]
+        self.logger.info(f"Batch VAD: {len(pending)} files to process, {len(done)} already done, "
+                         f"{self.workers} workers.")
+
+        summary = {"total": len(file_paths), "skipped": len(file_paths) - len(pending),
+                   "processed": 0, "failed": 0}
+        start_time = time.perf_counter()
+        last_report = start_time
+
+        mode = "a" if resume else "w"
+        with open(output_path, mode, newline="", encoding="utf-8") as output_file:
+            if output_file.tell() > 0:
+                self._terminate_last_line(output_path, output_file)
+            write_record = self._make_writer(output_file, output_format)
+            tasks = [(f, self.frame_duration) for f in pending]
+
+            with Pool(self.workers, initializer=_init_worker,
+                      initargs=(self.sensitivity, self.energy_gate, self.overlap)) as pool:
+                results = pool.imap_unordered(_analyze_in_worker, tasks, chunksize=BATCH_CHUNKSIZE)
+                for record in results:
+                    write_record(record)
+                    summary["processed"] += 1
+                    if record["error"]:
+                        summary["failed"] += 1
+                        self.logger.warning(f"Failed {record['file']}: {record['error']}")
+
+                    now = time.perf_counter()
+                    if now - last_report >= BATCH_PROGRESS_INTERVAL_S:
+                        output_file.flush()
+                        self._report_progress(summary["processed"], len(pending), now - start_time)
+                        last_report = now
+
+        elapsed = time.perf_counter() - start_time
+        summary["elapsed_s"] = elapsed
+        summary["files_per_second"] = summary["processed"] / elapsed if elapsed > 0 else 0.0
+        self._report_progress(summary["processed"], len(pending), elapsed)
+        return summary
+
+    def _report_progress(self, processed, total, elapsed):
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        self.logger.info(f"Processed {processed}/{total} files ({rate:.1f} files/s).")
+
+    @staticmethod
+    def _format_from_path(output_path):
+        return "csv" if output_path.lower().endswith(".csv") else "jsonl"
+
+    @staticmethod
+    def _make_writer(output_file, output_format):
+        """Return a function writing one record in the chosen format."""
+        if output_format == "jsonl":
+            return lambda record: output_file.write(json.dumps(record) + "\n")
+
+        writer = csv.DictWriter(output_file, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        if output_file.tell() == 0:
+            writer.writeheader()
+
+        def write_csv(record):
+            row = dict(record)
+            segments = record.get("segments", [])
+            row["segments"] = ";".join(f"{start:.6f}-{end:.6f}" for start, end in segments)
+            writer.writerow(row)
+
+        return write_csv
+
+    @staticmethod
+    def _terminate_last_line(output_path, output_file):
+        """Start on a fresh line if a previous run was killed mid-record."""
+        with open(output_path, "rb") as existing:
+            existing.seek(-1, os.SEEK_END)
+            if existing.read(1) != b"\n":
+                output_file.write("\n")
+
+    @staticmethod
+    def _completed_files(output_path, output_format):
+        """Collect files already recorded in a previous run's output."""
+        if not os.path.exists(output_path):
+            return set()
+
+        with open(output_path, newline="", encoding="utf-8") as output_file:
+            if output_format == "csv":
+                return {row["file"] for row in csv.DictReader(output_file)}
+
+            done = set()
+            for line in output_file:
+                try:
+                    done.add(json.loads(line)["file"])
+                except (ValueError, KeyError):
+                    continue  # Partially written last line of an interrupted run
+            return done
@@ -0,0 +1,198 @@
+import os
+import platform
+import resource
+import statistics
+import time
+import tracemalloc
+import wave
+
+# Benchmarks run headless: no display for matplotlib and no sound card for pygame
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import matplotlib  # noqa: E402
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+from src.constants.app_constants import (  # noqa: E402
+    BENCHMARK_REPEAT, BENCHMARK_REGRESSION_THRESHOLD, BENCHMARK_NOISE_FLOOR_S, SAMPLE_AUDIO_DIR,
+    VAD_SENSITIVITY
+)
+from src.models.audio_model import AudioPlayerModel  # noqa: E402
+from src.services.batch_service import find_audio_files  # noqa: E402
+from src.services.playback_service import NullDevice  # noqa: E402
+from src.services.vad_service import VADService  # noqa: E402
+from src.utils.logger import get_logger  # noqa: E402
+from src.views.plot_frame import PlotFrame  # noqa: E402
+
+STAGES = ("load", "vad", "vad_gated", "segments", "render")
+
+
+def generate_synthetic_wav(file_path, duration_s, frame_rate=44100, channels=2, seed=0):
+    """Write a speech-like test signal: voiced bursts of a few seconds separated by noise.
+
+    Written one second at a time, so multi-hour files need no more than a second of memory.
+    The same arguments always produce the same file.
+    """
+    rng = np.random.default_rng(seed)
+    speaking = False
+    f0 = 150.0
+    with wave.open(file_path, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(frame_rate)
+        for second in range(int(np.ceil(duration_s))):
+            frames = min(frame_rate, int(duration_s * frame_rate) - second * frame_rate)
+            t = second + np.arange(frames) / frame_rate
+            signal = rng.standard_normal(frames) * 100  # Background noise
+            if rng.random() < 0.35:
+                speaking, f0 = not speaking, rng.uniform(100, 250)
+            if speaking:
+                # Harmonics of a pitch, amplitude-modulated at a syllable rate of ~4 Hz
+                syllables = 0.5 * (1 + np.sin(2 * np.pi * 4 * t))
+                voiced = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+                signal += voiced * syllables * 6000
+            pcm = np.clip(signal, -32768, 32767).astype("<i2")
+            wav.writeframes(np.repeat(pcm, channels).tobytes())
+    return file_path
+
+
+def prepare_synthetic_files(work_dir, durations_s):
+    """Generate (or reuse) one synthetic WAV per duration in work_dir."""
+    os.makedirs(work_dir, exist_ok=True)
+    paths = []
+    for duration_s in durations_s:
+        path = os.path.join(work_dir, f"synthetic_{duration_s:g}s.wav")
+        if not os.path.exists(path):
+            generate_synthetic_wav(path, duration_s)
+        paths.append(path)
+    return paths
+
+
+class BenchmarkRunner:
+    """Times the load, VAD, segment extraction and render stages on a set of files.
+
+    Each stage is repeated and the median wall time kept; real-time factor is audio seconds
+    processed per wall second. Peak memory comes from one extra tracemalloc pass per stage,
+    kept out of the timed runs because tracing slows allocation down. VAD also runs with the
+    energy gate, reporting the skipped webrtcvad calls and the agreement with ungated output.
+    """
+
+    def __init__(self, sensitivity=VAD_SENSITIVITY, repeat=BENCHMARK_REPEAT):
+        self.logger = get_logger(__name__)
+        self.repeat = repeat
+        self.vad_service = VADService(sensitivity, energy_gate=False)
+        self.gated_vad_service = VADService(sensitivity, energy_gate=True)
+        self.model = AudioPlayerModel(self.vad_service, device=NullDevice())
+        self.plot_frame = PlotFrame.create_headless()
+
+    def run(self, file_paths):
+        """Benchmark every file and return the report as a JSON-serialisable dict."""
+        results = []
+        for file_path in file_paths:
+            results.append(self.benchmark_file(file_path))
+            stages = ", ".join(f"{stage} {stats['rtf']:.0f}x"
+                               for stage, stats in results[-1]["stages"].items())
+            self.logger.info(f"{results[-1]['file']}: {stages} real time.")
+        return {"meta": self._meta(), "results": results}
+
+    def benchmark_file(self, file_path):
+        model, plot_frame = self.model, self.plot_frame
+        state = {}
+
+        def load():
+            model.load_audio(file_path)
+            state["audio"] = model.get_audio_data()
+
+        def vad():
+            state["vad"] = self.vad_service.detect_voice_activity(*state["audio"])
+
+        def vad_gated():
+            state["vad_gated"] = self.gated_vad_service.detect_voice_activity(*state["audio"])
+
+        def segments():
+            state["segments"] = model.get_speech_segments(state["vad"])
+
+        def render():
+            plot_frame.plot_waveform(*state["audio"], state["segments"])
+            plot_frame.canvas.draw()  # draw_idle() is a no-op off screen, so force the render
+
+        stages = {}
+        for stage, func in zip(STAGES, (load, vad, vad_gated, segments, render)):
+            stages[stage] = self._measure(func)
+        duration_s = model.get_audio_duration()
+        for stats in stages.values():
+            stats["rtf"] = duration_s / stats["median_s"] if stats["median_s"] else float("inf")
+
+        return {
+            "file": os.path.basename(file_path),
+            "duration_s": duration_s,
+            "num_segments": len(state["segments"]),
+            "energy_gate": self._gate_report(state["vad"], state["vad_gated"]),
+            "stages": stages,
+        }
+
+    def _gate_report(self, vad_results, gated_results):
+        """Share of frames the energy gate skipped and how often it agrees with plain VAD."""
+        frames = len(vad_results)
+        skipped = self.gated_vad_service.gate_stats["skipped"]
+        agreement = np.mean(np.asarray(vad_results) == np.asarray(gated_results)) if frames else 1.0
+        return {"frames": frames, "skipped_frames": skipped,
+                "skipped_ratio": skipped / frames if frames else 0.0,
+                "agreement": float(agreement)}
+
+    def _measure(self, func):
+        times = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {"median_s": statistics.median(times), "min_s": min(times),
+                "peak_mb": peak / 1024 ** 2}
+
+    def _meta(self):
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": self.repeat,
+            "sensitivity": self.vad_service.sensitivity,
+            # ru_maxrss is in KiB on Linux
+            "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        }
+
+
+def compare_to_baseline(report, baseline, threshold=BENCHMARK_REGRESSION_THRESHOLD,
+                        noise_floor_s=BENCHMARK_NOISE_FLOOR_S):
+    """List the stages that got slower than the baseline by more than threshold.
+
+    Files and stages are matched by name; timings within noise_floor_s of the baseline are
+    never reported, so sub-millisecond stages do not flag on jitter.
+    """
+    baseline_files = {result["file"]: result for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        previous = baseline_files.get(result["file"])
+        if previous is None:
+            continue
+        for stage, stats in result["stages"].items():
+            if stage not in previous["stages"]:
+                continue
+            before, after = previous["stages"][stage]["median_s"], stats["median_s"]
+            if after > before * (1 + threshold) and after - before > noise_floor_s:
+                regressions.append({"file": result["file"], "stage": stage,
+                                    "baseline_s": before, "current_s": after,
+                                    "slowdown": after / before if before else float("inf")})
+    return regressions
+
+
+def default_benchmark_files():
+    """The WAV files bundled in sample_audio/."""
+    return find_audio_files(SAMPLE_AUDIO_DIR) if os.path.isdir(SAMPLE_AUDIO_DIR) else []
@@ -0,0 +1,204 @@
+import hashlib
+import os
+import tempfile
+import threading
+
+import numpy as np
+from src.constants.app_constants import (
+    CACHE_DIR, CACHE_MAX_BYTES, CACHE_VERSION, VAD_FRAME_OVERLAP, VAD_GATE_RATIO, VAD_GATE_MIN_RMS,
+    VAD_GATE_MAX_RMS, VAD_GATE_WINDOW_FRAMES, VAD_GATE_HANGOVER_FRAMES
+)
+from src.utils.instrumentation import profiler
+from src.utils.logger import get_logger
+
+
+class AudioCache:
+    """Persistent on-disk cache for decoded PCM and VAD results.
+
+    Entries are keyed by the file's identity (path + size + mtime, or a content hash) and,
+    for VAD results, by the VAD parameters. PCM is stored as a plain .npy so it can be
+    memory-mapped on load; VAD decisions are stored bit-packed. The directory is kept under
+    max_bytes by evicting the least recently used entries.
+
+    One cache may be shared by several threads (the loader and the prefetcher): an entry
+    evicted by one thread while another reads it counts as a miss, and counters are locked.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, use_content_hash=False):
+        self.logger = get_logger(__name__)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.use_content_hash = use_content_hash
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self.stats_lock = threading.Lock()
+        self._content_hashes = {}  # (path, size, mtime) -> content hash, so files are hashed once
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def load_audio(self, file_path, frame_rate):
+        """Return the cached PCM of file_path as a read-only memory-mapped array, or None."""
+        path = self._entry_path(self._audio_key(file_path, frame_rate), ".npy")
+        return self._read(path, lambda: np.load(path, mmap_mode='r'))
+
+    def store_audio(self, file_path, frame_rate, audio_data):
+        path = self._entry_path(self._audio_key(file_path, frame_rate), ".npy")
+        self._write(path, lambda f: np.save(f, np.asarray(audio_data)))
+
+    def load_vad(self, file_path, frame_rate, sensitivity, frame_duration, energy_gate=False,
+                 overlap=VAD_FRAME_OVERLAP):
+        """Return cached per-frame VAD results as a list of bools, or None."""
+        key = self._vad_key(file_path, frame_rate, sensitivity, frame_duration, energy_gate,
+                            overlap)
+        path = self._entry_path(key, ".npz")
+        entry = self._read(path, lambda: self._load_npz(path))
+        if entry is None:
+            return None
+        bits = np.unpackbits(entry["bits"], count=int(entry["count"]))
+        return bits.astype(bool).tolist()
+
+    def store_vad(self, file_path, frame_rate, sensitivity, frame_duration, vad_results,
+                  energy_gate=False, overlap=VAD_FRAME_OVERLAP):
+        key = self._vad_key(file_path, frame_rate, sensitivity, frame_duration, energy_gate,
+                            overlap)
+        path = self._entry_path(key, ".npz")
+        bits = np.packbits(np.asarray(vad_results, dtype=bool))
+        self._write(path, lambda f: np.savez(f, bits=bits, count=len(vad_results)))
+
+    def load_vad_modes(self, file_path, frame_rate, frame_duration, energy_gate=False,
+                       overlap=VAD_FRAME_OVERLAP):
+        """Return the cached all-sensitivity VAD mask (one uint8 per frame), or None."""
+        key = self._vad_key(file_path, frame_rate, "all", frame_duration, energy_gate, overlap)
+        path = self._entry_path(key, ".npz")
+        entry = self._read(path, lambda: self._load_npz(path))
+        if entry is None:
+            return None
+        packed, count = entry["nibbles"], int(entry["count"])
+        # Two frames per byte: the even frame in the low nibble, the odd one in the high nibble
+        mask = np.empty(len(packed) * 2, dtype=np.uint8)
+        mask[0::2] = packed & 0x0F
+        mask[1::2] = packed >> 4
+        return mask[:count]
+
+    def store_vad_modes(self, file_path, frame_rate, frame_duration, mode_mask, energy_gate=False,
+                        overlap=VAD_FRAME_OVERLAP):
+        key = self._vad_key(file_path, frame_rate, "all", frame_duration, energy_gate, overlap)
+        mask = np.asarray(mode_mask, dtype=np.uint8)
+        padded = np.concatenate((mask, np.zeros(len(mask) % 2, dtype=np.uint8)))
+        nibbles = padded[0::2] | padded[1::2] << 4
+        self._write(self._entry_path(key, ".npz"),
+                    lambda f: np.savez(f, nibbles=nibbles, count=len(mask)))
+
+    def get_stats(self):
+        """Hit/miss counters plus the current size of the cache on disk."""
+        with self.stats_lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        entries = self._entries()
+        return dict(stats,
+                    hit_rate=stats["hits"] / lookups if lookups else 0.0,
+                    entries=len(entries),
+                    size_bytes=sum(size for _, size, _ in entries))
+
+    def clear(self):
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Evicted meanwhile
+
+    def _read(self, path, load):
+        """Return load() as a hit, or None as a miss if the entry is absent or just evicted."""
+        try:
+            value = load()
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        self._count("hits")
+        try:
+            os.utime(path)  # The mtime doubles as the LRU timestamp
+        except FileNotFoundError:
+            pass  # Evicted after loading; the loaded (or mapped) data stays valid
+        return value
+
+    @staticmethod
+    def _load_npz(path):
+        with np.load(path) as entry:
+            return {name: entry[name] for name in entry.files}
+
+    def _count(self, name):
+        with self.stats_lock:
+            self.stats[name] += 1
+        profiler.count(f"cache.{name}")
+
+    def _write(self, path, save):
+        """Write atomically via a temporary file, then enforce the size bound."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                save(tmp_file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        self._evict()
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue  # Still memory-mapped on platforms that lock open files
+            total -= size
+            with self.stats_lock:
+                self.stats["evictions"] += 1
+            self.logger.debug(f"Evicted {os.path.basename(path)} from audio cache.")
+
+    def _entries(self):
+        """(path, size, mtime) of every cache entry."""
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith((".npy", ".npz")):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue  # Evicted by another thread since the directory was read
+                    entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        return entries
+
+    def _entry_path(self, key, suffix):
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def _audio_key(self, file_path, frame_rate):
+        return self._hash(CACHE_VERSION, "pcm", self._file_identity(file_path), frame_rate)
+
+    def _vad_key(self, file_path, frame_rate, sensitivity, frame_duration, energy_gate=False,
+                 overlap=VAD_FRAME_OVERLAP):
+        parts = [CACHE_VERSION, "vad", self._file_identity(file_path), frame_rate, sensitivity,
+                 frame_duration, overlap]
+        if energy_gate:
+            # Gated results are keyed apart; ungated keys stay as they were
+            parts.append(("gate", VAD_GATE_RATIO, VAD_GATE_MIN_RMS, VAD_GATE_MAX_RMS,
+                          VAD_GATE_WINDOW_FRAMES, VAD_GATE_HANGOVER_FRAMES))
+        return self._hash(*parts)
+
+    def _file_identity(self, file_path):
+        stat = os.stat(file_path)
+        identity = f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        if not self.use_content_hash:
+            return identity
+
+        if identity not in self._content_hashes:
+            digest = hashlib.sha1()
+            with open(file_path, "rb") as audio_file:
+                for block in iter(lambda: audio_file.read(1 << 20), b""):
+                    digest.update(block)
+            self._content_hashes[identity] = digest.hexdigest()
+        return self._content_hashes[identity]
+
+    @staticmethod
+    def _hash(*parts):
+        return hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
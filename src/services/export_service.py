@@ -0,0 +1,176 @@
+import csv
+import json
+import math
+import os
+import time
+
+from src.constants.app_constants import (
+    EXPORT_PADDING_MS, EXPORT_CHUNK_BYTES, FRAME_DURATION_MS
+)
+from src.models.audio_model import vad_frame_rate
+from src.utils.instrumentation import profiler
+from src.utils.logger import get_logger
+from src.utils.wav_reader import iter_wav_chunks, read_wav_info
+from src.utils.wav_writer import RawWavWriter
+
+MANIFEST_FIELDS = ["index", "start_sample", "end_sample", "start_s", "end_s", "duration_s",
+                   "speech_start_sample", "clip"]
+
+
+class SpeechExporter:
+    """Writes the speech of a WAV file to disk: a speech-only WAV, per-segment clips and a
+    JSON or CSV manifest.
+
+    Audio is copied from the source file as raw frames, so the output keeps the source's
+    sample rate, channels and encoding bit for bit, and only one chunk of it is in memory at
+    a time. Segments may be given at another rate (e.g. the VAD rate) and arrive as an
+    iterable, so export can start while VAD is still running; each is padded on both sides,
+    and padded segments that overlap are written as one.
+    """
+
+    def __init__(self, padding_ms=EXPORT_PADDING_MS, speech_only=True, clips=False,
+                 manifest_format="json", chunk_bytes=EXPORT_CHUNK_BYTES):
+        if manifest_format not in ("json", "csv", None):
+            raise ValueError(f"Unknown manifest format {manifest_format}")
+        self.logger = get_logger(__name__)
+        self.padding_ms = padding_ms
+        self.speech_only = speech_only
+        self.clips = clips
+        self.manifest_format = manifest_format
+        self.chunk_bytes = chunk_bytes
+
+    def export(self, source_path, segments, segment_rate, output_dir):
+        """Export segments ((start, end) sample pairs at segment_rate) of source_path.
+
+        Returns a summary with the files written and the throughput.
+        """
+        start_time = time.perf_counter()
+        info = read_wav_info(source_path)  # ValueError for files that are not PCM/float WAV
+        stem = os.path.splitext(os.path.basename(source_path))[0]
+        os.makedirs(output_dir, exist_ok=True)
+        speech_path = os.path.join(output_dir, f"{stem}_speech.wav") if self.speech_only else None
+        clip_dir = os.path.join(output_dir, f"{stem}_clips")
+        if self.clips:
+            os.makedirs(clip_dir, exist_ok=True)
+
+        records = []
+        speech_writer = RawWavWriter(speech_path, info) if speech_path else None
+        try:
+            with open(source_path, "rb") as source, profiler.span("export"):
+                padded = self._source_spans(segments, segment_rate, info)
+                for index, (first, last) in enumerate(padded, start=1):
+                    clip_name = f"{stem}_{index:04d}.wav" if self.clips else None
+                    clip_writer = (RawWavWriter(os.path.join(clip_dir, clip_name), info)
+                                   if clip_name else None)
+                    speech_start = speech_writer.num_frames if speech_writer else None
+                    try:
+                        for data in self._read_frames(source, info, first, last):
+                            if speech_writer:
+                                speech_writer.write(data)
+                            if clip_writer:
+                                clip_writer.write(data)
+                    finally:
+                        if clip_writer:
+                            clip_writer.close()
+                    records.append(self._record(index, first, last, info.frame_rate,
+                                                speech_start, clip_name))
+        finally:
+            if speech_writer:
+                speech_writer.close()
+
+        manifest_path = self._write_manifest(output_dir, stem, source_path, info, speech_path,
+                                             records)
+        elapsed = time.perf_counter() - start_time
+        speech_frames = sum(record["end_sample"] - record["start_sample"] for record in records)
+        bytes_read = speech_frames * info.channels * info.sample_width
+        summary = {
+            "source": source_path,
+            "segments": len(records),
+            "speech_s": speech_frames / info.frame_rate,
+            "speech_file": speech_path,
+            "clip_dir": clip_dir if self.clips else None,
+            "manifest": manifest_path,
+            "elapsed_s": elapsed,
+            "mb_per_s": bytes_read / 1e6 / elapsed if elapsed > 0 else 0.0,
+        }
+        self.logger.info(f"Exported {len(records)} segments ({summary['speech_s']:.1f} s) of "
+                         f"{source_path} in {elapsed:.2f} s.")
+        return summary
+
+    def _source_spans(self, segments, segment_rate, info):
+        """Yield padded [first, last) frame spans of the source, merging ones that overlap.
+
+        Boundaries are widened to whole source frames, so no speech sample is cut off.
+        """
+        padding = int(round(self.padding_ms * info.frame_rate / 1000))
+        scale = info.frame_rate / segment_rate
+        span = None
+        for start, end in segments:
+            first = max(math.floor(start * scale) - padding, 0)
+            last = min(math.ceil(end * scale) + padding, info.num_frames)
+            if span is not None and first <= span[1]:
+                span[1] = max(span[1], last)
+                continue
+            if span is not None:
+                yield span[0], span[1]
+            span = [first, last]
+        if span is not None:
+            yield span[0], span[1]
+
+    def _read_frames(self, source, info, first, last):
+        """Yield the raw bytes of frames [first, last) in chunks of at most chunk_bytes."""
+        block_align = info.channels * info.sample_width
+        frames_per_chunk = max(self.chunk_bytes // block_align, 1)
+        source.seek(info.data_offset + first * block_align)
+        for chunk_first in range(first, last, frames_per_chunk):
+            count = min(frames_per_chunk, last - chunk_first)
+            data = source.read(count * block_align)
+            if not data:
+                break
+            yield data
+
+    @staticmethod
+    def _record(index, first, last, frame_rate, speech_start, clip_name):
+        return {
+            "index": index,
+            "start_sample": first,
+            "end_sample": last,
+            "start_s": first / frame_rate,
+            "end_s": last / frame_rate,
+            "duration_s": (last - first) / frame_rate,
+            "speech_start_sample": speech_start,
+            "clip": clip_name,
+        }
+
+    def _write_manifest(self, output_dir, stem, source_path, info, speech_path, records):
+        if self.manifest_format is None:
+            return None
+        manifest_path = os.path.join(output_dir, f"{stem}_segments.{self.manifest_format}")
+        with open(manifest_path, "w", newline="", encoding="utf-8") as manifest_file:
+            if self.manifest_format == "csv":
+                writer = csv.DictWriter(manifest_file, fieldnames=MANIFEST_FIELDS)
+                writer.writeheader()
+                writer.writerows(records)
+            else:
+                json.dump({
+                    "source": source_path,
+                    "frame_rate": info.frame_rate,
+                    "channels": info.channels,
+                    "padding_ms": self.padding_ms,
+                    "speech_file": os.path.basename(speech_path) if speech_path else None,
+                    "segments": records,
+                }, manifest_file, indent=2)
+        return manifest_path
+
+
+def export_speech(source_path, vad_service, output_dir, exporter=None,
+                  frame_duration=FRAME_DURATION_MS):
+    """Run streaming VAD on source_path and export its speech as VAD finds it (headless use).
+
+    Neither the recording nor the exported audio is ever held in memory as a whole.
+    """
+    exporter = exporter or SpeechExporter()
+    frame_rate = vad_frame_rate(source_path)
+    segments = vad_service.stream_speech_segments(iter_wav_chunks(source_path, frame_rate),
+                                                  frame_rate, frame_duration)
+    return exporter.export(source_path, segments, frame_rate, output_dir)
@@ -0,0 +1,385 @@
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from src.constants.app_constants import (
+    LIBRARY_DB_PATH, LIBRARY_SCHEMA_VERSION, LIBRARY_COMMIT_BATCH, LIBRARY_COMMIT_INTERVAL_S,
+    LIBRARY_SCAN_START_METHOD, LIBRARY_SENSITIVITY, LIBRARY_STOP_POLL_S, LIBRARY_STOP_TIMEOUT_S,
+    FRAME_DURATION_MS, CACHE_VERSION, BATCH_CHUNKSIZE
+)
+from src.services.batch_service import _init_worker, _analyze_in_worker
+from src.utils.logger import get_logger
+from src.utils.wav_reader import read_wav_info
+
+LibraryEntry = namedtuple("LibraryEntry", ["path", "name", "duration_s", "frame_rate", "channels",
+                                           "speech_ratio", "num_segments", "error"])
+
+# Filter field names accepted by parse_filter, and the columns they compare
+FILTER_FIELDS = {"duration": "duration_s", "rate": "frame_rate", "channels": "channels",
+                 "speech": "speech_ratio", "segments": "num_segments"}
+SORT_COLUMNS = ("name", "duration_s", "frame_rate", "channels", "speech_ratio", "num_segments")
+_CONDITION = re.compile(r"^(\w+)(<=|>=|<|>|=)([\d.]+)(%?)$")
+
+_SCHEMA = """
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    duration_s REAL,
+    frame_rate INTEGER,
+    channels INTEGER,
+    speech_ratio REAL,
+    num_segments INTEGER,
+    analysis_key TEXT,
+    error TEXT
+);
+CREATE INDEX files_name ON files (folder, name);
+CREATE INDEX files_duration ON files (folder, duration_s);
+CREATE INDEX files_rate ON files (folder, frame_rate);
+CREATE INDEX files_channels ON files (folder, channels);
+CREATE INDEX files_speech ON files (folder, speech_ratio);
+CREATE INDEX files_segments ON files (folder, num_segments);
+"""
+
+
+def parse_filter(text):
+    """Turn filter text such as "interview duration>60 speech>=50%" into query conditions.
+
+    Words of the form field<op>number compare a column (see FILTER_FIELDS; a trailing % divides
+    by 100); every other word must appear in the file name. Returns (words, conditions).
+    """
+    words, conditions = [], []
+    for token in text.split():
+        match = _CONDITION.match(token)
+        if match and match.group(1).lower() in FILTER_FIELDS:
+            field, op, number, percent = match.groups()
+            try:
+                value = float(number) / (100 if percent else 1)
+            except ValueError:
+                words.append(token)
+                continue
+            conditions.append((FILTER_FIELDS[field.lower()], op, value))
+        else:
+            words.append(token)
+    return words, conditions
+
+
+def _analyze_chunk(tasks):
+    """Worker: analyze several files per round trip (Pool's own chunking hides next(timeout))."""
+    return [_analyze_in_worker(task) for task in tasks]
+
+
+class LibraryIndex:
+    """Persistent SQLite index of audio files and their metadata, per folder.
+
+    Each row holds a file's size and mtime, its header fields (duration, sample rate, channels)
+    and its VAD summary (speech ratio, segment count). Rows are only refreshed when size or
+    mtime change, and the VAD summary is redone when the VAD settings (analysis_key) change.
+    One connection is shared by the UI and the scanner thread, guarded by a lock; writes are
+    batched so reads never wait long.
+    """
+
+    def __init__(self, db_path=LIBRARY_DB_PATH):
+        self.logger = get_logger(__name__)
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def sync_folder(self, folder, entries):
+        """Bring the rows of folder in line with entries ({path: (size, mtime_ns)}).
+
+        Rows of deleted files are removed; new or modified files get a fresh row without
+        metadata. Returns the paths that need their header read.
+        """
+        with self.lock, self.connection:
+            known = dict(((path, (size, mtime)) for path, size, mtime in self.connection.execute(
+                "SELECT path, size, mtime_ns FROM files WHERE folder = ?", (folder,))))
+            removed = [(path,) for path in known if path not in entries]
+            changed = [path for path, stat in entries.items() if known.get(path) != stat]
+            self.connection.executemany("DELETE FROM files WHERE path = ?", removed)
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO files (path, folder, name, size, mtime_ns) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(path, folder, os.path.basename(path), *entries[path]) for path in changed])
+        return changed
+
+    def update_headers(self, rows):
+        """Store (duration_s, frame_rate, channels, path) tuples read from file headers.
+
+        A row may carry an error before its path, (duration_s, frame_rate, channels, error,
+        path), for a file whose header could not be read.
+        """
+        rows = [row if len(row) == 5 else (*row[:3], None, row[3]) for row in rows]
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "UPDATE files SET duration_s = ?, frame_rate = ?, channels = ?, error = ? "
+                "WHERE path = ?", rows)
+
+    def pending_analysis(self, folder, analysis_key):
+        """Paths in folder without a VAD summary for the current settings, by name."""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT path FROM files WHERE folder = ? AND analysis_key IS NOT ? ORDER BY name",
+                (folder, analysis_key)).fetchall()
+        return [path for path, in rows]
+
+    def update_analysis(self, records, analysis_key):
+        """Store batch_service.analyze_file records (failed files keep their error)."""
+        rows = [(record.get("duration_s"), record.get("frame_rate"), record.get("speech_ratio"),
+                 record.get("num_segments"), analysis_key, record["error"], record["file"])
+                for record in records]
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "UPDATE files SET duration_s = COALESCE(?, duration_s), "
+                "frame_rate = COALESCE(?, frame_rate), speech_ratio = ?, num_segments = ?, "
+                "analysis_key = ?, error = ? WHERE path = ?", rows)
+
+    def ordered_ids(self, folder, filter_text="", sort_by="name", descending=False):
+        """Row ids of folder's files matching filter_text, in display order.
+
+        Each order is read from a (folder, column) index, so sorting 50k files costs tens of
+        milliseconds; entries() then fetches any page of the result. Files whose sort value is
+        unknown yet (still being scanned) come last, by name, in both directions.
+        """
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort_by}; use one of {SORT_COLUMNS}")
+        where, params = self._where(folder, filter_text)
+        direction = "DESC" if descending else "ASC"
+        with self.lock:
+            known = self.connection.execute(
+                f"SELECT rowid FROM files WHERE {where} AND {sort_by} IS NOT NULL "
+                f"ORDER BY {sort_by} {direction}", params).fetchall()
+            unknown = self.connection.execute(
+                f"SELECT rowid FROM files WHERE {where} AND {sort_by} IS NULL ORDER BY name",
+                params).fetchall()
+        return [row_id for row_id, in known + unknown]
+
+    def entries(self, row_ids):
+        """LibraryEntry rows for row_ids, in the same order (rows deleted since are left out)."""
+        if not row_ids:
+            return []
+        placeholders = ", ".join("?" * len(row_ids))
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT rowid, {', '.join(LibraryEntry._fields)} FROM files "
+                f"WHERE rowid IN ({placeholders})", list(row_ids)).fetchall()
+        by_id = {row[0]: LibraryEntry(*row[1:]) for row in rows}
+        return [by_id[row_id] for row_id in row_ids if row_id in by_id]
+
+    def query(self, folder, filter_text="", sort_by="name", descending=False, offset=0,
+              limit=None):
+        """One page of LibraryEntry rows; see ordered_ids for the order."""
+        row_ids = self.ordered_ids(folder, filter_text, sort_by, descending)
+        end = None if limit is None else offset + limit
+        return self.entries(row_ids[offset:end])
+
+    @staticmethod
+    def _where(folder, filter_text):
+        words, conditions = parse_filter(filter_text)
+        clauses, params = ["folder = ?"], [folder]
+        for word in words:
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        for column, op, value in conditions:
+            # Columns and operators come from fixed tables in parse_filter, never from the text
+            clauses.append(f"{column} {op} ?")
+            params.append(value)
+        return " AND ".join(clauses), params
+
+    def _create_schema(self):
+        with self.lock, self.connection:
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            if version == LIBRARY_SCHEMA_VERSION:
+                return
+            if version:
+                self.logger.info("Library index layout changed; rebuilding it.")
+            self.connection.execute("DROP TABLE IF EXISTS files")
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {LIBRARY_SCHEMA_VERSION}")
+
+
+class LibraryScanner:
+    """Fills a LibraryIndex for a folder in the background.
+
+    A scan lists the folder, re-reads the headers of new or modified files (fast, so durations
+    appear within seconds even for large folders), then runs VAD on every file lacking a summary
+    for the current settings in a process pool, committing results in batches. Only one
+    folder is scanned at a time; starting another scan or stop() cancels the running one.
+
+    Speech ratios are computed at a fixed sensitivity rather than the player's, so changing the
+    selector neither stales the index nor mixes settings within a scan; the energy gate and
+    overlap are taken from vad_service when a scan starts.
+    """
+
+    def __init__(self, index, vad_service, workers=None, frame_duration=FRAME_DURATION_MS,
+                 sensitivity=LIBRARY_SENSITIVITY):
+        self.logger = get_logger(__name__)
+        self.index = index
+        self.vad_service = vad_service
+        self.sensitivity = sensitivity
+        self.frame_duration = frame_duration
+        # Leave a core to the UI and playback
+        self.workers = workers or max((os.cpu_count() or 1) - 1, 1)
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.progress_lock = threading.Lock()
+        self.progress = {"folder": None, "files": 0, "analyzed": 0, "running": False}
+        self.version = 0  # Increases with every committed batch, so views know to refresh
+
+    @property
+    def settings(self):
+        """(sensitivity, energy_gate, overlap) the next scan analyzes with."""
+        return self.sensitivity, self.vad_service.energy_gate, self.vad_service.overlap
+
+    @property
+    def analysis_key(self):
+        """Identifies the VAD settings a stored speech ratio was computed with."""
+        return self._analysis_key(self.settings)
+
+    def _analysis_key(self, settings):
+        sensitivity, energy_gate, overlap = settings
+        return f"{CACHE_VERSION}:{sensitivity}:{self.frame_duration}:{overlap}:{energy_gate}"
+
+    def start(self, folder):
+        self.stop()
+        self.stop_event = threading.Event()
+        self._set_progress(folder=folder, files=0, analyzed=0, running=True)
+        # The whole scan uses, and stores results under, the settings at its start
+        settings = self.settings
+        self.thread = threading.Thread(target=self._scan,
+                                       args=(folder, self.stop_event, settings,
+                                             self._analysis_key(settings)),
+                                       name="library-scan", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Cancel the running scan; called on the Tk thread, so it waits only briefly."""
+        self.stop_event.set()
+        if self.thread:
+            # The scan notices within LIBRARY_STOP_POLL_S, even while a worker is on a long file
+            self.thread.join(LIBRARY_STOP_TIMEOUT_S)
+            if self.thread.is_alive():
+                self.logger.warning("Library scan is still winding down.")
+            self.thread = None
+
+    def get_progress(self):
+        with self.progress_lock:
+            return dict(self.progress)
+
+    def wait(self, timeout=None):
+        """Block until the current scan finishes; returns whether it did."""
+        if self.thread:
+            self.thread.join(timeout)
+            return not self.thread.is_alive()
+        return True
+
+    def _scan(self, folder, stop_event, settings, analysis_key):
+        try:
+            entries = self._list_folder(folder)
+            self._set_progress(files=len(entries))
+            changed = self.index.sync_folder(folder, entries)
+            self._bump()
+            self._read_headers(changed, stop_event)
+
+            pending = self.index.pending_analysis(folder, analysis_key)
+            self._set_progress(analyzed=len(entries) - len(pending))
+            if pending and not stop_event.is_set():
+                self._analyze(pending, stop_event, settings, analysis_key)
+            self.logger.info(f"Indexed {folder}: {len(entries)} files, {len(changed)} new or "
+                             f"changed, {len(pending)} analyzed.")
+        except Exception as exc:  # pylint: disable=broad-except
+            # e.g. the folder vanished or the index is locked; files fail one by one, not here
+            self.logger.error(f"Scanning {folder} failed: {type(exc).__name__}: {exc}")
+        finally:
+            self._set_progress(running=False)
+
+    @staticmethod
+    def _list_folder(folder, extension=".wav"):
+        """{path: (size, mtime_ns)} of the audio files in folder, from one directory read."""
+        entries = {}
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.name.lower().endswith(extension) and entry.is_file():
+                    stat = entry.stat()
+                    entries[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        return entries
+
+    def _read_headers(self, paths, stop_event):
+        rows = []
+        for path in paths:
+            if stop_event.is_set():
+                return
+            try:
+                info = read_wav_info(path)
+            except (OSError, ValueError):
+                continue  # Left to the VAD pass, whose decoder handles more formats
+            except Exception as exc:  # pylint: disable=broad-except
+                # One unreadable file must not end the scan; the VAD pass still tries it
+                self.logger.warning(f"Reading the header of {path} failed: {exc}")
+                rows.append((None, None, None, f"{type(exc).__name__}: {exc}", path))
+            else:
+                rows.append((info.num_frames / info.frame_rate, info.frame_rate, info.channels,
+                             path))
+            if len(rows) >= LIBRARY_COMMIT_BATCH:
+                self.index.update_headers(rows)
+                self._bump()
+                rows = []
+        self.index.update_headers(rows)
+        self._bump()
+
+    def _analyze(self, paths, stop_event, settings, analysis_key):
+        context = multiprocessing.get_context(LIBRARY_SCAN_START_METHOD)
+        tasks = [(path, self.frame_duration) for path in paths]
+        chunks = [tasks[first:first + BATCH_CHUNKSIZE]
+                  for first in range(0, len(tasks), BATCH_CHUNKSIZE)]
+        records = []
+        last_commit = time.perf_counter()
+        with context.Pool(self.workers, initializer=_init_worker, initargs=settings) as pool:
+            results = pool.imap_unordered(_analyze_chunk, chunks)
+            while not stop_event.is_set():  # Leaving the block terminates the workers
+                try:
+                    records.extend(results.next(timeout=LIBRARY_STOP_POLL_S))
+                except multiprocessing.TimeoutError:
+                    continue
+                except StopIteration:
+                    break
+                now = time.perf_counter()
+                # Long files analyze slowly, so also commit on time to keep the list moving
+                if (len(records) >= LIBRARY_COMMIT_BATCH or
+                        now - last_commit >= LIBRARY_COMMIT_INTERVAL_S):
+                    self._commit_analysis(records, analysis_key)
+                    records = []
+                    last_commit = now
+        self._commit_analysis(records, analysis_key)
+
+    def _commit_analysis(self, records, analysis_key):
+        if not records:
+            return
+        self.index.update_analysis(records, analysis_key)
+        with self.progress_lock:
+            self.progress["analyzed"] += len(records)
+        self._bump()
+
+    def _set_progress(self, **values):
+        with self.progress_lock:
+            self.progress.update(values)
+
+    def _bump(self):
+        with self.progress_lock:
+            self.version += 1
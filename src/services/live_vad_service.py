@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+from src.constants.app_constants import (
+    FRAME_DURATION_MS, VAD_SAMPLE_RATE, LIVE_BUFFER_SECONDS, LIVE_MAX_LAG_MS, LIVE_WAIT_TIMEOUT_S,
+    LIVE_LATENCY_WINDOW, LIVE_FRAME_DURATIONS_MS, LIVE_FRAME_RATES
+)
+from src.utils.instrumentation import profiler
+from src.utils.logger import get_logger
+from src.utils.ring_buffer import RingBuffer
+
+# skipped_frames counts frames dropped just before this one to keep up with the source
+LiveDecision = namedtuple("LiveDecision", ["frame_index", "start_sample", "is_speech",
+                                           "latency_ms", "skipped_frames"])
+
+
+class LiveVADSession:
+    """Runs VAD on a live source as fast as its audio arrives.
+
+    A reader thread copies the source's PCM into a bounded ring buffer; decisions() frames
+    the buffered audio exactly like VADService.stream_voice_activity and yields one
+    LiveDecision per frame with its end-to-end latency (arrival of the frame's last sample
+    to its decision). When the backlog grows beyond max_lag_ms the oldest frames are skipped
+    and flagged instead of letting latency grow without bound.
+    """
+
+    def __init__(self, vad_service, source, frame_rate=VAD_SAMPLE_RATE,
+                 frame_duration=FRAME_DURATION_MS, buffer_seconds=LIVE_BUFFER_SECONDS,
+                 max_lag_ms=LIVE_MAX_LAG_MS):
+        if frame_duration not in LIVE_FRAME_DURATIONS_MS:
+            raise ValueError(f"Frame duration must be one of {LIVE_FRAME_DURATIONS_MS} ms")
+        if frame_rate not in LIVE_FRAME_RATES:
+            raise ValueError(f"Sample rate must be one of {LIVE_FRAME_RATES} Hz")
+
+        self.logger = get_logger(__name__)
+        self.vad_service = vad_service
+        self.source = source
+        self.frame_rate = frame_rate
+        self.frame_duration = frame_duration
+        self.max_lag = int(max_lag_ms * frame_rate / 1000)
+        self.ring = RingBuffer(int(buffer_seconds * frame_rate))
+        self.reader = None
+        self.stop_event = threading.Event()
+
+        self.frames = 0
+        self.speech_frames = 0
+        self.dropped_frames = 0
+        self.latencies = deque(maxlen=LIVE_LATENCY_WINDOW)  # Seconds, most recent frames
+
+    def start(self):
+        """Start pulling audio from the source in the background."""
+        self.reader = threading.Thread(target=self._read_source, name="live-source", daemon=True)
+        self.reader.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        self.source.close()
+        self.ring.close()
+
+    def decisions(self):
+        """Yield a LiveDecision per frame until the source ends or stop() is called."""
+        frame_size, step_size = self.vad_service.frame_geometry(
+            self.frame_rate, self.frame_duration, self.vad_service.overlap)
+        position = 0  # Absolute index of the next frame's first sample
+        frame_index = 0
+        skipped = 0
+
+        while not self.stop_event.is_set():
+            if not self.ring.wait_for(position + frame_size, LIVE_WAIT_TIMEOUT_S):
+                if self.ring.closed:
+                    break
+                continue
+
+            # Backpressure: rather than fall further behind, jump to the newest full frame
+            backlog = self.ring.written - (position + frame_size)
+            if backlog > self.max_lag or position < self.ring.oldest:
+                jump = backlog // step_size
+                position += jump * step_size
+                frame_index += jump
+                skipped += jump
+                self.dropped_frames += jump
+                profiler.count("live.dropped_frames", jump)
+
+            frame = self.ring.read(position, frame_size)
+            if frame is None:
+                continue  # Overwritten between the check and the read; the next pass catches up
+            is_speech = self.vad_service.classify_frame(frame.tobytes(), self.frame_rate)
+            arrival_time = self.ring.arrival_time(position + frame_size)
+            latency = time.perf_counter() - arrival_time if arrival_time is not None else 0.0
+
+            self.frames += 1
+            self.speech_frames += is_speech
+            self.latencies.append(latency)
+            profiler.observe("live.latency", latency)
+            yield LiveDecision(frame_index, position, is_speech, latency * 1000, skipped)
+
+            skipped = 0
+            position += step_size
+            frame_index += 1
+
+    def read_samples(self, start, end):
+        """Buffered samples [start, end), clipped to what is still held (e.g. for plotting)."""
+        start = max(start, self.ring.oldest)
+        end = min(end, self.ring.written)
+        samples = self.ring.read(start, end - start) if end > start else None
+        return start, samples if samples is not None else np.empty(0, dtype=np.int16)
+
+    def get_stats(self):
+        """Frame counts, drops and latency percentiles over the most recent frames."""
+        latencies_ms = np.array(self.latencies) * 1000
+        has_frames = len(latencies_ms) > 0
+        return {
+            "frames": self.frames,
+            "speech_frames": self.speech_frames,
+            "dropped_frames": self.dropped_frames,
+            "received_s": self.ring.written / self.frame_rate,
+            "latency_p50_ms": float(np.percentile(latencies_ms, 50)) if has_frames else 0.0,
+            "latency_p95_ms": float(np.percentile(latencies_ms, 95)) if has_frames else 0.0,
+            "latency_max_ms": float(latencies_ms.max()) if has_frames else 0.0,
+        }
+
+    def _read_source(self):
+        remainder = b''  # Odd trailing byte of a chunk
+        try:
+            for chunk in self.source.read_chunks():
+                if self.stop_event.is_set():
+                    break
+                chunk = remainder + bytes(chunk)
+                usable = len(chunk) - len(chunk) % 2
+                remainder = chunk[usable:]
+                self.ring.write(np.frombuffer(chunk[:usable], dtype="<i2"), time.perf_counter())
+        except OSError as exc:
+            if not self.stop_event.is_set():
+                self.logger.error(f"Live source failed: {exc}")
+        finally:
+            self.ring.close()
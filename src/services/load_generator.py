@@ -0,0 +1,127 @@
+import asyncio
+import json
+import time
+from collections import Counter
+
+from src.constants.app_constants import (
+    SERVER_HOST, SERVER_PORT, LOADGEN_REQUESTS, LOADGEN_CONCURRENCY, LOADGEN_CHUNK_BYTES
+)
+from src.services.vad_server import percentiles_ms
+
+
+class HTTPClient:
+    """Minimal keep-alive HTTP/1.1 client on asyncio streams, enough to drive the VAD server."""
+
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, body=b"", chunked=False, headers=None):
+        """Send one request and return (status, headers, body); reconnects when needed."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        lines.append("Transfer-Encoding: chunked" if chunked else f"Content-Length: {len(body)}")
+        try:
+            self.writer.write("\r\n".join(lines).encode("latin-1") + b"\r\n\r\n")
+            if chunked:
+                for first in range(0, len(body), LOADGEN_CHUNK_BYTES):
+                    chunk = body[first:first + LOADGEN_CHUNK_BYTES]
+                    self.writer.write(b"%x\r\n" % len(chunk) + chunk + b"\r\n")
+                    await self.writer.drain()  # Each chunk goes out on its own, like a stream
+                self.writer.write(b"0\r\n\r\n")
+            else:
+                self.writer.write(body)
+            await self.writer.drain()
+            status, response_headers, response_body = await self._read_response()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            await self.close()
+            raise
+        if response_headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, response_headers, response_body
+
+    async def get_json(self, path):
+        status, _, body = await self.request("GET", path)
+        return status, json.loads(body)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+    async def _read_response(self):
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionResetError("Server closed the connection")
+        status = int(line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        return status, headers, body
+
+
+async def run_load(body, host=SERVER_HOST, port=SERVER_PORT, path="/vad",
+                   requests=LOADGEN_REQUESTS, concurrency=LOADGEN_CONCURRENCY, chunked=False):
+    """POST body to the server requests times from concurrency connections at once.
+
+    Returns the client-side view: status counts, requests/s, audio seconds analyzed per
+    second and latency percentiles of the successful requests, plus the server's /metrics.
+    Busy responses (503) are counted, not retried, so the report shows the backpressure.
+    """
+    remaining = iter(range(requests))
+    statuses = Counter()
+    latencies = []
+    audio_s = 0.0
+
+    async def connection_loop():
+        nonlocal audio_s
+        client = HTTPClient(host, port)
+        try:
+            for _ in remaining:
+                start = time.perf_counter()
+                try:
+                    status, _, response = await client.request("POST", path, body, chunked)
+                except (OSError, asyncio.IncompleteReadError):
+                    statuses["connection_error"] += 1
+                    continue
+                statuses[status] += 1
+                if status == 200:
+                    latencies.append(time.perf_counter() - start)
+                    audio_s += json.loads(response)["duration_s"]
+        finally:
+            await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(connection_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    client = HTTPClient(host, port)
+    try:
+        _, server_metrics = await client.get_json("/metrics")
+    finally:
+        await client.close()
+
+    report = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "chunked": chunked,
+        "ok": statuses[200],
+        "rejected": statuses[503],
+        "errors": requests - statuses[200] - statuses[503],
+        "statuses": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+        "elapsed_s": elapsed,
+        "requests_per_s": statuses[200] / elapsed if elapsed > 0 else 0.0,
+        "audio_s_per_s": audio_s / elapsed if elapsed > 0 else 0.0,
+    }
+    report.update(percentiles_ms("latency", latencies))
+    report["server"] = server_metrics
+    return report
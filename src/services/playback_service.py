@@ -0,0 +1,248 @@
+import threading
+import time
+
+import numpy as np
+from src.constants.app_constants import PLAYBACK_CHUNK_MS, PLAYBACK_POLL_S
+from src.utils.logger import get_logger
+
+
+class PlaybackEngine:
+    """Plays an already-decoded int16 buffer through an output device.
+
+    The device pulls fixed-size chunks with read(); the playback clock is the number of
+    samples handed out minus what the device still holds, so it never drifts from the audio
+    and seeking is just moving the read offset. All state is guarded by a lock, because the
+    device pulls from its own thread while the UI plays, pauses and seeks.
+    """
+
+    def __init__(self, device=None):
+        self.logger = get_logger(__name__)
+        self.output = device or NullDevice()  # The device asked for
+        self.device = self.output  # The device playing the current buffer
+        self.samples = np.empty(0, dtype=np.int16)
+        self.frame_rate = None
+        self.position = 0  # Next sample handed to the device
+        self.playing = False
+        self.lock = threading.Lock()
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.frame_rate if self.frame_rate else 0.0
+
+    def load(self, samples, frame_rate):
+        """Stop playback and make samples (mono int16) the buffer to play.
+
+        If the output device cannot play this buffer, it plays silently; the device is tried
+        again with the next buffer.
+        """
+        self.stop()
+        try:
+            self.output.open(frame_rate)
+            self.device = self.output
+        except OSError as exc:
+            self.logger.warning(f"Audio output unavailable ({exc}); playing silently.")
+            self.device = NullDevice()
+            self.device.open(frame_rate)
+        with self.lock:
+            self.samples = np.ascontiguousarray(samples, dtype=np.int16)
+            self.frame_rate = frame_rate
+            self.position = 0
+
+    def play(self):
+        with self.lock:
+            if self.playing or self.frame_rate is None:
+                return
+            if self.position >= len(self.samples):
+                self.position = 0  # Finished: play again from the start
+            self.playing = True
+        self.device.start(self)
+
+    def pause(self):
+        """Stop output, keeping the position of the last sample actually heard."""
+        position = self._heard_position()
+        with self.lock:
+            self.playing = False
+        self.device.stop()
+        with self.lock:
+            self.position = position
+
+    def stop(self):
+        self.pause()
+        with self.lock:
+            self.position = 0
+
+    def seek(self, seconds):
+        """Jump to seconds into the buffer; takes effect within one device chunk."""
+        if self.frame_rate is None:
+            return
+        with self.lock:
+            self.position = min(max(int(round(seconds * self.frame_rate)), 0), len(self.samples))
+        self.device.flush()
+
+    def get_position(self):
+        """Current playback position in seconds."""
+        return self._heard_position() / self.frame_rate if self.frame_rate else 0.0
+
+    def read(self, count):
+        """Device side: the next count samples (fewer at the end), or None when finished."""
+        with self.lock:
+            if not self.playing:
+                return None
+            chunk = self.samples[self.position:self.position + count]
+            self.position += len(chunk)
+            if len(chunk) == 0:
+                self.playing = False
+                return None
+            return chunk
+
+    def _heard_position(self):
+        with self.lock:
+            position = self.position
+        return max(position - self.device.buffered_samples(), 0)
+
+
+class NullDevice:
+    """Output device that discards the audio at real-time pace.
+
+    Keeps the clock and end-of-file behaviour of a real device where there is no sound card
+    (headless runs, tests). With realtime off no thread is started and the caller pulls
+    chunks with engine.read() itself.
+    """
+
+    def __init__(self, realtime=True, chunk_ms=PLAYBACK_CHUNK_MS):
+        self.realtime = realtime
+        self.chunk_ms = chunk_ms
+        self.chunk_samples = 0
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    def open(self, frame_rate):
+        self.chunk_samples = max(int(frame_rate * self.chunk_ms / 1000), 1)
+
+    def start(self, engine):
+        if not self.realtime:
+            return
+        self.stop()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, args=(engine,), name="null-audio",
+                                       daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
+
+    def flush(self):
+        pass  # Nothing is buffered
+
+    def buffered_samples(self):
+        return 0
+
+    def _run(self, engine):
+        period = self.chunk_ms / 1000
+        next_time = time.perf_counter()
+        while not self.stop_event.is_set():
+            if engine.read(self.chunk_samples) is None:
+                break
+            next_time += period
+            self.stop_event.wait(max(next_time - time.perf_counter(), 0))
+
+
+class PygameDevice:
+    """Streams chunks of the buffer to a pygame mixer channel.
+
+    One chunk plays while the next is queued, so at most two chunks are in flight; the mixer
+    is re-initialised as mono 16-bit whenever a buffer with a new sample rate is loaded.
+    """
+
+    def __init__(self, chunk_ms=PLAYBACK_CHUNK_MS):
+        self.chunk_ms = chunk_ms
+        self.chunk_samples = 0
+        self.channel = None
+        self.in_flight = []  # Lengths of the chunks playing and queued, oldest first
+        self.in_flight_lock = threading.Lock()
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    def open(self, frame_rate):
+        import pygame
+
+        self.stop()
+        try:
+            if pygame.mixer.get_init() != (frame_rate, -16, 1):
+                pygame.mixer.quit()
+                # Without allowedchanges=0 SDL may open the device at another rate or in stereo
+                pygame.mixer.init(frequency=frame_rate, size=-16, channels=1, allowedchanges=0)
+        except pygame.error as exc:
+            raise OSError(str(exc)) from exc
+        opened = pygame.mixer.get_init()
+        if opened != (frame_rate, -16, 1):
+            # Mono 16-bit chunks would play at the wrong speed and the clock would drift
+            pygame.mixer.quit()
+            raise OSError(f"Mixer opened as {opened}, not {frame_rate} Hz mono 16-bit")
+        self.channel = pygame.mixer.Channel(0)
+        self.chunk_samples = max(int(frame_rate * self.chunk_ms / 1000), 1)
+
+    def start(self, engine):
+        self.stop()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, args=(engine,), name="pygame-audio",
+                                       daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
+        self.flush()
+
+    def flush(self):
+        """Drop the chunks in flight, e.g. after a seek, so the new position plays at once."""
+        if self.channel is not None:
+            self.channel.stop()
+        with self.in_flight_lock:
+            self.in_flight.clear()
+
+    def buffered_samples(self):
+        """Samples handed out but not heard yet: the queued chunk and half the playing one."""
+        with self.in_flight_lock:
+            if not self.in_flight:
+                return 0
+            return self.in_flight[0] // 2 + sum(self.in_flight[1:])
+
+    def _run(self, engine):
+        import pygame
+
+        while not self.stop_event.is_set():
+            with self.in_flight_lock:
+                # Forget chunks the channel has finished with
+                if not self.channel.get_busy():
+                    self.in_flight.clear()
+                elif self.channel.get_queue() is None and len(self.in_flight) > 1:
+                    self.in_flight.pop(0)
+                needs_chunk = len(self.in_flight) < 2
+
+            if needs_chunk:
+                chunk = engine.read(self.chunk_samples)
+                if chunk is None:
+                    self._drain()
+                    break
+                sound = pygame.mixer.Sound(buffer=chunk.tobytes())
+                with self.in_flight_lock:
+                    if self.channel.get_busy():
+                        self.channel.queue(sound)
+                    else:
+                        self.channel.play(sound)
+                    self.in_flight.append(len(chunk))
+                continue
+            self.stop_event.wait(PLAYBACK_POLL_S)
+
+    def _drain(self):
+        """Let the last chunks play out, so the clock reaches the end of the buffer."""
+        while self.channel.get_busy() and not self.stop_event.wait(PLAYBACK_POLL_S):
+            pass
+        with self.in_flight_lock:
+            self.in_flight.clear()
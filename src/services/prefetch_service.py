@@ -0,0 +1,205 @@
+import os
+import threading
+from collections import OrderedDict
+
+from src.constants.app_constants import FRAME_DURATION_MS, PREFETCH_MAX_BYTES
+from src.services.vad_service import VADService
+from src.utils.frame_energy import FrameEnergy
+from src.utils.instrumentation import profiler
+from src.utils.logger import get_logger
+from src.utils.waveform_pyramid import WaveformPyramid
+
+
+class PreparedFile:
+    """Everything needed to show a file: PCM, plot envelopes and the all-sensitivity VAD mask."""
+
+    def __init__(self, file_path, audio_data, frame_rate, pyramid, frame_energy, mode_mask=None):
+        self.file_path = file_path
+        self.audio_data = audio_data
+        self.frame_rate = frame_rate
+        self.pyramid = pyramid
+        self.frame_energy = frame_energy
+        self.mode_mask = mode_mask
+
+    @classmethod
+    def decode(cls, model, file_path):
+        """Decode file_path and build its envelopes; VAD is left to compute_vad_modes."""
+        audio_data, frame_rate = model.prepare_audio(file_path)
+        pyramid = WaveformPyramid(audio_data, frame_rate)
+        # One RMS per VAD frame, drawn as the energy trace and reused by the energy gate
+        frame_geometry = VADService.frame_geometry(frame_rate, FRAME_DURATION_MS,
+                                                   model.vad_service.overlap)
+        frame_energy = FrameEnergy.from_audio(audio_data, frame_rate, *frame_geometry)
+        return cls(file_path, audio_data, frame_rate, pyramid, frame_energy)
+
+    def compute_vad_modes(self, model, cancel_event=None):
+        """Fill in mode_mask; returns it, or None if cancel_event was set first."""
+        self.mode_mask = model.compute_vad_modes(self.file_path, self.audio_data, self.frame_rate,
+                                                 cancel_event, self.frame_energy.rms)
+        return self.mode_mask
+
+    @property
+    def nbytes(self):
+        """Memory held by the arrays (a memory-mapped PCM counts at its full size)."""
+        mask_bytes = self.mode_mask.nbytes if self.mode_mask is not None else 0
+        return (self.audio_data.nbytes + self.pyramid.nbytes + self.frame_energy.rms.nbytes +
+                mask_bytes)
+
+
+class PreparedFileCache:
+    """In-memory LRU of PreparedFiles, bounded by the bytes their arrays hold.
+
+    Entries are keyed by path, size and mtime, so a file changed on disk is prepared again.
+    Safe to use from the loader, the prefetcher and the UI thread at once.
+    """
+
+    def __init__(self, max_bytes=PREFETCH_MAX_BYTES):
+        self.logger = get_logger(__name__)
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> PreparedFile, least recently used first
+        self.size_bytes = 0
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "stored": 0}
+
+    def get(self, file_path):
+        """Return the prepared file and mark it recently used, or None (counted as a miss)."""
+        key = self._key(file_path)
+        with self.lock:
+            prepared = self.entries.get(key)
+            if prepared is None:
+                self.stats["misses"] += 1
+                profiler.count("prefetch.misses")
+                return None
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+        profiler.count("prefetch.hits")
+        return prepared
+
+    def __contains__(self, file_path):
+        """Whether file_path is cached, without counting a lookup or changing its recency."""
+        key = self._key(file_path)
+        with self.lock:
+            return key in self.entries
+
+    def put(self, prepared):
+        """Store a fully analyzed file, evicting the least recently used ones to fit."""
+        size = prepared.nbytes
+        if size > self.max_bytes:
+            self.logger.debug(f"{prepared.file_path} ({size} bytes) exceeds the prefetch budget.")
+            return
+        key = self._key(prepared.file_path)
+        with self.lock:
+            if key in self.entries:
+                self.size_bytes -= self.entries.pop(key).nbytes
+            self.entries[key] = prepared
+            self.size_bytes += size
+            self.stats["stored"] += 1
+            while self.size_bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size_bytes -= evicted.nbytes
+                self.stats["evictions"] += 1
+                profiler.count("prefetch.evictions")
+
+    def get_stats(self):
+        with self.lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return dict(self.stats, hit_rate=self.stats["hits"] / lookups if lookups else 0.0,
+                        entries=len(self.entries), size_bytes=self.size_bytes,
+                        max_bytes=self.max_bytes)
+
+    @staticmethod
+    def _key(file_path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return file_path, None, None
+        return file_path, stat.st_size, stat.st_mtime_ns
+
+
+class Prefetcher:
+    """Prepares the files around the current selection in the background.
+
+    schedule() replaces the wanted files (nearest first); files already cached are skipped
+    and a file being prepared that is no longer wanted is cancelled. The work runs on one
+    daemon thread, so it never takes more than a core from the UI and the foreground loader.
+    """
+
+    def __init__(self, model, cache):
+        self.logger = get_logger(__name__)
+        self.model = model
+        self.cache = cache
+        self.pending = []  # Files still to prepare, nearest to the selection first
+        self.current = None  # (file_path, cancel_event) of the file being prepared
+        self.condition = threading.Condition()
+        self.closed = False
+        self.prefetched = 0
+        self.thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+        self.thread.start()
+
+    def schedule(self, file_paths):
+        with self.condition:
+            self.pending = list(file_paths)
+            if self.current and self.current[0] not in self.pending:
+                self.current[1].set()
+            self.condition.notify_all()
+
+    def cancel(self, keep=None):
+        """Drop all pending work, e.g. while a foreground load needs the CPU.
+
+        A file being prepared is finished if it is keep, e.g. the file just selected, whose
+        load then picks it up through wait_for() instead of decoding it again.
+        """
+        with self.condition:
+            self.pending = []
+            if self.current and self.current[0] != keep:
+                self.current[1].set()
+            self.condition.notify_all()
+
+    def wait_for(self, file_path):
+        """Block while file_path is being prepared, so its result can be taken from the cache."""
+        with self.condition:
+            self.condition.wait_for(lambda: not self.current or self.current[0] != file_path)
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.pending = []
+            if self.current:
+                self.current[1].set()
+            self.condition.notify_all()
+        self.thread.join()
+
+    def wait_idle(self, timeout=None):
+        """Block until nothing is pending or being prepared; returns whether that happened."""
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending and not self.current,
+                                           timeout)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending or self.closed)
+                if self.closed:
+                    return
+                file_path = self.pending.pop(0)
+                cancel_event = threading.Event()
+                self.current = (file_path, cancel_event)
+
+            try:
+                if file_path not in self.cache:
+                    self._prepare(file_path, cancel_event)
+            except Exception as exc:  # pylint: disable=broad-except
+                # A bad neighbour must not stop prefetching the others
+                self.logger.debug(f"Prefetching {file_path} failed: {exc}")
+            finally:
+                with self.condition:
+                    self.current = None
+                    self.condition.notify_all()
+
+    def _prepare(self, file_path, cancel_event):
+        prepared = PreparedFile.decode(self.model, file_path)
+        if cancel_event.is_set() or prepared.compute_vad_modes(self.model, cancel_event) is None:
+            return
+        self.cache.put(prepared)
+        self.prefetched += 1
+        profiler.count("prefetch.prepared")
@@ -0,0 +1,542 @@
+import asyncio
+import io
+import json
+import os
+import struct
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from multiprocessing import get_context
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+from src.constants.app_constants import (
+    FRAME_DURATION_MS, VAD_SENSITIVITY, VAD_ENERGY_GATE, VAD_FRAME_OVERLAP, VAD_NATIVE_RATES,
+    VAD_SAMPLE_RATE, LIVE_FRAME_DURATIONS_MS, LIVE_FRAME_RATES, SERVER_HOST, SERVER_PORT,
+    SERVER_START_METHOD, SERVER_MAX_CONNECTIONS, SERVER_MAX_QUEUE, SERVER_MAX_BODY_BYTES,
+    SERVER_MAX_HELD_BYTES, SERVER_DISCARD_BYTES,
+    SERVER_MAX_LINE_BYTES, SERVER_READ_TIMEOUT_S, SERVER_RETRY_AFTER_S, SERVER_BATCH_MAX_REQUESTS,
+    SERVER_BATCH_MAX_BYTES, SERVER_LATENCY_WINDOW, SERVER_RATE_WINDOW_S
+)
+from src.services.vad_service import VADService
+from src.utils.logger import get_logger
+from src.utils.wav_reader import load_wav_bytes, parse_wav_header
+
+WAV_CONTENT_TYPES = ("audio/wav", "audio/wave", "audio/x-wav")
+
+# args: (body, is_wav, rate, sensitivity, frame_duration) for analyze_upload
+_Job = namedtuple("_Job", ["args", "size", "future", "received"])
+
+_worker_state = threading.local()  # VADServices of the current worker process or thread
+
+
+class HTTPError(Exception):
+    """A request answered with an error status instead of being analyzed."""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def _init_worker(energy_gate, overlap):
+    _worker_state.settings = (energy_gate, overlap)
+    _worker_state.services = {}
+
+
+def _worker_service(sensitivity):
+    """This worker's VADService for a sensitivity, created on first use."""
+    service = _worker_state.services.get(sensitivity)
+    if service is None:
+        energy_gate, overlap = _worker_state.settings
+        service = VADService(sensitivity, energy_gate=energy_gate, overlap=overlap)
+        _worker_state.services[sensitivity] = service
+    return service
+
+
+def _warm_up():
+    """Runs once per worker at startup, so the first requests don't pay for a process start."""
+    return os.getpid()
+
+
+def analyze_batch(jobs):
+    """Run analyze_upload for each job's args; returns (status, payload) pairs in order.
+
+    One bad upload only fails its own request, not the others of its batch.
+    """
+    results = []
+    for args in jobs:
+        try:
+            results.append((HTTPStatus.OK, analyze_upload(*args)))
+        except (ValueError, struct.error) as exc:  # A malformed upload, not a server fault
+            results.append((HTTPStatus.BAD_REQUEST, {"error": str(exc)}))
+        except Exception as exc:  # pylint: disable=broad-except
+            results.append((HTTPStatus.INTERNAL_SERVER_ERROR,
+                            {"error": f"{type(exc).__name__}: {exc}"}))
+    return results
+
+
+def analyze_upload(body, is_wav, rate, sensitivity, frame_duration=FRAME_DURATION_MS):
+    """VAD summary of one upload: a WAV file, or raw mono 16-bit PCM at rate.
+
+    WAVs are analyzed like files opened in the app: at their own rate if VAD runs on it
+    directly, else resampled to VAD_SAMPLE_RATE.
+    """
+    start = time.perf_counter()
+    if is_wav:
+        info = parse_wav_header(io.BytesIO(body), "Upload")
+        rate = info.frame_rate if info.frame_rate in VAD_NATIVE_RATES else VAD_SAMPLE_RATE
+        samples, rate = load_wav_bytes(body, rate, info)
+    else:
+        samples = np.frombuffer(body, dtype="<i2", count=len(body) // 2)
+
+    service = _worker_service(sensitivity)
+    decisions = np.fromiter(service.stream_voice_activity([samples], rate, frame_duration),
+                            dtype=bool)
+    segments = VADService.get_speech_segments(decisions, rate, frame_duration,
+                                              overlap=service.overlap)
+    return {
+        "duration_s": len(samples) / rate,
+        "frame_rate": rate,
+        "speech_ratio": float(decisions.mean()) if len(decisions) else 0.0,
+        "num_segments": len(segments),
+        "segments": (segments / rate).tolist(),
+        "vad_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+class VADServer:
+    """Local HTTP front end to VADService, so other services share one VAD implementation.
+
+    POST /vad takes a WAV file, or raw mono 16-bit PCM (?rate=16000), as the request body,
+    sent with a Content-Length or chunked, and returns its speech segments as JSON;
+    ?sensitivity= and ?frame_duration= override the defaults. GET /metrics reports
+    throughput, queue depth and latency percentiles, GET /health answers when the server is up.
+
+    Uploads are analyzed by a bounded pool of worker processes (or threads), each with its own
+    VADService, and thus webrtcvad instances, per sensitivity. At most one task per worker is
+    in flight; requests arriving meanwhile queue up and are handed to the next free worker
+    together, up to batch_max_requests at a time, so small requests don't each pay for a
+    round trip to the pool. Connections beyond max_connections and requests beyond max_queue
+    are answered with 503 and Retry-After at once rather than letting latency grow.
+
+    A request takes its queue place before its body is read, and reserves its bytes (from
+    Content-Length, or chunk by chunk) against max_held_bytes until its result is sent, so
+    concurrent uploads cannot buffer more than that. A rejected body is skipped, not stored.
+    """
+
+    def __init__(self, workers=None, use_processes=True, sensitivity=VAD_SENSITIVITY,
+                 energy_gate=VAD_ENERGY_GATE, overlap=VAD_FRAME_OVERLAP,
+                 max_connections=SERVER_MAX_CONNECTIONS, max_queue=SERVER_MAX_QUEUE,
+                 max_body_bytes=SERVER_MAX_BODY_BYTES, max_held_bytes=SERVER_MAX_HELD_BYTES,
+                 batch_max_requests=SERVER_BATCH_MAX_REQUESTS,
+                 batch_max_bytes=SERVER_BATCH_MAX_BYTES):
+        self.logger = get_logger(__name__)
+        self.workers = workers or os.cpu_count() or 1
+        self.use_processes = use_processes
+        self.sensitivity = sensitivity
+        self.energy_gate = energy_gate
+        self.overlap = overlap
+        self.max_connections = max_connections
+        self.max_queue = max_queue
+        self.max_body_bytes = max_body_bytes
+        self.max_held_bytes = max_held_bytes
+        self.batch_max_requests = batch_max_requests
+        self.batch_max_bytes = batch_max_bytes
+
+        self.executor = None
+        self.server = None
+        self.address = None
+        self.dispatcher = None
+        self.pending = deque()  # _Jobs waiting for a worker, oldest first
+        self.reading = 0  # Admitted requests whose body is still arriving
+        self.held_bytes = 0  # Bytes reserved by admitted requests until they are answered
+        self.wakeup = None  # Set when a job is queued
+        self.slots = None  # One per worker; held while a batch runs
+        self.writers = set()  # Open connections, closed by close()
+
+        self.started_at = time.perf_counter()
+        self.in_flight = 0
+        self.stats = {"requests": 0, "completed": 0, "failed": 0, "rejected": 0, "batches": 0,
+                      "audio_s": 0.0}
+        self.completed_times = deque()  # perf_counter of responses in the rate window
+        self.latencies = deque(maxlen=SERVER_LATENCY_WINDOW)  # Body received to result, s
+        self.queue_waits = deque(maxlen=SERVER_LATENCY_WINDOW)  # Body received to dispatch, s
+
+    async def start(self, host=SERVER_HOST, port=SERVER_PORT):
+        """Start the worker pool and listen; returns the bound (host, port)."""
+        loop = asyncio.get_running_loop()
+        self.executor = self._new_executor()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _warm_up)
+                               for _ in range(self.workers)))
+        self.wakeup = asyncio.Event()
+        self.slots = asyncio.Semaphore(self.workers)
+        self.dispatcher = asyncio.create_task(self._dispatch())
+        self.server = await asyncio.start_server(self._handle_connection, host, port,
+                                                 limit=SERVER_MAX_LINE_BYTES)
+        self.address = self.server.sockets[0].getsockname()[:2]
+        self.started_at = time.perf_counter()
+        self.logger.info(f"VAD server listening on {self.address[0]}:{self.address[1]} with "
+                         f"{self.workers} {'process' if self.use_processes else 'thread'} "
+                         f"workers.")
+        return self.address
+
+    async def serve_forever(self):
+        await self.server.serve_forever()
+
+    async def close(self):
+        """Stop listening, drop open connections and queued requests, and stop the workers."""
+        self.server.close()
+        for writer in list(self.writers):
+            writer.close()
+        await self.server.wait_closed()
+        self.dispatcher.cancel()
+        while self.pending:
+            job = self.pending.popleft()
+            if not job.future.done():
+                job.future.set_exception(HTTPError(HTTPStatus.SERVICE_UNAVAILABLE,
+                                                   "Server is shutting down"))
+        await asyncio.to_thread(self.executor.shutdown, wait=True, cancel_futures=True)
+        self.logger.info(f"VAD server stopped after {self.stats['completed']} requests.")
+
+    def get_metrics(self):
+        """Counters, requests/s over the last SERVER_RATE_WINDOW_S and latency percentiles."""
+        now = time.perf_counter()
+        while self.completed_times and self.completed_times[0] < now - SERVER_RATE_WINDOW_S:
+            self.completed_times.popleft()
+        window = min(SERVER_RATE_WINDOW_S, now - self.started_at)
+        batches = self.stats["batches"]
+        dispatched = self.stats["completed"] + self.stats["failed"] + self.in_flight
+        metrics = dict(self.stats)
+        metrics.update({
+            "uptime_s": now - self.started_at,
+            "workers": self.workers,
+            "executor": "process" if self.use_processes else "thread",
+            "connections": len(self.writers),
+            "queue_depth": len(self.pending),
+            "reading": self.reading,
+            "held_bytes": self.held_bytes,
+            "in_flight": self.in_flight,
+            "requests_per_s": len(self.completed_times) / window if window > 0 else 0.0,
+            "mean_batch_size": dispatched / batches if batches else 0.0,
+        })
+        metrics.update(percentiles_ms("latency", self.latencies))
+        metrics.update(percentiles_ms("queue_wait", self.queue_waits))
+        return metrics
+
+    def _new_executor(self):
+        initargs = (self.energy_gate, self.overlap)
+        if self.use_processes:
+            return ProcessPoolExecutor(self.workers, mp_context=get_context(SERVER_START_METHOD),
+                                       initializer=_init_worker, initargs=initargs)
+        return ThreadPoolExecutor(self.workers, thread_name_prefix="vad-server",
+                                  initializer=_init_worker, initargs=initargs)
+
+    async def _dispatch(self):
+        """Hand queued jobs to the pool in batches, one batch per free worker."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.slots.acquire()
+            while not self.pending:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+            batch = self._take_batch()
+            now = time.perf_counter()
+            self.queue_waits.extend(now - job.received for job in batch)
+            self.in_flight += len(batch)
+            self.stats["batches"] += 1
+            future = loop.run_in_executor(self.executor, analyze_batch,
+                                          [job.args for job in batch])
+            future.add_done_callback(lambda done, batch=batch: self._finish_batch(batch, done))
+
+    def _take_batch(self):
+        """The oldest job, plus following ones while the batch stays within its limits."""
+        batch = [self.pending.popleft()]
+        size = 0
+        while self.pending and len(batch) < self.batch_max_requests:
+            if size + self.pending[0].size > self.batch_max_bytes:
+                break
+            size += self.pending[0].size
+            batch.append(self.pending.popleft())
+        return batch
+
+    def _finish_batch(self, batch, done):
+        self.slots.release()
+        self.in_flight -= len(batch)
+        try:
+            results = done.result()
+        except (Exception, asyncio.CancelledError) as exc:  # pylint: disable=broad-except
+            # e.g. a worker process died, or the pool was shut down; the whole batch fails
+            self.logger.error(f"VAD worker failed: {exc}")
+            results = [(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)})] * len(batch)
+
+        now = time.perf_counter()
+        for job, (status, payload) in zip(batch, results):
+            if status == HTTPStatus.OK:
+                self.stats["completed"] += 1
+                self.stats["audio_s"] += payload["duration_s"]
+                self.completed_times.append(now)
+                self.latencies.append(now - job.received)
+            else:
+                self.stats["failed"] += 1
+            if not job.future.done():  # The client may have gone away meanwhile
+                job.future.set_result((status, payload))
+
+    async def _handle_connection(self, reader, writer):
+        if len(self.writers) >= self.max_connections:
+            self.stats["rejected"] += 1
+            await self._respond(writer, HTTPStatus.SERVICE_UNAVAILABLE,
+                                {"error": "Too many connections"}, keep_alive=False,
+                                headers={"Retry-After": SERVER_RETRY_AFTER_S})
+            writer.close()
+            return
+
+        self.writers.add(writer)
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await asyncio.wait_for(self._read_head(reader),
+                                                     SERVER_READ_TIMEOUT_S)
+                    if request is None:
+                        break  # The client closed the connection
+                    method, target, headers = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    status, payload, extra = await self._route(method, target, headers,
+                                                               reader, writer)
+                except HTTPError as exc:
+                    # The rest of the request may be unread, so the connection can't be reused
+                    status, payload, extra = exc.status, {"error": str(exc)}, exc.headers
+                    keep_alive = False
+                await self._respond(writer, status, payload, keep_alive, extra)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass  # Idle, cut off mid-request or gone; nothing more can be sent
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    async def _read_head(self, reader):
+        """(method, target, headers) of the next request, or None at the end of the stream."""
+        line = await self._read_line(reader)
+        if not line:
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await self._read_line(reader)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return parts[0], parts[1], headers
+
+    @staticmethod
+    async def _read_line(reader):
+        try:
+            return await reader.readline()
+        except ValueError as exc:  # The line overran the stream's limit
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Line too long") from exc
+
+    async def _route(self, method, target, headers, reader, writer):
+        url = urlsplit(target)
+        if url.path == "/vad":
+            if method != "POST":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST",
+                                {"Allow": "POST"})
+            return await self._analyze(parse_qs(url.query), headers, reader, writer)
+        if url.path in ("/metrics", "/health"):
+            if method != "GET":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Use GET", {"Allow": "GET"})
+            payload = self.get_metrics() if url.path == "/metrics" else {"status": "ok"}
+            return HTTPStatus.OK, payload, None
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No such endpoint: {url.path}")
+
+    async def _analyze(self, query, headers, reader, writer):
+        self.stats["requests"] += 1
+        chunked = "chunked" in headers.get("transfer-encoding", "").lower()
+        length = None if chunked else self._content_length(headers)
+        expect_continue = headers.get("expect", "").lower() == "100-continue"
+        try:
+            self._admit(length or 0)
+        except HTTPError:
+            # Closing a connection with unread data resets it, and the client might never see
+            # the 503; a client waiting for 100 Continue has not sent its body yet
+            if not expect_continue:
+                await self._skip_body(reader, length)
+            raise
+
+        reserved = length or 0
+        queued = False
+
+        def reserve(size):
+            nonlocal reserved
+            self._reserve_bytes(size)
+            reserved += size
+
+        try:
+            if expect_continue:
+                writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            if chunked:
+                body = await self._read_chunked(reader, reserve)
+            else:
+                body = await asyncio.wait_for(reader.readexactly(length), SERVER_READ_TIMEOUT_S)
+            if not body:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Empty body")
+            job = self._new_job(query, headers, body)
+            self.reading -= 1
+            queued = True
+            self.pending.append(job)
+            self.wakeup.set()
+            status, payload = await job.future
+        finally:
+            if not queued:
+                self.reading -= 1
+            self.held_bytes -= reserved
+        return status, payload, None
+
+    def _new_job(self, query, headers, body):
+        sensitivity = _int_param(query, "sensitivity", self.sensitivity, range(4))
+        rate = _int_param(query, "rate", VAD_SAMPLE_RATE, LIVE_FRAME_RATES)
+        frame_duration = _int_param(query, "frame_duration", FRAME_DURATION_MS,
+                                    LIVE_FRAME_DURATIONS_MS)
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        is_wav = body[:4] == b"RIFF" or content_type in WAV_CONTENT_TYPES
+        future = asyncio.get_running_loop().create_future()
+        return _Job((body, is_wav, rate, sensitivity, frame_duration), len(body), future,
+                    time.perf_counter())
+
+    def _admit(self, size):
+        """Take a queue place and reserve size bytes, or reject the request (backpressure)."""
+        if len(self.pending) + self.reading >= self.max_queue:
+            self._busy("Server busy")
+        self._reserve_bytes(size)
+        self.reading += 1
+
+    def _reserve_bytes(self, size):
+        if self.held_bytes + size > self.max_held_bytes:
+            self._busy("Server busy: too much audio held")
+        self.held_bytes += size
+
+    def _busy(self, message):
+        self.stats["rejected"] += 1
+        raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, message,
+                        {"Retry-After": SERVER_RETRY_AFTER_S})
+
+    def _content_length(self, headers):
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError as exc:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length") from exc
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                            f"Body exceeds {self.max_body_bytes} bytes")
+        return length
+
+    async def _read_chunked(self, reader, reserve=None):
+        """Collect a chunked body; each chunk has its own read timeout, so uploads may stream.
+
+        reserve(size) is called before each chunk is kept; once it raises, the rest of the body
+        is skipped and the error raised at its end. Without reserve the body is skipped.
+        """
+        body = bytearray()
+        total = 0
+        keep = reserve is not None
+        rejected = None
+        while True:
+            line = await asyncio.wait_for(self._read_line(reader), SERVER_READ_TIMEOUT_S)
+            try:
+                size = int(line.split(b";")[0], 16)
+            except ValueError as exc:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid chunk size") from exc
+            if size < 0:  # int() accepts a sign, which HTTP does not
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid chunk size")
+            if size == 0:
+                break
+            total += size
+            if total > self.max_body_bytes:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                f"Body exceeds {self.max_body_bytes} bytes")
+            if keep:
+                try:
+                    reserve(size)
+                except HTTPError as exc:
+                    keep, rejected, body = False, exc, bytearray()
+            if keep:
+                body += await asyncio.wait_for(reader.readexactly(size + 2),
+                                               SERVER_READ_TIMEOUT_S)
+                del body[-2:]  # The CRLF ending the chunk
+            else:
+                await self._skip(reader, size + 2)
+
+        while await self._read_line(reader) not in (b"\r\n", b"\n", b""):
+            pass  # Trailer fields are not used
+        if rejected is not None:
+            raise rejected
+        return body
+
+    async def _skip_body(self, reader, length):
+        """Read past the body of a rejected request without keeping it."""
+        if length is None:
+            await self._read_chunked(reader)
+        else:
+            await self._skip(reader, length)
+
+    @staticmethod
+    async def _skip(reader, size):
+        while size > 0:
+            piece = await asyncio.wait_for(reader.readexactly(min(size, SERVER_DISCARD_BYTES)),
+                                           SERVER_READ_TIMEOUT_S)
+            size -= len(piece)
+
+    async def _respond(self, writer, status, payload, keep_alive=True, headers=None):
+        status = HTTPStatus(status)
+        body = json.dumps(payload).encode("utf-8")
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}", "Content-Type: application/json",
+                 f"Content-Length: {len(body)}"]
+        if not keep_alive:
+            lines.append("Connection: close")
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        writer.write("\r\n".join(lines).encode("latin-1") + b"\r\n\r\n" + body)
+        await writer.drain()
+
+
+def _int_param(query, name, default, allowed):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[0])
+    except ValueError:
+        value = None
+    if value not in allowed:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be one of {list(allowed)}")
+    return value
+
+
+def percentiles_ms(name, samples):
+    """p50/p95/p99/max in ms of a window of durations in seconds."""
+    samples_ms = np.array(samples) * 1000
+    if not len(samples_ms):
+        return {f"{name}_{stat}_ms": 0.0 for stat in ("p50", "p95", "p99", "max")}
+    p50, p95, p99 = np.percentile(samples_ms, [50, 95, 99])
+    return {f"{name}_p50_ms": float(p50), f"{name}_p95_ms": float(p95),
+            f"{name}_p99_ms": float(p99), f"{name}_max_ms": float(samples_ms.max())}
+
+
+async def serve(host=SERVER_HOST, port=SERVER_PORT, ready=None, **options):
+    """Run a VADServer until cancelled; ready(address) is called once it listens."""
+    server = VADServer(**options)
+    address = await server.start(host, port)
+    if ready:
+        ready(address)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
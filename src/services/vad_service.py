@@ -1,32 +1,268 @@
-import webrtcvad
-from src.constants.app_constants import FRAME_DURATION_MS
+import time
+
+import numpy as np
+from src.constants.app_constants import (
+    FRAME_DURATION_MS, VAD_HANGOVER_FRAMES, VAD_MIN_SPEECH_MS, VAD_MODES, VAD_MODE_BATCH_FRAMES,
+    VAD_ENERGY_GATE, VAD_FRAME_OVERLAP
+)
+from src.utils.frame_energy import EnergyGate, frame_rms
+from src.utils.instrumentation import profiler
 from src.utils.logger import get_logger
 
 
 class VADService:
-    def __init__(self, sensitivity):
+    def __init__(self, sensitivity, energy_gate=VAD_ENERGY_GATE, overlap=VAD_FRAME_OVERLAP):
         self.logger = get_logger(__name__)
-        self.vad = webrtcvad.Vad()
-        self.vad.set_mode(sensitivity)  # Sensitivity: 0 (least sensitive) to 3 (most sensitive)
+        self.sensitivity = sensitivity
+        self.energy_gate = energy_gate  # Skip webrtcvad on frames near the noise floor
+        self.overlap = overlap  # Fraction of each frame shared with the next; 0 for no overlap
+        self.gate_stats = {"frames": 0, "skipped": 0}  # Of the last gated analysis
+        self._vad = None  # Long-lived instance for live frame-by-frame use, made on first use
         self.logger.info(f"VAD Service initialized with sensitivity {sensitivity}.")
 
+    @property
+    def vad(self):
+        if self._vad is None:
+            self._vad = self._new_vad(self.sensitivity)
+        return self._vad
+
+    def set_sensitivity(self, sensitivity):
+        self.sensitivity = sensitivity
+        if self._vad is not None:
+            self._vad.set_mode(sensitivity)
+
     def detect_voice_activity(self, audio_data, frame_rate, frame_duration=FRAME_DURATION_MS):
         """Detect voice activity in the audio data."""
         self.logger.info("Detecting voice activity.")
         if audio_data is None:
             return []
 
-        vad_results = []
-        frame_size = int(frame_rate * frame_duration / 1000)  # Number of samples per frame
-        step_size = frame_size // 2  # 50% overlap
+        # The batch call is the streaming call fed with a single chunk
+        with profiler.span("vad.detect"):
+            return list(self.stream_voice_activity([audio_data], frame_rate, frame_duration))
+
+    def detect_all_modes(self, audio_data, frame_rate, frame_duration=FRAME_DURATION_MS,
+                         cancel_event=None, frame_energy=None):
+        """Run every webrtcvad mode over the audio in one framing pass.
+
+        Returns a uint8 array with one entry per frame in which bit m is set when mode m
+        detected speech, so any sensitivity can be shown later without re-running VAD. Frames
+        are sliced once per batch and shared by the four modes; each mode still needs its own
+        is_speech call, because webrtcvad's adaptive state depends on the mode. With the
+        energy gate on, frame_energy (per-frame RMS, e.g. already computed for the plot) saves
+        computing it again. Returns None if cancel_event gets set.
+        """
+        self.logger.info("Detecting voice activity for all sensitivities.")
+        vads = [self._new_vad(mode) for mode in VAD_MODES]
+        gate = EnergyGate() if self.energy_gate else None
+        frame_size, step_size = self.frame_geometry(frame_rate, frame_duration, self.overlap)
+        masks = []
+        with profiler.span("vad.all_modes"):
+            # The whole file is one block, so every frame is a view into the same buffer
+            for block, count in self._iter_frame_blocks([audio_data], frame_rate, frame_duration):
+                for first in range(0, count, VAD_MODE_BATCH_FRAMES):
+                    batch_count = min(VAD_MODE_BATCH_FRAMES, count - first)
+                    batch = block[first * step_size:]
+                    rms = frame_energy[first:first + batch_count] \
+                        if frame_energy is not None else None
+                    voiced = self._gate_block(gate, batch, batch_count, frame_size, step_size, rms)
+                    frames = list(self._iter_frame_views(batch, batch_count, frame_size,
+                                                         step_size))
+                    indices = np.arange(batch_count) if voiced is None else np.flatnonzero(voiced)
+                    frames = frames if voiced is None else [frames[i] for i in indices]
+
+                    mask = np.zeros(batch_count, dtype=np.uint8)
+                    for mode, vad in zip(VAD_MODES, vads):
+                        is_speech = vad.is_speech
+                        decisions = np.fromiter((is_speech(frame, frame_rate) for frame in frames),
+                                                dtype=np.uint8, count=len(frames))
+                        mask[indices] |= decisions << mode
+                    masks.append(mask)
+                    if cancel_event is not None and cancel_event.is_set():
+                        return None
+        self._record_gate(gate, calls_per_frame=len(VAD_MODES))
+        return np.concatenate(masks) if masks else np.empty(0, dtype=np.uint8)
+
+    @staticmethod
+    def decisions_for_mode(mode_mask, sensitivity):
+        """Per-frame speech decisions of one sensitivity from a detect_all_modes() result."""
+        return (np.asarray(mode_mask) >> sensitivity & 1).astype(bool)
+
+    def stream_voice_activity(self, chunks, frame_rate, frame_duration=FRAME_DURATION_MS):
+        """Yield one VAD decision per overlapping frame from an iterable of audio chunks.
+
+        Chunks may be int16 arrays or raw 16-bit PCM bytes of any length. Only the samples
+        not yet covered by a frame are carried over, so memory is bounded by the chunk size.
+        Every call starts from a fresh VAD state, so the same audio always gives the same
+        decisions. With the energy gate on, frames near the noise floor are non-speech
+        without a webrtcvad call.
+        """
+        vad = self._new_vad(self.sensitivity)
+        gate = EnergyGate() if self.energy_gate else None
+        frame_size, step_size = self.frame_geometry(frame_rate, frame_duration, self.overlap)
+        timed = profiler.enabled  # Checked once, so the disabled loop pays nothing per frame
+        for block, count in self._iter_frame_blocks(chunks, frame_rate, frame_duration):
+            voiced = self._gate_block(gate, block, count, frame_size, step_size)
+            voiced = voiced.tolist() if voiced is not None else None  # Fast per-frame lookups
+            frames = self._iter_frame_views(block, count, frame_size, step_size)
+            for index, frame in enumerate(frames):
+                if voiced is not None and not voiced[index]:
+                    yield False
+                    continue
+                if timed:
+                    call_start = time.perf_counter()
+                    is_speech = vad.is_speech(frame, frame_rate)
+                    profiler.observe("vad.is_speech", time.perf_counter() - call_start)
+                else:
+                    is_speech = vad.is_speech(frame, frame_rate)
+                yield is_speech
+        self._record_gate(gate)
+
+    def _gate_block(self, gate, block, count, frame_size, step_size, rms=None):
+        """Energy-gate decisions (True = run the VAD) for a block's frames, or None if off."""
+        if gate is None:
+            return None
+        if rms is None:
+            rms = frame_rms(block, frame_size, step_size, count)
+        voiced = gate.update(rms)
+        profiler.count("vad.gate_skipped", count - int(np.count_nonzero(voiced)))
+        return voiced
+
+    def _record_gate(self, gate, calls_per_frame=1):
+        if gate is None:
+            return
+        self.gate_stats = {"frames": gate.frames, "skipped": gate.skipped}
+        share = gate.skipped / gate.frames if gate.frames else 0.0
+        self.logger.info(f"Energy gate skipped {gate.skipped * calls_per_frame} VAD calls "
+                         f"({share:.0%} of {gate.frames} frames).")
+
+    @staticmethod
+    def _iter_frame_views(block, count, frame_size, step_size):
+        """Yield the first count frames of a contiguous int16 block as zero-copy memoryviews."""
+        data = memoryview(block).cast('B')
+        frame_bytes, step_bytes = frame_size * 2, step_size * 2
+        for start in range(0, count * step_bytes, step_bytes):
+            yield data[start:start + frame_bytes]
+
+    def _iter_frame_blocks(self, chunks, frame_rate, frame_duration):
+        """Yield (block, count) per chunk: block holds count frames to classify.
+
+        Frame i of a block is block[i * step_size:i * step_size + frame_size]. A contiguous
+        int16 chunk arriving with nothing pending is used as is, so a whole file passed as one
+        chunk is framed without copying; only the unframed tail is carried to the next chunk.
+        """
+        frame_size, step_size = self.frame_geometry(frame_rate, frame_duration, self.overlap)
+
+        pending = np.empty(0, dtype=np.int16)
+        remainder = b''  # Odd trailing byte of a raw PCM chunk
+
+        for chunk in chunks:
+            if isinstance(chunk, (bytes, bytearray, memoryview)):
+                chunk = remainder + bytes(chunk)
+                usable = len(chunk) - len(chunk) % 2
+                remainder = chunk[usable:]
+                chunk = np.frombuffer(chunk[:usable], dtype=np.int16)
+            if len(chunk) == 0:
+                continue
+            if len(pending):
+                pending = np.concatenate((pending, chunk))
+            else:
+                pending = np.ascontiguousarray(chunk, dtype=np.int16)
+
+            # A frame is final only once a sample follows it, like the batch loop's strict bound
+            count = max((len(pending) - frame_size - 1) // step_size + 1, 0)
+            if count:
+                yield pending, count
+            profiler.count("vad.frames", count)
+            pending = pending[count * step_size:]
+
+    def classify_frame(self, frame, frame_rate):
+        """VAD decision for a single frame of 16-bit PCM bytes, e.g. read from a live buffer."""
+        return self.vad.is_speech(frame, frame_rate)
+
+    def stream_speech_segments(self, chunks, frame_rate, frame_duration=FRAME_DURATION_MS,
+                               hangover_frames=VAD_HANGOVER_FRAMES,
+                               min_speech_ms=VAD_MIN_SPEECH_MS):
+        """Yield (start_sample, end_sample) speech segments as soon as each one is final.
+
+        Uses the same smoothing as get_speech_segments and yields the same segments.
+        """
+        decisions = self.stream_voice_activity(chunks, frame_rate, frame_duration)
+        return self._iter_segments(decisions, frame_rate, frame_duration, hangover_frames,
+                                   min_speech_ms, self.overlap)
+
+    @staticmethod
+    def get_speech_segments(vad_results, frame_rate, frame_duration=FRAME_DURATION_MS,
+                            hangover_frames=VAD_HANGOVER_FRAMES, min_speech_ms=VAD_MIN_SPEECH_MS,
+                            overlap=VAD_FRAME_OVERLAP):
+        """Convert per-frame VAD results into an (n, 2) int64 array of [start, end) sample pairs.
+
+        Speech runs are found by run-length encoding the decisions. Each frame covers
+        [i * step, i * step + frame_size), so runs map to exact sample spans; the end of every
+        run is held for hangover_frames more steps, spans that touch are merged and segments
+        shorter than min_speech_ms are dropped.
+        """
+        speech = np.asarray(vad_results, dtype=bool)
+        if not speech.any():
+            return np.empty((0, 2), dtype=np.int64)
+        frame_size, step_size = VADService.frame_geometry(frame_rate, frame_duration, overlap)
+
+        # Run boundaries are where the padded decision sequence flips
+        edges = np.flatnonzero(np.diff(np.concatenate(([False], speech, [False])).astype(np.int8)))
+        starts = edges[0::2].astype(np.int64) * step_size
+        ends = (edges[1::2].astype(np.int64) - 1 + hangover_frames) * step_size + frame_size
+        np.minimum(ends, (len(speech) - 1) * step_size + frame_size, out=ends)
+
+        # Overlapping frames make neighbouring spans touch; merge them into one segment
+        separate = starts[1:] > ends[:-1]
+        segments = np.column_stack((starts[np.concatenate(([True], separate))],
+                                    ends[np.concatenate((separate, [True]))]))
+
+        min_samples = min_speech_ms * frame_rate / 1000
+        return segments[segments[:, 1] - segments[:, 0] >= min_samples]
+
+    @staticmethod
+    def _new_vad(mode):
+        # Imported on first use: webrtcvad loads pkg_resources, which is slow to import
+        import webrtcvad
+
+        vad = webrtcvad.Vad()
+        vad.set_mode(mode)  # Sensitivity: 0 (least sensitive) to 3 (most sensitive)
+        return vad
+
+    @staticmethod
+    def frame_geometry(frame_rate, frame_duration, overlap=VAD_FRAME_OVERLAP):
+        """(frame_size, step_size) in samples; consecutive frames share overlap of a frame."""
+        frame_size = int(frame_rate * frame_duration / 1000)
+        return frame_size, max(frame_size - int(frame_size * overlap), 1)
+
+    @staticmethod
+    def _iter_segments(decisions, frame_rate, frame_duration, hangover_frames, min_speech_ms,
+                       overlap=VAD_FRAME_OVERLAP):
+        """Streaming counterpart of get_speech_segments.
 
-        # Process audio with overlapping frames
-        for i in range(0, len(audio_data) - frame_size, step_size):
-            frame = audio_data[i:i + frame_size].tobytes()
+        A segment is final once a frame starts past its end, since no later speech frame
+        can touch it any more.
+        """
+        frame_size, step_size = VADService.frame_geometry(frame_rate, frame_duration, overlap)
+        min_samples = min_speech_ms * frame_rate / 1000
+        hold = hangover_frames * step_size
 
-            # Check if the frame length is exactly the expected size
-            if len(frame) == frame_size * 2:  # Each sample is 2 bytes (16-bit PCM)
-                is_speech = self.vad.is_speech(frame, frame_rate)
-                vad_results.append(is_speech)
+        segment = None  # [start_sample, end_sample] of the open segment
+        index = -1
+        for index, is_speech in enumerate(decisions):
+            frame_start = index * step_size
+            if segment is not None and frame_start > segment[1]:
+                if segment[1] - segment[0] >= min_samples:
+                    yield segment[0], segment[1]
+                segment = None
+            if is_speech:
+                if segment is None:
+                    segment = [frame_start, frame_start + frame_size + hold]
+                else:
+                    segment[1] = frame_start + frame_size + hold
 
-        return vad_results
+        if segment is not None:
+            segment[1] = min(segment[1], index * step_size + frame_size)
+            if segment[1] - segment[0] >= min_samples:
+                yield segment[0], segment[1]
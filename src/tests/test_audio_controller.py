@@ -0,0 +1,244 @@
+import threading
+import wave
+
+import numpy as np
+import pytest
+from src.constants.app_constants import EXPORT_FAILED_LABEL
+from src.controllers.audio_controller import AudioPlayerController
+from src.services.library_service import LibraryIndex
+from src.services.vad_service import VADService
+
+
+class FakeModel:
+    """Model with the background-loading API; VAD blocks until release is set."""
+
+    def __init__(self):
+        self.vad_service = VADService(sensitivity=1)
+        self.release = threading.Event()
+        self.cancelled = []
+        self.file_path = None
+        self.is_playing = False
+        self.position = 0.0
+
+    def play_pause(self):
+        self.is_playing = not self.is_playing
+
+    def get_current_playback_time(self):
+        return self.position
+
+    def get_audio_duration(self):
+        return 1.0
+
+    def prepare_audio(self, file_path):
+        return np.zeros(16000, dtype=np.int16), 16000
+
+    def set_audio(self, file_path, audio_data, frame_rate):
+        self.file_path = file_path
+
+    def compute_vad_modes(self, file_path, audio_data, frame_rate, cancel_event=None,
+                          frame_energy=None):
+        while not self.release.wait(0.01):
+            if cancel_event.is_set():
+                self.cancelled.append(file_path)
+                return None
+        # Speech at sensitivities 0-2, none at 3
+        return np.full(10, 0b0111, dtype=np.uint8)
+
+    def get_speech_segments(self, vad_results, frame_rate=None):
+        return self.vad_service.get_speech_segments(vad_results, frame_rate)
+
+
+class FakeView:
+    """Records calls instead of drawing; after() callbacks are run by pump()."""
+
+    def __init__(self):
+        self.calls = []
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+        return callback
+
+    def after_idle(self, callback):
+        self.scheduled.append(callback)
+
+    def after_cancel(self, after_id):
+        self.scheduled.remove(after_id)
+
+    def winfo_viewable(self):
+        return True
+
+    def update_playback_position(self, current_time):
+        self.calls.append(("cursor", current_time))
+
+    def update_progress_bar(self, current_time, total_time):
+        self.calls.append(("progress", current_time, total_time))
+
+    def set_status(self, text):
+        self.calls.append(("status", text))
+
+    def plot_waveform(self, audio_data, frame_rate, speech_segments, pyramid=None,
+                      frame_energy=None):
+        self.calls.append(("plot", len(speech_segments), pyramid is not None))
+
+    def highlight_speech_segments(self, speech_segments, frame_rate):
+        self.calls.append(("highlight", len(speech_segments)))
+
+    def show_folder(self, index, folder):
+        self.calls.append(("folder", folder))
+
+    def refresh_library(self, status):
+        self.calls.append(("library", status))
+
+
+@pytest.fixture
+def controller():
+    view = FakeView()
+    controller = AudioPlayerController(FakeModel(), view, view)
+    yield controller
+    controller.model.release.set()
+    controller.shutdown()
+
+
+def pump(controller, until):
+    """Run the Tk-style poll loop until the condition holds."""
+    view = controller.plot_frame
+    for _ in range(500):
+        if until():
+            return
+        if view.scheduled:
+            view.scheduled.pop(0)()
+        threading.Event().wait(0.01)
+    raise AssertionError("background load did not finish")
+
+
+def test_waveform_before_vad(controller):
+    """The waveform is plotted while VAD is still running; highlights follow."""
+    view = controller.plot_frame
+    controller.load_audio("a.wav")
+    pump(controller, lambda: ("plot", 0, True) in view.calls)
+    assert controller.current_audio_file == "a.wav"
+    assert not any(call[0] == "highlight" for call in view.calls)
+
+    controller.model.release.set()
+    pump(controller, lambda: ("highlight", 1) in view.calls)
+    assert view.calls[-1] == ("status", "")
+    pump(controller, lambda: not controller.polling)
+
+
+def test_new_selection_cancels_previous(controller):
+    """Selecting another file cancels the pending VAD and drops its results."""
+    view = controller.plot_frame
+    controller.load_audio("a.wav")
+    pump(controller, lambda: controller.model.file_path == "a.wav")
+    controller.load_audio("b.wav")
+    pump(controller, lambda: controller.model.cancelled == ["a.wav"])
+
+    controller.model.release.set()
+    pump(controller, lambda: any(call[0] == "highlight" for call in view.calls))
+    assert controller.current_audio_file == "b.wav"
+    assert [call for call in view.calls if call[0] == "highlight"] == [("highlight", 1)]
+
+
+def test_sensitivity_switch_reuses_analysis(controller):
+    """Changing sensitivity re-highlights from the stored mask without another VAD run."""
+    view = controller.plot_frame
+    controller.model.release.set()
+    controller.load_audio("a.wav")
+    pump(controller, lambda: ("highlight", 1) in view.calls)
+
+    controller.set_sensitivity(3)
+    assert controller.model.vad_service.sensitivity == 3
+    assert view.calls[-1] == ("highlight", 0)
+    controller.set_sensitivity(0)
+    assert view.calls[-1] == ("highlight", 1)
+
+
+def test_adjacent_files_are_prefetched(controller):
+    """After a file loads, its neighbours are prepared, so selecting one needs no new VAD run."""
+    view = controller.plot_frame
+    controller.model.release.set()
+    controller.load_audio("a.wav", adjacent_files=["b.wav"])
+    pump(controller, lambda: ("highlight", 1) in view.calls)
+    assert controller.prefetcher.wait_idle(timeout=10)
+
+    controller.load_audio("b.wav", adjacent_files=["a.wav", "c.wav"])
+    pump(controller, lambda: view.calls.count(("highlight", 1)) == 2)
+    assert controller.current_audio_file == "b.wav"
+    stats = controller.prepared_files.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_export_uses_highlighted_segments(controller, tmp_path):
+    """Export runs in the background on the segments shown for the current sensitivity."""
+    source = str(tmp_path / "a.wav")
+    with wave.open(source, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(np.zeros(16000, dtype="<i2").tobytes())
+    view = controller.plot_frame
+    assert not controller.export_speech(str(tmp_path / "out"))  # Nothing loaded yet
+
+    controller.model.release.set()
+    controller.load_audio(source)
+    pump(controller, lambda: ("highlight", 1) in view.calls)
+    assert controller.export_speech(str(tmp_path / "out"))
+    pump(controller, lambda: ("status", "Segments exported: 1") in view.calls)
+    assert (tmp_path / "out" / "a_speech.wav").exists()
+    assert (tmp_path / "out" / "a_segments.json").exists()
+
+
+def test_failed_export_is_reported(controller):
+    """Any error from the exporter ends the export with the failure status."""
+    class BrokenExporter:
+        def export(self, *args):
+            raise RuntimeError("malformed file")
+
+    view = controller.plot_frame
+    controller.model.release.set()
+    controller.load_audio("a.wav")
+    pump(controller, lambda: ("highlight", 1) in view.calls)
+    assert controller.export_speech("out", exporter=BrokenExporter())
+    pump(controller, lambda: ("status", EXPORT_FAILED_LABEL) in view.calls)
+
+
+def test_open_folder_refreshes_list_until_scanned(tmp_path):
+    """The file list is refreshed from the index while the scan runs, then once more at the end."""
+    for name in ("a.wav", "b.wav"):
+        with wave.open(str(tmp_path / name), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(np.zeros(1600, dtype="<i2").tobytes())
+    view = FakeView()
+    library = LibraryIndex(str(tmp_path / "library.sqlite3"))
+    controller = AudioPlayerController(FakeModel(), view, view, library=library)
+    controller.scanner.workers = 1
+    try:
+        controller.open_folder(str(tmp_path))
+        assert view.calls[0] == ("folder", str(tmp_path))
+        pump(controller, lambda: not controller.scan_polling)
+        assert view.calls[-1] == ("library", "")
+        assert all(entry.speech_ratio is not None for entry in library.query(str(tmp_path)))
+    finally:
+        controller.shutdown()
+        library.close()
+
+
+def test_playback_views_follow_one_tick_loop(controller):
+    """Toggling play repeatedly leaves one loop, which draws the paused position and stops."""
+    view = controller.plot_frame
+    controller.current_audio_file = "a.wav"
+    for _ in range(3):
+        controller.play_audio()  # Play, pause, play
+    assert len(view.scheduled) == 1
+
+    controller.model.position = 0.5
+    view.scheduled.pop(0)()
+    assert view.calls[-2:] == [("cursor", 0.5), ("progress", 0.5, 1.0)]
+
+    controller.play_audio()  # Pause: the next tick draws once more and ends the loop
+    controller.model.position = 0.6
+    view.scheduled.pop(0)()
+    assert view.calls[-1] == ("progress", 0.6, 1.0) and not view.scheduled
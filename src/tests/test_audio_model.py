@@ -1,24 +1,53 @@
+import os
+import wave
+
+import numpy as np
 import pytest
-from src.models.audio_model import AudioPlayerModel
+from src.constants.app_constants import SAMPLE_AUDIO_DIR, VAD_SAMPLE_RATE
+from src.models.audio_model import AudioPlayerModel, decode_audio
+from src.services.playback_service import NullDevice
 from src.services.vad_service import VADService
 
+SAMPLE_FILE = os.path.join(SAMPLE_AUDIO_DIR, "i-smoke-everyday-spoken-speech_74bpm_F_minor.wav")
+
 
 @pytest.fixture
 def audio_model():
     vad_service = VADService(sensitivity=1)
-    return AudioPlayerModel(vad_service)
+    return AudioPlayerModel(vad_service, device=NullDevice(realtime=False))
 
 
 def test_load_audio(audio_model):
     """Test if the audio file is loaded correctly."""
-    audio_model.load_audio("path/to/test/audio.wav")  # Use a valid test file
+    audio_model.load_audio(SAMPLE_FILE)
     assert audio_model.audio_data is not None
     assert audio_model.frame_rate > 0
+    assert audio_model.get_audio_duration() == pytest.approx(20.27, abs=0.01)
 
 
 def test_voice_activity_detection(audio_model):
     """Test voice activity detection."""
-    audio_model.load_audio("path/to/test/audio.wav")  # Use a valid test file
+    audio_model.load_audio(SAMPLE_FILE)
     vad_results = audio_model.detect_voice_activity()
     assert isinstance(vad_results, list)
     assert all(isinstance(result, bool) for result in vad_results)
+    assert any(vad_results)  # The sample is spoken word
+
+
+@pytest.mark.parametrize("file_rate, vad_rate", [(8000, 8000), (16000, 16000),
+                                                 (48000, VAD_SAMPLE_RATE),
+                                                 (44100, VAD_SAMPLE_RATE)])
+def test_decode_keeps_native_vad_rates(tmp_path, file_rate, vad_rate):
+    """Files at a native VAD rate are analyzed as they are; other rates are resampled."""
+    path = str(tmp_path / f"tone_{file_rate}.wav")
+    t = np.arange(file_rate) / file_rate
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(file_rate)
+        wav.writeframes((np.sin(2 * np.pi * 200 * t) * 8000).astype("<i2").tobytes())
+
+    audio_data, frame_rate = decode_audio(path)
+    assert frame_rate == vad_rate
+    assert len(audio_data) == pytest.approx(vad_rate, abs=1)
+    assert len(VADService(sensitivity=1).detect_voice_activity(audio_data, frame_rate)) > 0
@@ -0,0 +1,45 @@
+import json
+import wave
+
+import numpy as np
+import pytest
+from src.services.batch_service import BatchVADService, analyze_file, find_audio_files
+from src.services.vad_service import VADService
+
+
+@pytest.fixture
+def audio_folder(tmp_path):
+    rng = np.random.default_rng(0)
+    for name in ("a.wav", "b.wav"):
+        with wave.open(str(tmp_path / name), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes((rng.standard_normal(16000) * 3000).astype(np.int16).tobytes())
+    (tmp_path / "notes.txt").write_text("not audio")
+    return tmp_path
+
+
+def test_analyze_file(audio_folder):
+    """A decoded file yields duration, speech ratio and segments in seconds."""
+    record = analyze_file(str(audio_folder / "a.wav"), VADService(sensitivity=1))
+    assert record["error"] is None
+    assert record["duration_s"] == pytest.approx(1.0)
+    assert 0.0 <= record["speech_ratio"] <= 1.0
+    assert record["num_segments"] == len(record["segments"])
+
+
+def test_batch_run_resumes(audio_folder, tmp_path):
+    """A second run over the same output skips files that were already written."""
+    files = find_audio_files(str(audio_folder))
+    assert [f.rsplit("/", 1)[-1] for f in files] == ["a.wav", "b.wav"]
+
+    output_path = str(tmp_path / "out.jsonl")
+    service = BatchVADService(sensitivity=1, workers=1)
+    first = service.run(files, output_path)
+    second = service.run(files, output_path)
+
+    assert first["processed"] == 2
+    assert second["processed"] == 0 and second["skipped"] == 2
+    with open(output_path, encoding="utf-8") as output_file:
+        assert len([json.loads(line) for line in output_file]) == 2
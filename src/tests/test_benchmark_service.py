@@ -0,0 +1,53 @@
+import copy
+import wave
+
+import pytest
+from src.services.benchmark_service import (
+    STAGES, BenchmarkRunner, compare_to_baseline, generate_synthetic_wav
+)
+
+
+@pytest.fixture
+def synthetic_file(tmp_path):
+    return generate_synthetic_wav(str(tmp_path / "synthetic.wav"), 3.5, frame_rate=16000)
+
+
+def test_synthetic_wav_is_reproducible(synthetic_file, tmp_path):
+    """Generated files have the requested length and identical content for the same seed."""
+    with wave.open(synthetic_file) as wav:
+        assert wav.getnframes() == 56000
+        assert wav.getnchannels() == 2
+    again = generate_synthetic_wav(str(tmp_path / "again.wav"), 3.5, frame_rate=16000)
+    with open(synthetic_file, "rb") as first, open(again, "rb") as second:
+        assert first.read() == second.read()
+
+
+def test_runner_reports_every_stage(synthetic_file):
+    """Each stage gets a median time, real-time factor and peak memory."""
+    report = BenchmarkRunner(repeat=1).run([synthetic_file])
+    result, = report["results"]
+    assert result["duration_s"] == pytest.approx(3.5)
+    assert set(result["stages"]) == set(STAGES)
+    for stats in result["stages"].values():
+        assert stats["median_s"] > 0
+        assert stats["rtf"] == pytest.approx(3.5 / stats["median_s"])
+        assert stats["peak_mb"] >= 0
+    assert report["meta"]["repeat"] == 1
+    gate = result["energy_gate"]
+    assert 0 <= gate["skipped_frames"] <= gate["frames"]
+    assert 0.9 <= gate["agreement"] <= 1.0
+
+
+def test_compare_to_baseline():
+    """Only slowdowns beyond both the relative threshold and the noise floor are reported."""
+    baseline = {"results": [{"file": "a.wav", "stages": {
+        "load": {"median_s": 0.100}, "vad": {"median_s": 0.001}, "render": {"median_s": 0.200}}}]}
+    report = copy.deepcopy(baseline)
+    stages = report["results"][0]["stages"]
+    stages["load"]["median_s"] = 0.150  # 1.5x slower
+    stages["vad"]["median_s"] = 0.003  # 3x slower, but within the noise floor
+    stages["render"]["median_s"] = 0.210  # Within the threshold
+
+    regressions = compare_to_baseline(report, baseline, threshold=0.2, noise_floor_s=0.005)
+    assert [(r["file"], r["stage"]) for r in regressions] == [("a.wav", "load")]
+    assert regressions[0]["slowdown"] == pytest.approx(1.5)
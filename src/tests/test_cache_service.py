@@ -0,0 +1,107 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+from src.services.cache_service import AudioCache
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"RIFF" + b"\x00" * 100)
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AudioCache(cache_dir=str(tmp_path / "cache"), max_bytes=10 ** 7)
+
+
+def test_audio_round_trip_is_memory_mapped(cache, audio_file):
+    """Cached PCM comes back equal and memory-mapped; the first lookup is a miss."""
+    audio = np.arange(1000, dtype=np.int16)
+    assert cache.load_audio(audio_file, 16000) is None
+    cache.store_audio(audio_file, 16000, audio)
+
+    cached = cache.load_audio(audio_file, 16000)
+    assert isinstance(cached, np.memmap)
+    np.testing.assert_array_equal(cached, audio)
+    assert cache.get_stats()["hits"] == 1 and cache.get_stats()["misses"] == 1
+
+
+def test_vad_results_are_keyed_by_parameters(cache, audio_file):
+    """VAD results are stored bit-packed and only returned for the same parameters."""
+    vad_results = [True, False, True, True, False, False, True, False, True]
+    cache.store_vad(audio_file, 16000, 1, 30, vad_results)
+
+    assert cache.load_vad(audio_file, 16000, 1, 30) == vad_results
+    assert cache.load_vad(audio_file, 16000, 2, 30) is None
+    assert cache.load_vad(audio_file, 16000, 1, 20) is None
+
+
+def test_vad_modes_round_trip(cache, audio_file):
+    """All-sensitivity masks are packed two frames per byte, odd lengths included."""
+    mode_mask = np.array([0b0001, 0b1111, 0b0000, 0b0111, 0b0011], dtype=np.uint8)
+    assert cache.load_vad_modes(audio_file, 16000, 30) is None
+    cache.store_vad_modes(audio_file, 16000, 30, mode_mask)
+
+    np.testing.assert_array_equal(cache.load_vad_modes(audio_file, 16000, 30), mode_mask)
+    assert cache.load_vad_modes(audio_file, 16000, 20) is None
+
+
+def test_modified_file_misses(cache, audio_file):
+    """Changing the source file invalidates its entries."""
+    cache.store_audio(audio_file, 16000, np.zeros(10, dtype=np.int16))
+    with open(audio_file, "ab") as source:
+        source.write(b"\x01")
+    assert cache.load_audio(audio_file, 16000) is None
+
+
+def test_lru_eviction_keeps_cache_bounded(tmp_path, audio_file):
+    """Least recently used entries are evicted once the size bound is exceeded."""
+    cache = AudioCache(cache_dir=str(tmp_path / "small"), max_bytes=5000)
+    cache.store_audio(audio_file, 8000, np.zeros(1000, dtype=np.int16))
+    os.utime(cache._entry_path(cache._audio_key(audio_file, 8000), ".npy"), (0, 0))
+    cache.store_audio(audio_file, 16000, np.zeros(1000, dtype=np.int16))
+    cache.store_audio(audio_file, 32000, np.zeros(1000, dtype=np.int16))
+
+    stats = cache.get_stats()
+    assert stats["size_bytes"] <= 5000
+    assert stats["evictions"] == 1
+    assert cache.load_audio(audio_file, 8000) is None
+    assert cache.load_audio(audio_file, 32000) is not None
+
+
+def test_concurrent_eviction_reads_as_a_miss(tmp_path, audio_file):
+    """A loader and a prefetcher sharing the cache never fail on an entry the other evicts."""
+    cache = AudioCache(cache_dir=str(tmp_path / "shared"), max_bytes=5000)
+    rates = range(8000, 8010)
+    errors = []
+
+    def run(action):
+        try:
+            for _ in range(50):
+                for rate in rates:
+                    action(rate)
+        except Exception as error:  # pylint: disable=broad-except
+            errors.append(error)
+
+    threads = [
+        threading.Thread(target=run, args=(lambda rate: cache.store_audio(
+            audio_file, rate, np.zeros(1000, dtype=np.int16)),)),
+        threading.Thread(target=run, args=(lambda rate: cache.store_vad_modes(
+            audio_file, rate, 30, np.zeros(2000, dtype=np.uint8)),)),
+        threading.Thread(target=run, args=(lambda rate: cache.load_audio(audio_file, rate),)),
+        threading.Thread(target=run, args=(lambda rate: cache.load_vad_modes(
+            audio_file, rate, 30),)),
+        threading.Thread(target=run, args=(lambda rate: cache.get_stats(),)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    stats = cache.get_stats()
+    assert stats["hits"] + stats["misses"] == 2 * 50 * len(rates)
+    assert stats["evictions"] > 0 and stats["size_bytes"] <= 5000
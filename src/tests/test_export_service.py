@@ -0,0 +1,105 @@
+import csv
+import json
+import tracemalloc
+import wave
+
+import numpy as np
+import pytest
+from src.services.export_service import SpeechExporter, export_speech
+from src.services.vad_service import VADService
+from src.utils.wav_reader import map_wav_samples, read_wav_info
+
+
+@pytest.fixture
+def stereo_source(tmp_path):
+    """2 s of 24-bit stereo at 44.1 kHz whose samples encode their own frame index."""
+    path = str(tmp_path / "source.wav")
+    frames = np.arange(88200, dtype=np.int32)
+    samples = np.column_stack((frames, -frames)).astype("<i4").view(np.uint8)
+    samples = samples.reshape(-1, 4)[:, :3]  # Little-endian 24-bit: drop the top byte
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(3)
+        wav.setframerate(44100)
+        wav.writeframes(samples.tobytes())
+    return path
+
+
+def frame_indices(path):
+    """Left-channel samples of a file written by stereo_source, as plain frame indices."""
+    raw = map_wav_samples(path)[:, 0, :]
+    return (raw[:, 0].astype(np.int32) | raw[:, 1].astype(np.int32) << 8 |
+            raw[:, 2].astype(np.int32) << 16)
+
+
+def test_export_copies_padded_segments_exactly(stereo_source, tmp_path):
+    """Segments at the VAD rate map to source frames; padded overlaps merge into one."""
+    output_dir = str(tmp_path / "out")
+    # 16 kHz segments: 0.1-0.2 s, 0.25-0.3 s (merges with the first once padded), 1.5-1.6 s
+    segments = np.array([[1600, 3200], [4000, 4800], [24000, 25600]])
+    exporter = SpeechExporter(padding_ms=50, clips=True, chunk_bytes=1000)
+    summary = exporter.export(stereo_source, segments, 16000, output_dir)
+
+    assert summary["segments"] == 2
+    with open(summary["manifest"], encoding="utf-8") as manifest_file:
+        manifest = json.load(manifest_file)
+    spans = [(s["start_sample"], s["end_sample"]) for s in manifest["segments"]]
+    assert spans == [(4410 - 2205, 13230 + 2205), (66150 - 2205, 70560 + 2205)]
+    assert manifest["segments"][1]["start_s"] == pytest.approx(1.45)
+    assert manifest["segments"][1]["speech_start_sample"] == spans[0][1] - spans[0][0]
+
+    speech = frame_indices(summary["speech_file"])
+    expected = np.concatenate([np.arange(first, last) for first, last in spans])
+    assert np.array_equal(speech, expected)
+    assert read_wav_info(summary["speech_file"])[1:4] == (2, 44100, 3)
+
+    clip = frame_indices(f"{output_dir}/source_clips/{manifest['segments'][1]['clip']}")
+    assert np.array_equal(clip, np.arange(*spans[1]))
+
+
+def test_csv_manifest_and_padding_clipped_to_file(stereo_source, tmp_path):
+    exporter = SpeechExporter(padding_ms=500, speech_only=False, manifest_format="csv")
+    summary = exporter.export(stereo_source, [(0, 800), (31000, 32000)], 16000,
+                              str(tmp_path / "out"))
+    assert summary["speech_file"] is None
+    with open(summary["manifest"], newline="", encoding="utf-8") as manifest_file:
+        rows = list(csv.DictReader(manifest_file))
+    assert [(int(r["start_sample"]), int(r["end_sample"])) for r in rows] == \
+        [(0, 2205 + 22050), (85443 - 22050, 88200)]  # 31000 * 44100 / 16000 = 85443.75
+
+
+def test_export_memory_is_bounded_by_chunk(tmp_path):
+    """Exporting a recording never holds it, or the output, in memory."""
+    path = str(tmp_path / "long.wav")
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(np.ones(16000 * 300, dtype="<i2").tobytes())  # 9.6 MB
+    exporter = SpeechExporter(padding_ms=0, manifest_format=None, chunk_bytes=64 * 1024)
+
+    tracemalloc.start()
+    try:
+        summary = exporter.export(path, [(0, 16000 * 300)], 16000, str(tmp_path / "out"))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert summary["speech_s"] == 300
+    assert peak < 1024 * 1024
+
+
+def test_export_speech_runs_streaming_vad(tmp_path):
+    rng = np.random.default_rng(0)
+    t = np.arange(3 * 16000) / 16000
+    voiced = np.sin(2 * np.pi * 150 * t) * 8000 * ((t > 1) & (t < 2))
+    path = str(tmp_path / "talk.wav")
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes((voiced + rng.standard_normal(len(t)) * 100).astype("<i2").tobytes())
+
+    summary = export_speech(path, VADService(sensitivity=1), str(tmp_path / "out"),
+                            SpeechExporter(padding_ms=0))
+    assert summary["segments"] >= 1
+    assert 0.8 < summary["speech_s"] < 1.5
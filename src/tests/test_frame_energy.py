@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from src.services.vad_service import VADService
+from src.utils.frame_energy import EnergyGate, FrameEnergy, frame_rms
+
+
+@pytest.fixture
+def speech_in_silence():
+    """Voiced bursts separated by digital silence and by low-level noise."""
+    rng = np.random.default_rng(5)
+    t = np.arange(16000 * 6) / 16000
+    voiced = np.sin(2 * np.pi * 150 * t) * 6000 * (np.sin(2 * np.pi * 0.4 * t) > 0.3)
+    noise = rng.standard_normal(len(t)) * 20 * (t > 3)
+    return (voiced + noise).astype(np.int16)
+
+
+def test_frame_rms_matches_frames():
+    """One RMS per VAD frame, computed over exactly that frame's samples."""
+    samples = (np.random.default_rng(0).standard_normal(5000) * 1000).astype(np.int16)
+    rms = frame_rms(samples, 480, 240, count=19)
+    expected = [np.sqrt(np.mean(samples[i * 240:i * 240 + 480].astype(np.float64) ** 2))
+                for i in range(19)]
+    np.testing.assert_allclose(rms, expected, rtol=1e-5)
+    assert len(frame_rms(samples[:100], 480, 240)) == 0
+
+
+def test_frame_energy_envelope_keeps_loudest_frame():
+    rms = np.random.default_rng(1).uniform(0, 100, 10000).astype(np.float32)
+    energy = FrameEnergy(rms, 16000, 480, 240)
+    times, values = energy.envelope(0, energy.step_size * 10000 / 16000, max_points=500)
+    assert len(times) == len(values) <= 500
+    assert values.max() == rms.max()
+    assert times[0] == pytest.approx(240 / 16000)  # Centre of the first frame
+
+
+def test_gate_does_not_depend_on_batching():
+    rms = np.random.default_rng(2).uniform(0, 200, 3000).astype(np.float32)
+    whole = EnergyGate().update(rms)
+    gate = EnergyGate()
+    batched = np.concatenate([gate.update(rms[i:i + 37]) for i in range(0, len(rms), 37)])
+    np.testing.assert_array_equal(whole, batched)
+    assert gate.skipped == len(rms) - np.count_nonzero(batched)
+
+
+def test_gate_skips_silence_but_not_loud_frames():
+    rms = np.concatenate((np.zeros(50), np.full(20, 5000.0), np.zeros(50))).astype(np.float32)
+    voiced = EnergyGate(hangover_frames=3).update(rms)
+    assert not voiced[:50].any()
+    assert voiced[50:73].all()  # Loud frames plus the hangover
+    assert not voiced[73:].any()
+
+
+def test_gated_vad_skips_calls_and_agrees(speech_in_silence):
+    """The gate skips the quiet frames while keeping nearly every decision."""
+    plain = VADService(sensitivity=2).detect_voice_activity(speech_in_silence, 16000)
+    service = VADService(sensitivity=2, energy_gate=True)
+    gated = service.detect_voice_activity(speech_in_silence, 16000)
+
+    assert service.gate_stats["frames"] == len(plain)
+    assert service.gate_stats["skipped"] > len(plain) // 5
+    assert np.mean(np.array(plain) == np.array(gated)) > 0.97
+
+
+def test_gated_all_modes_match_gated_runs(speech_in_silence):
+    """Precomputed frame energy gives the same gated mask as computing it per batch."""
+    service = VADService(sensitivity=1, energy_gate=True)
+    energy = FrameEnergy.from_audio(speech_in_silence, 16000, 480, 240)
+    mode_mask = service.detect_all_modes(speech_in_silence, 16000, frame_energy=energy.rms)
+    np.testing.assert_array_equal(mode_mask, service.detect_all_modes(speech_in_silence, 16000))
+
+    for sensitivity in range(4):
+        expected = VADService(sensitivity, energy_gate=True).detect_voice_activity(
+            speech_in_silence, 16000)
+        assert VADService.decisions_for_mode(mode_mask, sensitivity).tolist() == expected
@@ -0,0 +1,66 @@
+import json
+import logging
+
+import pytest
+from src.utils.instrumentation import Profiler
+from src.utils.logger import get_logger
+
+
+@pytest.fixture
+def profiler():
+    return Profiler(enabled=True)
+
+
+def test_disabled_profiler_records_nothing():
+    """While disabled, spans are a shared no-op and nothing is stored."""
+    profiler = Profiler()
+    assert profiler.span("a") is profiler.span("b")
+    with profiler.span("a"):
+        pass
+    profiler.observe("b", 0.1)
+    profiler.count("c")
+    assert profiler.get_summary() == {"spans": {}, "counters": {}}
+
+
+def test_summary_percentiles_and_counters(profiler):
+    """Counts and totals are exact; percentiles come from the recorded durations."""
+    for ms in range(1, 101):
+        profiler.observe("vad.is_speech", ms / 1000)
+    with profiler.span("decode"):
+        pass
+    profiler.count("vad.frames", 40)
+    profiler.count("vad.frames", 2)
+
+    summary = profiler.get_summary()
+    stats = summary["spans"]["vad.is_speech"]
+    assert stats["count"] == 100
+    assert stats["total_ms"] == pytest.approx(5050)
+    assert stats["p50_ms"] == pytest.approx(50.5)
+    assert stats["p95_ms"] == pytest.approx(95.05)
+    assert summary["spans"]["decode"]["count"] == 1
+    assert summary["counters"] == {"vad.frames": 42}
+    assert "vad.is_speech" in profiler.format_summary()
+
+
+def test_chrome_trace_export(profiler, tmp_path):
+    """Spans become complete ('X') events in microseconds; observations stay out of the trace."""
+    profiler.record("plot.waveform", profiler.origin + 0.5, profiler.origin + 0.75)
+    profiler.observe("vad.is_speech", 0.001)
+    profiler.count("cache.hits")
+
+    trace_path = tmp_path / "trace.json"
+    profiler.export_chrome_trace(str(trace_path))
+    trace = json.loads(trace_path.read_text())
+    event, = trace["traceEvents"]
+    assert (event["name"], event["cat"], event["ph"]) == ("plot.waveform", "plot", "X")
+    assert event["ts"] == pytest.approx(500000)
+    assert event["dur"] == pytest.approx(250000)
+    assert trace["metadata"]["counters"] == {"cache.hits": 1}
+
+
+def test_get_logger_is_idempotent():
+    """Repeated calls reuse the logger's handler instead of stacking new ones."""
+    logger = get_logger("test_get_logger_is_idempotent")
+    assert get_logger("test_get_logger_is_idempotent") is logger
+    assert len(logger.handlers) == 1
+    assert isinstance(logger.handlers[0], logging.StreamHandler)
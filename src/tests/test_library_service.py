@@ -0,0 +1,167 @@
+import os
+import time
+import wave
+
+import numpy as np
+import pytest
+from src.services.library_service import LibraryIndex, LibraryScanner, parse_filter
+from src.services.vad_service import VADService
+
+
+def write_wav(path, seconds, frame_rate=16000, channels=1, seed=0):
+    rng = np.random.default_rng(seed)
+    samples = (rng.standard_normal(int(seconds * frame_rate) * channels) * 3000).astype("<i2")
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(frame_rate)
+        wav.writeframes(samples.tobytes())
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = LibraryIndex(str(tmp_path / "library.sqlite3"))
+    yield index
+    index.close()
+
+
+def test_parse_filter():
+    words, conditions = parse_filter("Interview duration>=60 speech>50% segments<3 rate=8000")
+    assert words == ["Interview"]
+    assert conditions == [("duration_s", ">=", 60.0), ("speech_ratio", ">", 0.5),
+                          ("num_segments", "<", 3.0), ("frame_rate", "=", 8000.0)]
+    assert parse_filter("length>5 50%_off") == (["length>5", "50%_off"], [])
+
+
+def test_query_sorts_filters_and_pages(index):
+    entries = {f"/lib/{name}.wav": (1, 1) for name in ("b", "a", "c_1", "d")}
+    assert sorted(index.sync_folder("/lib", entries)) == sorted(entries)
+    index.update_headers([(30.0, 16000, 1, "/lib/a.wav"), (10.0, 8000, 2, "/lib/b.wav"),
+                          (20.0, 16000, 1, "/lib/c_1.wav")])
+
+    assert [e.name for e in index.query("/lib")] == ["a.wav", "b.wav", "c_1.wav", "d.wav"]
+    # Unknown values (d.wav has no header yet) sort last in both directions
+    by_length = index.query("/lib", sort_by="duration_s", descending=True)
+    assert [e.name for e in by_length] == ["a.wav", "c_1.wav", "b.wav", "d.wav"]
+    page = index.query("/lib", sort_by="duration_s", offset=1, limit=2)
+    assert [e.name for e in page] == ["c_1.wav", "a.wav"]
+
+    assert len(index.ordered_ids("/lib", "duration>15")) == 2
+    assert [e.name for e in index.query("/lib", "channels=2")] == ["b.wav"]
+    assert len(index.ordered_ids("/lib", "c_")) == 1  # LIKE wildcards in names match literally
+    assert index.ordered_ids("/other") == []
+    with pytest.raises(ValueError):
+        index.query("/lib", sort_by="path; DROP TABLE files")
+
+
+def test_sync_only_reports_changed_files(index):
+    index.sync_folder("/lib", {"/lib/a.wav": (1, 1), "/lib/b.wav": (1, 1)})
+    index.update_headers([(1.0, 16000, 1, "/lib/a.wav")])
+    changed = index.sync_folder("/lib", {"/lib/a.wav": (1, 1), "/lib/c.wav": (1, 1)})
+    assert changed == ["/lib/c.wav"]
+    assert [e.name for e in index.query("/lib")] == ["a.wav", "c.wav"]
+    assert index.query("/lib")[0].duration_s == 1.0  # Unchanged rows keep their metadata
+
+
+def test_scanner_indexes_folder_incrementally(tmp_path, index):
+    folder = tmp_path / "recordings"
+    folder.mkdir()
+    write_wav(folder / "short.wav", 0.5)
+    write_wav(folder / "stereo.wav", 1.0, frame_rate=8000, channels=2, seed=1)
+    (folder / "broken.wav").write_bytes(b"not a wav file")
+    (folder / "notes.txt").write_text("ignored")
+
+    scanner = LibraryScanner(index, VADService(sensitivity=1), workers=1)
+    scanner.start(str(folder))
+    assert scanner.wait(timeout=60)
+    progress = scanner.get_progress()
+    assert progress["files"] == 3 and progress["analyzed"] == 3 and not progress["running"]
+
+    entries = {e.name: e for e in index.query(str(folder))}
+    assert entries["short.wav"].duration_s == pytest.approx(0.5)
+    assert entries["stereo.wav"][3:5] == (8000, 2)
+    assert 0.0 <= entries["short.wav"].speech_ratio <= 1.0
+    assert entries["short.wav"].num_segments is not None
+    assert entries["broken.wav"].error is not None
+
+    # Only the modified file is looked at again
+    write_wav(folder / "short.wav", 2.0)
+    os.utime(folder / "short.wav", ns=(1, 1))
+    scanner.start(str(folder))
+    assert scanner.wait(timeout=60)
+    assert index.query(str(folder), "short")[0].duration_s == pytest.approx(2.0)
+    assert index.pending_analysis(str(folder), scanner.analysis_key) == []
+
+    # The player's sensitivity does not touch the index; another index sensitivity stales it
+    scanner.vad_service.set_sensitivity(3)
+    assert index.pending_analysis(str(folder), scanner.analysis_key) == []
+    other = LibraryScanner(index, scanner.vad_service, sensitivity=3)
+    assert len(index.pending_analysis(str(folder), other.analysis_key)) == 3
+
+
+def test_corrupt_files_do_not_end_the_scan(tmp_path, index, monkeypatch):
+    """Each unreadable file gets an error on its row; every other file is still indexed."""
+    from src.services import library_service
+
+    write_wav(tmp_path / "a.wav", 0.5)
+    write_wav(tmp_path / "c.wav", 0.5, seed=1)
+    # A fmt chunk of 4 bytes, too short for its fields
+    (tmp_path / "b.wav").write_bytes(b"RIFF\x20\0\0\0WAVEfmt \x04\0\0\0\1\0\1\0"
+                                     b"data\0\0\0\0")
+    write_wav(tmp_path / "odd.wav", 0.5, seed=2)
+
+    def read_wav_info(path):
+        if path.endswith("odd.wav"):
+            raise RuntimeError("unexpected")
+        return real_read_wav_info(path)
+
+    real_read_wav_info = library_service.read_wav_info
+    monkeypatch.setattr(library_service, "read_wav_info", read_wav_info)
+    scanner = LibraryScanner(index, VADService(sensitivity=1), workers=1)
+    scanner._analyze = lambda *args: None  # Only the header pass is under test
+    scanner.start(str(tmp_path))
+    assert scanner.wait(timeout=60)
+
+    entries = {e.name: e for e in index.query(str(tmp_path))}
+    assert entries["a.wav"].duration_s == entries["c.wav"].duration_s == pytest.approx(0.5)
+    assert entries["b.wav"].duration_s is None
+    assert entries["odd.wav"].error == "RuntimeError: unexpected"
+
+    # The VAD pass then records why the corrupt file failed and analyzes the rest
+    monkeypatch.undo()
+    del scanner._analyze
+    scanner.start(str(tmp_path))
+    assert scanner.wait(timeout=60)
+    entries = {e.name: e for e in index.query(str(tmp_path))}
+    assert entries["b.wav"].error is not None
+    assert all(entries[name].speech_ratio is not None for name in ("a.wav", "c.wav", "odd.wav"))
+
+
+def test_sensitivity_change_during_scan_keeps_results_keyed(tmp_path, index):
+    """Results are stored under the settings the scan started with, whatever changes meanwhile."""
+    for number in range(4):
+        write_wav(tmp_path / f"{number}.wav", 1.0, seed=number)
+    service = VADService(sensitivity=0)
+    scanner = LibraryScanner(index, service, workers=1)
+    key = scanner.analysis_key
+    scanner.start(str(tmp_path))
+    for sensitivity in (3, 2, 3):  # The user moves the selector while files are analyzed
+        service.set_sensitivity(sensitivity)
+    service.energy_gate = not service.energy_gate  # Only the next scan picks this up
+    assert scanner.wait(timeout=60)
+    assert index.pending_analysis(str(tmp_path), key) == []
+
+
+def test_stop_returns_while_a_worker_is_busy(tmp_path, index):
+    """stop() runs on the Tk thread, so it must not wait for a worker to finish a long file."""
+    write_wav(tmp_path / "long.wav", 600)
+    scanner = LibraryScanner(index, VADService(sensitivity=1), workers=1)
+    scanner.start(str(tmp_path))
+    while not index.query(str(tmp_path)) or index.query(str(tmp_path))[0].duration_s is None:
+        time.sleep(0.01)  # Headers are read; the file is now handed to the worker pool
+    thread = scanner.thread
+
+    start = time.perf_counter()
+    scanner.stop()
+    assert time.perf_counter() - start < 0.5
+    assert not thread.is_alive() and index.query(str(tmp_path))[0].speech_ratio is None
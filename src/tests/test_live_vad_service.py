@@ -0,0 +1,102 @@
+import socket
+import time
+
+import numpy as np
+import pytest
+from src.services.live_vad_service import LiveVADSession
+from src.services.vad_service import VADService
+from src.utils.live_sources import SocketSource
+from src.utils.ring_buffer import RingBuffer
+
+
+class ListSource:
+    """Hands out fixed PCM chunks, optionally pausing between them."""
+
+    def __init__(self, chunks, frame_rate=16000, interval=0.0):
+        self.chunks = chunks
+        self.frame_rate = frame_rate
+        self.interval = interval
+
+    def read_chunks(self):
+        for chunk in self.chunks:
+            time.sleep(self.interval)
+            yield chunk
+
+    def close(self):
+        pass
+
+
+class SlowVADService(VADService):
+    """Takes longer than real time per frame, to force backpressure."""
+
+    def classify_frame(self, frame, frame_rate):
+        time.sleep(0.02)
+        return super().classify_frame(frame, frame_rate)
+
+
+@pytest.fixture
+def speech_like():
+    rng = np.random.default_rng(3)
+    t = np.arange(32000) / 16000
+    voiced = np.sin(2 * np.pi * 150 * t) * 8000 * (np.sin(2 * np.pi * 0.5 * t) > 0)
+    return (voiced + rng.standard_normal(len(t)) * 200).astype(np.int16)
+
+
+def test_ring_buffer_wraps_and_drops_oldest():
+    """Reads across the wrap point are contiguous; overwritten samples read as None."""
+    ring = RingBuffer(10)
+    ring.write(np.arange(8, dtype=np.int16), arrival_time=1.0)
+    ring.write(np.arange(8, 14, dtype=np.int16), arrival_time=2.0)
+    assert ring.oldest == 4
+    assert ring.read(3, 2) is None
+    assert ring.read(6, 6).tolist() == [6, 7, 8, 9, 10, 11]
+    assert ring.arrival_time(8) == 1.0
+    assert ring.arrival_time(9) == 2.0
+    assert ring.read(12, 5) is None  # Not written yet
+
+
+def test_live_decisions_match_streaming_vad(speech_like):
+    """Without backpressure, live framing makes the same decisions as the file path."""
+    vad_service = VADService(sensitivity=1)
+    chunks = [speech_like[i:i + 320].tobytes() for i in range(0, len(speech_like), 320)]
+    session = LiveVADSession(vad_service, ListSource(chunks), max_lag_ms=10000).start()
+    decisions = list(session.decisions())
+
+    # webrtcvad adapts to what it has seen, so the reference run gets a fresh instance
+    expected = list(VADService(sensitivity=1).stream_voice_activity([speech_like], 16000))
+    assert [d.is_speech for d in decisions][:len(expected)] == expected
+    assert [d.frame_index for d in decisions] == list(range(len(decisions)))
+    assert all(d.skipped_frames == 0 and d.latency_ms >= 0 for d in decisions)
+    stats = session.get_stats()
+    assert stats["dropped_frames"] == 0
+    assert stats["received_s"] == pytest.approx(2.0)
+
+
+def test_backpressure_drops_and_flags_frames(speech_like):
+    """A VAD slower than real time skips frames instead of letting latency grow."""
+    chunks = [speech_like[i:i + 320].tobytes() for i in range(0, len(speech_like), 320)]
+    source = ListSource(chunks, interval=0.02)  # 20 ms of audio every 20 ms
+    session = LiveVADSession(SlowVADService(sensitivity=1), source, frame_duration=20,
+                             max_lag_ms=100).start()
+    decisions = list(session.decisions())
+
+    assert session.dropped_frames > 0
+    assert sum(d.skipped_frames for d in decisions) == session.dropped_frames
+    # Without dropping, the lag would reach about a second by the end of the 2 s stream
+    assert max(d.latency_ms for d in decisions) < 500
+
+
+def test_socket_source(speech_like):
+    """PCM sent by a TCP client is framed like any other source."""
+    source = SocketSource(port=0)
+    session = LiveVADSession(VADService(sensitivity=1), source, max_lag_ms=10000).start()
+    with socket.create_connection(source.address) as client:
+        client.sendall(speech_like[:8000].tobytes() + b"\x01")  # Odd trailing byte is held
+    decisions = list(session.decisions())
+    session.stop()
+    assert len(decisions) == (8000 - 480) // 240 + 1
+
+
+def test_invalid_frame_duration():
+    with pytest.raises(ValueError):
+        LiveVADSession(VADService(sensitivity=1), ListSource([]), frame_duration=25)
@@ -0,0 +1,28 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+from src.views.playback_cursor import BlitCursor  # noqa: E402
+
+
+def test_cursor_blits_after_background_is_cached():
+    """After a full draw, updates move the lines and record frame times without redrawing."""
+    fig, (ax_top, ax_bottom) = plt.subplots(2, 1, sharex=True)
+    ax_top.plot([0, 1, 2], [0, 1, 0])
+    lines = [ax_top.axvline(0), ax_bottom.axvline(0)]
+    cursor = BlitCursor(fig.canvas, lines)
+
+    fig.canvas.draw()
+    assert cursor.background is not None
+
+    draws = []
+    fig.canvas.mpl_connect("draw_event", draws.append)
+    for position in (0.5, 1.0, 1.5):
+        cursor.update(position)
+
+    assert not draws
+    assert all(list(line.get_xdata()) == [1.5] for line in lines)
+    stats = cursor.get_frame_stats()
+    assert stats["frames"] == 3 and stats["max_ms"] >= stats["mean_ms"] > 0
+    plt.close(fig)
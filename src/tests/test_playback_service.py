@@ -0,0 +1,117 @@
+import time
+
+import numpy as np
+import pytest
+from src.services.playback_service import NullDevice, PlaybackEngine, PygameDevice
+
+
+@pytest.fixture
+def engine():
+    """Engine on a device that never pulls by itself; tests call read() as the device would."""
+    engine = PlaybackEngine(NullDevice(realtime=False))
+    engine.load(np.arange(16000, dtype=np.int16), 16000)
+    return engine
+
+
+def test_seek_is_sample_accurate(engine):
+    """Seeking takes seconds and the next chunk starts at exactly that sample."""
+    engine.play()
+    engine.seek(0.25)
+    assert engine.get_position() == 0.25
+    assert engine.read(4).tolist() == [4000, 4001, 4002, 4003]
+    engine.seek(-1)
+    assert engine.get_position() == 0.0
+    engine.seek(99)
+    assert engine.get_position() == engine.duration == 1.0
+
+
+def test_clock_counts_samples_played(engine):
+    engine.play()
+    for _ in range(10):
+        engine.read(320)
+    assert engine.get_position() == pytest.approx(0.2)
+    engine.pause()
+    assert not engine.playing
+    assert engine.read(320) is None  # Nothing is handed out while paused
+    engine.play()
+    assert engine.read(1).tolist() == [3200]  # Resumes where it paused
+
+
+def test_end_of_buffer_stops_and_replays(engine):
+    engine.play()
+    chunks = []
+    chunk = engine.read(3000)
+    while chunk is not None:
+        chunks.append(chunk)
+        chunk = engine.read(3000)
+    assert np.concatenate(chunks).tolist() == list(range(16000))
+    assert len(chunks[-1]) == 1000
+    assert not engine.playing
+    engine.play()  # Playing again after the end starts from the beginning
+    assert engine.read(2).tolist() == [0, 1]
+
+
+def test_null_device_plays_in_real_time():
+    engine = PlaybackEngine(NullDevice())
+    engine.load(np.zeros(1600, dtype=np.int16), 16000)  # 100 ms
+    engine.play()
+    time.sleep(0.05)
+    assert 0 < engine.get_position() < 0.1
+    deadline = time.perf_counter() + 2
+    while engine.playing and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert not engine.playing
+    assert engine.get_position() == pytest.approx(0.1)
+
+
+def test_pygame_device_streams_buffer(monkeypatch):
+    """With SDL's dummy driver the pygame device consumes the buffer and reports the clock."""
+    pygame = pytest.importorskip("pygame")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    engine = PlaybackEngine(PygameDevice())
+    try:
+        engine.load(np.zeros(8000, dtype=np.int16), 8000)  # 1 s
+        engine.play()
+        engine.seek(0.9)
+        deadline = time.perf_counter() + 2
+        while engine.playing and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        assert not engine.playing
+        assert engine.get_position() == pytest.approx(1.0, abs=0.05)
+    finally:
+        engine.stop()
+        pygame.mixer.quit()  # Stop the SDL audio thread so later tests can fork safely
+
+
+def test_pygame_device_rejects_a_changed_format(monkeypatch):
+    """A mixer opened at another rate or channel count is refused, never played mismatched."""
+    pygame = pytest.importorskip("pygame")
+    calls = []
+    monkeypatch.setattr(pygame.mixer, "init", lambda **options: calls.append(options))
+    monkeypatch.setattr(pygame.mixer, "quit", lambda: calls.append("quit"))
+    monkeypatch.setattr(pygame.mixer, "get_init", lambda: (44100, -16, 2))
+    with pytest.raises(OSError):
+        PygameDevice().open(16000)
+    assert calls[1]["allowedchanges"] == 0 and calls[-1] == "quit"
+
+    engine = PlaybackEngine(PygameDevice())
+    engine.load(np.zeros(1600, dtype=np.int16), 16000)
+    assert isinstance(engine.device, NullDevice)  # Falls back to silent playback
+
+
+def test_failed_device_is_tried_again_on_the_next_load():
+    """One buffer the device cannot open plays silently; the next plays on the device."""
+    class PickyDevice(NullDevice):
+        def open(self, frame_rate):
+            if frame_rate != 16000:
+                raise OSError("unsupported rate")
+            super().open(frame_rate)
+
+    device = PickyDevice(realtime=False)
+    engine = PlaybackEngine(device)
+    engine.load(np.zeros(100, dtype=np.int16), 11025)
+    assert engine.device is not device and isinstance(engine.device, NullDevice)
+    engine.load(np.zeros(100, dtype=np.int16), 16000)
+    assert engine.device is device
+    engine.play()
+    assert len(engine.read(10)) == 10 and engine.get_position() == 10 / 16000
@@ -0,0 +1,113 @@
+import os
+import threading
+import wave
+
+import numpy as np
+import pytest
+from src.models.audio_model import AudioPlayerModel
+from src.services.playback_service import NullDevice
+from src.services.prefetch_service import PreparedFile, PreparedFileCache, Prefetcher
+from src.services.vad_service import VADService
+
+
+def write_wav(path, seconds=1.0, seed=0):
+    rng = np.random.default_rng(seed)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes((rng.standard_normal(int(seconds * 16000)) * 3000).astype("<i2").tobytes())
+    return str(path)
+
+
+@pytest.fixture
+def model():
+    return AudioPlayerModel(VADService(sensitivity=1), device=NullDevice(realtime=False))
+
+
+def test_prepared_file_counts_all_arrays(tmp_path, model):
+    prepared = PreparedFile.decode(model, write_wav(tmp_path / "a.wav"))
+    assert prepared.mode_mask is None
+    assert prepared.compute_vad_modes(model) is not None
+    expected = (prepared.audio_data.nbytes + prepared.pyramid.nbytes +
+                prepared.frame_energy.rms.nbytes + prepared.mode_mask.nbytes)
+    assert prepared.nbytes == expected > prepared.audio_data.nbytes
+
+
+def test_cache_evicts_least_recently_used_by_bytes(tmp_path, model):
+    files = [write_wav(tmp_path / f"{name}.wav", seed=i) for i, name in enumerate("abc")]
+    prepared = [PreparedFile.decode(model, path) for path in files]
+    for item in prepared:
+        item.compute_vad_modes(model)
+    cache = PreparedFileCache(max_bytes=int(prepared[0].nbytes * 2.5))
+
+    cache.put(prepared[0])
+    cache.put(prepared[1])
+    assert cache.get(files[0]) is prepared[0]  # a is now the most recently used
+    cache.put(prepared[2])
+    assert files[1] not in cache and files[0] in cache and files[2] in cache
+    assert cache.get(files[1]) is None
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+    assert stats["entries"] == 2 and stats["size_bytes"] <= stats["max_bytes"]
+
+    # A file changed on disk no longer matches its entry
+    write_wav(files[0], seconds=2.0)
+    os.utime(files[0], ns=(1, 1))
+    assert files[0] not in cache
+
+
+def test_prefetcher_prepares_scheduled_files(tmp_path, model):
+    files = [write_wav(tmp_path / f"{name}.wav", seed=i) for i, name in enumerate("abc")]
+    cache = PreparedFileCache()
+    prefetcher = Prefetcher(model, cache)
+    try:
+        prefetcher.schedule(files[:2])
+        assert prefetcher.wait_idle(timeout=30)
+        assert files[0] in cache and files[1] in cache and files[2] not in cache
+        assert cache.get(files[0]).mode_mask is not None
+        assert prefetcher.prefetched == 2
+
+        prefetcher.schedule(files)  # Cached files are skipped
+        assert prefetcher.wait_idle(timeout=30)
+        assert prefetcher.prefetched == 3
+    finally:
+        prefetcher.close()
+
+
+def test_cancel_keeps_the_selected_file_being_prefetched(tmp_path, model):
+    """Selecting the file being prefetched lets it finish; its neighbours are dropped."""
+    files = [write_wav(tmp_path / f"{name}.wav", seed=i) for i, name in enumerate("abc")]
+    started, release = threading.Event(), threading.Event()
+    prepare_audio = model.prepare_audio
+
+    def slow_prepare_audio(file_path):
+        started.set()
+        release.wait()
+        return prepare_audio(file_path)
+
+    model.prepare_audio = slow_prepare_audio
+    cache = PreparedFileCache()
+    prefetcher = Prefetcher(model, cache)
+    try:
+        prefetcher.schedule(files)
+        assert started.wait(timeout=10)
+        prefetcher.cancel(keep=files[0])
+        release.set()
+        prefetcher.wait_for(files[0])
+        assert cache.get(files[0]).mode_mask is not None
+        assert prefetcher.wait_idle(timeout=30)
+        assert files[1] not in cache and prefetcher.prefetched == 1
+
+        started.clear()
+        release.clear()
+        prefetcher.schedule(files[1:])
+        assert started.wait(timeout=10)
+        prefetcher.cancel(keep=files[0])  # Another file is selected: b is cancelled
+        release.set()
+        assert prefetcher.wait_idle(timeout=30) and files[1] not in cache
+    finally:
+        release.set()
+        prefetcher.close()
@@ -0,0 +1,42 @@
+import json
+import os
+import subprocess
+import sys
+
+from src.constants.app_constants import (
+    PROJECT_ROOT, STARTUP_IMPORT_BUDGET_S, STARTUP_DEFERRED_MODULES
+)
+
+GUI_MODULES = ("tkinter", "customtkinter", "matplotlib", "pygame")
+
+
+def run_fresh(code):
+    """Run code in a new interpreter (nothing imported yet) and return what it prints as JSON."""
+    script = ("import json, sys, time\n" + code +
+              "\nloaded = sorted({name.split('.')[0] for name in sys.modules})"
+              "\nprint(json.dumps({'loaded': loaded, **result}))")
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    output = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, env=env,
+                            capture_output=True, text=True, check=True, timeout=60).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_gui_startup_imports_within_budget():
+    # Best of three runs, so a busy machine does not fail the check by itself
+    runs = [run_fresh("start = time.perf_counter()\nimport src.main\n"
+                      "result = {'seconds': time.perf_counter() - start}") for _ in range(3)]
+    assert min(run["seconds"] for run in runs) < STARTUP_IMPORT_BUDGET_S
+    assert not set(runs[0]["loaded"]) & set(STARTUP_DEFERRED_MODULES)
+
+
+def test_headless_model_and_vad_never_load_the_gui():
+    run = run_fresh(
+        "import numpy as np\n"
+        "from src.models.audio_model import AudioPlayerModel\n"
+        "from src.services.vad_service import VADService\n"
+        "model = AudioPlayerModel(VADService(sensitivity=1))\n"
+        "samples = np.zeros(16000, dtype=np.int16)\n"
+        "result = {'frames': len(model.vad_service.detect_voice_activity(samples, 16000))}")
+    assert run["frames"] > 0
+    assert not set(run["loaded"]) & set(GUI_MODULES + ("pydub",))
+    assert "webrtcvad" in run["loaded"]
@@ -0,0 +1,121 @@
+import pytest
+from src.constants.app_constants import (
+    TICK_MIN_INTERVAL_MS, TICK_MAX_INTERVAL_MS, TICK_HIDDEN_INTERVAL_MS
+)
+from src.utils.tick_scheduler import TickScheduler
+
+
+class FakeWidget:
+    """Tk's after() family driven by hand, with a fake timer advanced by the test."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.pending = {}  # after id -> (delay in ms, callback)
+        self.idle = []
+        self.next_id = 0
+
+    def after(self, delay, callback):
+        self.next_id += 1
+        self.pending[self.next_id] = (delay, callback)
+        return self.next_id
+
+    def after_idle(self, callback):
+        self.idle.append(callback)
+
+    def after_cancel(self, after_id):
+        del self.pending[after_id]
+
+    def run_next(self, late_ms=0.0):
+        """Run the only pending tick, late_ms after it was due; returns its delay."""
+        (after_id, (delay, callback)), = self.pending.items()
+        del self.pending[after_id]
+        self.now += (delay + late_ms) / 1000
+        callback()
+        return delay
+
+
+@pytest.fixture
+def playback():
+    """A scheduler over a fake playback position, with two subscribers recording values."""
+    widget = FakeWidget()
+    state = {"position": 0.0, "playing": True, "visible": True, "clock_reads": 0, "cost": 0.0}
+
+    def clock():
+        state["clock_reads"] += 1
+        return state["position"]
+
+    def draw(value):
+        widget.now += state["cost"]
+        state.setdefault("drawn", []).append(value)
+
+    scheduler = TickScheduler(widget, clock, lambda: state["playing"], lambda: state["visible"],
+                              timer=lambda: widget.now)
+    scheduler.subscribe(draw)
+    scheduler.subscribe(lambda value: state.setdefault("progress", []).append(value))
+    return widget, scheduler, state
+
+
+def test_one_loop_one_clock_read_per_tick(playback):
+    widget, scheduler, state = playback
+    for _ in range(3):
+        scheduler.start()  # Toggling play repeatedly must not stack loops
+    assert len(widget.pending) == 1
+
+    for position in (0.1, 0.2, 0.2):
+        state["position"] = position
+        widget.run_next()
+    assert state["drawn"] == state["progress"] == [0.1, 0.2]  # The unchanged tick drew nothing
+    assert state["clock_reads"] == 3
+
+    state["playing"] = False
+    state["position"] = 0.25
+    widget.run_next()
+    assert state["drawn"][-1] == 0.25 and not widget.pending and not scheduler.running
+
+
+def test_interval_follows_render_cost_and_visibility(playback):
+    widget, scheduler, state = playback
+    scheduler.start()
+    widget.run_next()
+    assert widget.run_next() == TICK_MIN_INTERVAL_MS  # Cheap redraws run at the fastest rate
+
+    state["cost"] = 0.010  # 10 ms per redraw: ticks slow down so redraws take a quarter
+    for tick in range(30):
+        state["position"] = tick
+        widget.run_next()
+    assert next(iter(widget.pending.values()))[0] == pytest.approx(40, abs=2)
+
+    state["cost"] = 0.5
+    state["position"] = -1
+    widget.run_next()
+    widget.run_next()
+    assert scheduler.interval_ms == TICK_MAX_INTERVAL_MS
+
+    state["visible"] = False
+    renders = scheduler.stats["renders"]
+    widget.run_next()
+    assert next(iter(widget.pending.values()))[0] == TICK_HIDDEN_INTERVAL_MS
+    assert scheduler.stats["renders"] == renders and scheduler.stats["hidden"] == 1
+
+
+def test_jitter_and_dropped_frames(playback):
+    widget, scheduler, state = playback
+    scheduler.start()
+    widget.run_next()
+    state["position"] = 1.0
+    widget.run_next(late_ms=TICK_MIN_INTERVAL_MS * 2.5)  # e.g. the Tk thread was busy
+
+    stats = scheduler.get_stats()
+    assert stats["dropped_frames"] == 2
+    assert stats["jitter_max_ms"] == pytest.approx(TICK_MIN_INTERVAL_MS * 2.5)
+    assert stats["ticks"] == 2 and stats["running"]
+
+
+def test_refresh_requests_are_coalesced(playback):
+    widget, scheduler, state = playback
+    for position in (1.0, 2.0, 3.0):  # e.g. slider drag events between two idle moments
+        state["position"] = position
+        scheduler.refresh()
+    assert len(widget.idle) == 1
+    widget.idle.pop()()
+    assert state["drawn"] == [3.0] and scheduler.stats["coalesced"] == 2
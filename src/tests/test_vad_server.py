@@ -0,0 +1,179 @@
+import asyncio
+import io
+import json
+import threading
+import wave
+
+import numpy as np
+from src.services.load_generator import HTTPClient, run_load
+from src.services.vad_server import VADServer
+from src.services.vad_service import VADService
+
+
+def speech_like_pcm(seconds=3.0, rate=16000):
+    """Noise with a loud 150 Hz tone from 1 s to 2 s, as int16."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * rate)) / rate
+    voiced = np.sin(2 * np.pi * 150 * t) * 8000 * ((t > 1) & (t < 2))
+    return (voiced + rng.standard_normal(len(t)) * 100).astype("<i2")
+
+
+def wav_bytes(samples, rate):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def run_with_server(scenario, **options):
+    """Run scenario(server, client) against a thread-pool server on a free local port."""
+    async def main():
+        server = VADServer(use_processes=options.pop("use_processes", False), **options)
+        await server.start("127.0.0.1", 0)
+        client = HTTPClient(*server.address)
+        try:
+            return await scenario(server, client)
+        finally:
+            await client.close()
+            await server.close()
+    return asyncio.run(main())
+
+
+def test_wav_and_chunked_pcm_give_the_service_segments():
+    samples = speech_like_pcm()
+    service = VADService(sensitivity=1)
+    expected = service.get_speech_segments(service.detect_voice_activity(samples, 16000), 16000)
+
+    async def scenario(server, client):
+        wav = await client.request("POST", "/vad", wav_bytes(samples, 16000))
+        pcm = await client.request("POST", "/vad?rate=16000&sensitivity=1", samples.tobytes(),
+                                   chunked=True)
+        return wav, pcm
+
+    for status, _, body in run_with_server(scenario, workers=2):
+        assert status == 200
+        result = json.loads(body)
+        assert result["frame_rate"] == 16000 and result["duration_s"] == 3.0
+        assert result["segments"] == (expected / 16000).tolist()
+
+
+def test_bad_requests_are_rejected_with_a_status():
+    async def scenario(server, client):
+        statuses = [
+            (await client.request("POST", "/vad?sensitivity=7", b"\0\0" * 100))[0],
+            (await client.request("POST", "/vad?rate=44100", b"\0\0" * 100))[0],
+            (await client.request("POST", "/vad", b"RIFF" + b"\0" * 100))[0],
+            (await client.request("POST", "/vad", b"\0" * 4096))[0],
+            (await client.request("GET", "/vad"))[0],
+            (await client.request("GET", "/nowhere"))[0],
+        ]
+        return statuses, await client.get_json("/metrics")
+
+    statuses, (status, metrics) = run_with_server(scenario, workers=1, max_body_bytes=1024)
+    assert statuses == [400, 400, 400, 413, 405, 404]
+    assert status == 200 and metrics["failed"] == 1 and metrics["completed"] == 0
+
+
+def test_malformed_uploads_get_a_client_error():
+    truncated_fmt = b"RIFF\x20\0\0\0WAVEfmt \x04\0\0\0\1\0\1\0data\4\0\0\0\0\0\0\0"
+
+    async def scenario(server, client):
+        wav = await client.request("POST", "/vad", truncated_fmt)
+        # A negative chunk size, which int(..., 16) would accept
+        reader, writer = await asyncio.open_connection(*server.address)
+        writer.write(b"POST /vad HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n-1\r\n")
+        response = await reader.readline()
+        writer.close()
+        return wav[0], response, server.get_metrics()
+
+    wav_status, response, metrics = run_with_server(scenario, workers=1)
+    assert wav_status == 400 and response.startswith(b"HTTP/1.1 400")
+    assert metrics["held_bytes"] == 0 and metrics["reading"] == 0
+
+
+def test_full_queue_answers_busy_and_queued_requests_are_batched():
+    release = threading.Event()
+    body = speech_like_pcm(0.5).tobytes()
+
+    async def wait_until(condition):
+        for _ in range(500):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+
+    async def scenario(server, client):
+        server.executor.submit(release.wait)  # Keep the only worker busy...
+        first = asyncio.create_task(client.request("POST", "/vad?rate=16000", body))
+        await wait_until(lambda: server.in_flight == 1)  # ...with a request waiting for it
+        load = asyncio.create_task(run_load(body, *server.address, "/vad?rate=16000",
+                                            requests=8, concurrency=8))
+        await wait_until(lambda: server.stats["rejected"] == 5)
+        release.set()
+        return (await first)[0], await load
+
+    first_status, report = run_with_server(scenario, workers=1, max_queue=3)
+    # Three requests queued behind the first, the rest were turned away instead of queueing
+    assert first_status == 200
+    assert (report["ok"], report["rejected"], report["errors"]) == (3, 5, 0)
+    metrics = report["server"]
+    assert (metrics["completed"], metrics["batches"], metrics["mean_batch_size"]) == (4, 2, 2.0)
+    assert metrics["latency_p99_ms"] > 0 and metrics["queue_depth"] == 0
+
+
+def test_uploads_reserve_their_place_and_bytes_before_the_body_is_read():
+    release = threading.Event()
+    small = speech_like_pcm(0.05).tobytes()
+    large = speech_like_pcm(1.875).tobytes()  # 60000 bytes
+
+    async def wait_until(condition):
+        for _ in range(500):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+
+    async def scenario(server, client):
+        server.executor.submit(release.wait)
+        first = asyncio.create_task(client.request("POST", "/vad?rate=16000", small))
+        await wait_until(lambda: server.in_flight == 1)
+
+        # Headers announce a large body that has not arrived yet: its bytes are reserved
+        reader, writer = await asyncio.open_connection(*server.address)
+        writer.write(b"POST /vad?rate=16000 HTTP/1.1\r\nContent-Length: %d\r\n\r\n"
+                     % len(large))
+        await wait_until(lambda: server.reading == 1)
+        held = server.held_bytes
+        assert held == len(small) + len(large)
+
+        # Neither a declared nor a streamed body may push the held bytes past the limit
+        other = HTTPClient(*server.address)
+        busy = [(await other.request("POST", "/vad?rate=16000", large, chunked=chunked))[0]
+                for chunked in (False, True)]
+        await other.close()
+        assert server.held_bytes == held
+
+        writer.write(large)
+        release.set()
+        response = await reader.readline()
+        writer.close()
+        return (await first)[0], response, busy, server.get_metrics()
+
+    first_status, response, busy, metrics = run_with_server(scenario, workers=1,
+                                                            max_held_bytes=100000)
+    assert first_status == 200 and response.startswith(b"HTTP/1.1 200")
+    assert busy == [503, 503]
+    assert metrics["held_bytes"] == 0 and metrics["reading"] == 0 and metrics["rejected"] == 2
+
+
+def test_process_workers_resample_wav_uploads():
+    samples = speech_like_pcm(rate=48000)
+
+    async def scenario(server, client):
+        return await client.request("POST", "/vad", wav_bytes(samples, 48000))
+
+    status, _, body = run_with_server(scenario, workers=1, use_processes=True)
+    result = json.loads(body)
+    assert status == 200 and result["frame_rate"] == 16000
+    assert result["num_segments"] >= 1 and 0.8 < sum(e - s for s, e in result["segments"]) < 1.5
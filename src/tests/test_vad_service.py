@@ -1,3 +1,7 @@
+import threading
+import tracemalloc
+
+import numpy as np
 import pytest
 from src.services.vad_service import VADService
 
@@ -14,3 +18,111 @@ def test_vad_service(vad_service):
     vad_results = vad_service.detect_voice_activity(test_audio, frame_rate)
     assert isinstance(vad_results, list)
     assert len(vad_results) > 0
+
+
+def test_stream_voice_activity_matches_batch(vad_service):
+    """Streaming in arbitrary chunk sizes gives the same decisions as the batch call."""
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(16000 * 3) * 3000).astype(np.int16)
+    frame_rate = 16000
+    expected = VADService(sensitivity=1).detect_voice_activity(audio, frame_rate)
+
+    for chunk_size in (1, 241, 480, 4096, len(audio)):
+        chunks = (audio[i:i + chunk_size] for i in range(0, len(audio), chunk_size))
+        streamed = list(VADService(sensitivity=1).stream_voice_activity(chunks, frame_rate))
+        assert streamed == expected
+
+
+def test_stream_voice_activity_accepts_odd_byte_chunks(vad_service):
+    """Raw PCM chunks split mid-sample are reassembled before framing."""
+    audio = (np.arange(16000) % 2000 - 1000).astype(np.int16)
+    raw = audio.tobytes()
+    chunks = [raw[i:i + 777] for i in range(0, len(raw), 777)]
+    streamed = list(VADService(sensitivity=1).stream_voice_activity(chunks, 16000))
+    assert streamed == VADService(sensitivity=1).detect_voice_activity(audio, 16000)
+
+
+def test_frames_without_overlap():
+    """With overlap 0 the frames tile the audio and match classifying each slice alone."""
+    rng = np.random.default_rng(6)
+    audio = (rng.standard_normal(16000 * 2) * 3000).astype(np.int16)
+    decisions = VADService(sensitivity=1, overlap=0.0).detect_voice_activity(audio, 16000)
+
+    vad = VADService._new_vad(1)
+    expected = [vad.is_speech(audio[i:i + 480].tobytes(), 16000)
+                for i in range(0, len(audio) - 480, 480)]
+    assert decisions == expected
+
+
+def test_streaming_does_not_copy_the_audio():
+    """Frames are views into the caller's buffer, so streaming allocates almost nothing."""
+    audio = (np.random.default_rng(7).standard_normal(16000 * 60) * 3000).astype(np.int16)
+    service = VADService(sensitivity=1)
+    tracemalloc.start()
+    try:
+        for _ in service.stream_voice_activity([audio], 16000):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < audio.nbytes // 20
+
+
+def test_all_modes_match_single_mode_runs():
+    """Each bit of the all-sensitivity mask equals a separate run at that sensitivity."""
+    rng = np.random.default_rng(4)
+    t = np.arange(16000 * 3) / 16000
+    voiced = np.sin(2 * np.pi * 150 * t) * 6000 * (np.sin(2 * np.pi * 0.7 * t) > 0)
+    audio = (voiced + rng.standard_normal(len(t)) * 800).astype(np.int16)
+    mode_mask = VADService(sensitivity=1).detect_all_modes(audio, 16000)
+
+    for sensitivity in range(4):
+        expected = VADService(sensitivity).detect_voice_activity(audio, 16000)
+        decisions = VADService.decisions_for_mode(mode_mask, sensitivity)
+        assert decisions.tolist() == expected
+
+
+def test_all_modes_cancelled():
+    cancel_event = threading.Event()
+    cancel_event.set()
+    audio = np.zeros(16000, dtype=np.int16)
+    assert VADService(sensitivity=1).detect_all_modes(audio, 16000,
+                                                      cancel_event=cancel_event) is None
+
+
+def test_stream_speech_segments(vad_service):
+    """Closed segments cover the speech frames in sample units."""
+    rng = np.random.default_rng(1)
+    audio = (rng.standard_normal(16000 * 2) * 3000).astype(np.int16)
+    segments = list(vad_service.stream_speech_segments([audio], 16000))
+    for start, end in segments:
+        assert 0 <= start < end <= len(audio)
+    assert segments == sorted(segments)
+
+
+def test_get_speech_segments_maps_frames_to_samples():
+    """Runs of speech frames map to exact sample spans of the 50%-overlapped frames."""
+    vad_results = [False, True, True, False, False, False, True, False]
+    segments = VADService.get_speech_segments(vad_results, 16000, hangover_frames=0, min_speech_ms=0)
+    # 30 ms frames are 480 samples with a 240-sample step
+    np.testing.assert_array_equal(segments, [[240, 240 * 2 + 480], [240 * 6, 240 * 6 + 480]])
+
+
+def test_get_speech_segments_smoothing():
+    """Hangover bridges short gaps and the minimum duration drops blips."""
+    vad_results = [True, True, False, False, False, True, True] + [False] * 10 + [True] + [False] * 10
+    raw = VADService.get_speech_segments(vad_results, 16000, hangover_frames=0, min_speech_ms=0)
+    smoothed = VADService.get_speech_segments(vad_results, 16000, hangover_frames=2, min_speech_ms=70)
+
+    assert len(raw) == 3
+    np.testing.assert_array_equal(smoothed, [[0, 240 * 6 + 480 + 2 * 240]])
+
+
+@pytest.mark.parametrize("hangover_frames, min_speech_ms", [(0, 0), (2, 60), (5, 200)])
+def test_streamed_segments_match_vectorized(hangover_frames, min_speech_ms):
+    """Streaming segment extraction yields exactly the vectorized segments."""
+    rng = np.random.default_rng(2)
+    vad_results = list(rng.random(2000) < 0.6)
+    expected = VADService.get_speech_segments(vad_results, 16000, 30, hangover_frames, min_speech_ms)
+    streamed = list(VADService._iter_segments(vad_results, 16000, 30, hangover_frames, min_speech_ms))
+    np.testing.assert_array_equal(np.array(streamed).reshape(-1, 2), expected)
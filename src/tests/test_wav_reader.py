@@ -0,0 +1,121 @@
+import struct
+import wave
+
+import numpy as np
+import pytest
+from src.utils.resampler import PolyphaseResampler, resample_poly
+from src.utils.wav_reader import iter_wav_chunks, load_wav, load_wav_bytes, read_wav_info
+
+
+def write_wav(path, samples, frame_rate, sample_width=2):
+    """Write integer samples shaped (frames, channels) as a PCM WAV."""
+    frames = np.asarray(samples)
+    if sample_width == 1:
+        data = (frames + 128).astype(np.uint8).tobytes()
+    elif sample_width == 3:
+        data = frames.astype("<i4").view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    else:
+        data = frames.astype(f"<i{sample_width}").tobytes()
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(frames.shape[1])
+        wav.setsampwidth(sample_width)
+        wav.setframerate(frame_rate)
+        wav.writeframes(data)
+
+
+def write_float_wav(path, samples, frame_rate):
+    """Write mono float32 samples as an IEEE-float WAV."""
+    data = np.asarray(samples, dtype="<f4").tobytes()
+    fmt = struct.pack("<HHIIHH", 3, 1, frame_rate, frame_rate * 4, 4, 32)
+    body = (b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+            + b"data" + struct.pack("<I", len(data)) + data)
+    path.write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+
+
+@pytest.fixture
+def ramp():
+    return (np.arange(16000) % 4000 - 2000).astype(np.int64)
+
+
+def test_native_rate_mono_is_memory_mapped(tmp_path, ramp):
+    """Mono 16-bit files at the target rate are returned without conversion."""
+    path = tmp_path / "native.wav"
+    write_wav(path, ramp[:, None], 16000)
+    samples, frame_rate = load_wav(str(path))
+    assert frame_rate == 16000
+    assert isinstance(samples, np.memmap)
+    np.testing.assert_array_equal(samples, ramp)
+
+
+@pytest.mark.parametrize("sample_width, scale", [(1, 1 / 256), (2, 1), (3, 256), (4, 65536)])
+def test_sample_widths_and_stereo_downmix(tmp_path, ramp, sample_width, scale):
+    """Every PCM width is scaled to int16 and stereo channels are averaged."""
+    path = tmp_path / f"pcm{sample_width}.wav"
+    left = np.round(ramp * scale).astype(np.int64)
+    write_wav(path, np.stack([left, left // 2], axis=1), 16000, sample_width)
+
+    info = read_wav_info(str(path))
+    assert (info.channels, info.sample_width, info.num_frames) == (2, sample_width, len(ramp))
+
+    samples, _ = load_wav(str(path))
+    expected = (left + left // 2) / 2 / scale
+    np.testing.assert_allclose(samples, expected, atol=1 if sample_width == 1 else 0.51)
+
+
+def test_float_wav(tmp_path):
+    """IEEE-float WAVs are mapped to the int16 scale."""
+    path = tmp_path / "float.wav"
+    write_float_wav(path, np.array([0.0, 0.5, -0.5, 1.0]), 16000)
+    samples, _ = load_wav(str(path))
+    np.testing.assert_array_equal(samples, [0, 16384, -16384, 32767])
+
+
+def test_resampled_load_matches_chunked_stream(tmp_path):
+    """load_wav and iter_wav_chunks go through the same conversion and agree exactly."""
+    rng = np.random.default_rng(0)
+    path = tmp_path / "cd.wav"
+    write_wav(path, (rng.standard_normal((44100 * 3, 2)) * 3000).astype(np.int64), 44100)
+
+    samples, frame_rate = load_wav(str(path))
+    streamed = np.concatenate(list(iter_wav_chunks(str(path))))
+    assert frame_rate == 16000 and len(samples) == -(-44100 * 3 * 16000 // 44100)
+    np.testing.assert_array_equal(samples, streamed)
+
+    from_memory, _ = load_wav_bytes(path.read_bytes())
+    np.testing.assert_array_equal(from_memory, samples)
+
+
+def test_non_wav_is_rejected(tmp_path):
+    path = tmp_path / "fake.wav"
+    path.write_bytes(b"ID3" + b"\x00" * 64)
+    with pytest.raises(ValueError):
+        read_wav_info(str(path))
+
+
+@pytest.mark.parametrize("fmt", [
+    struct.pack("<HHI", 1, 1, 16000),  # Truncated fmt chunk
+    struct.pack("<HHIIHH", 1, 1, 0, 0, 2, 16),  # Zero sample rate
+])
+def test_malformed_header_raises_value_error(tmp_path, fmt):
+    """Callers fall back or skip on ValueError, so no other error may escape for bad headers."""
+    body = (b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+            + b"data" + struct.pack("<I", 4) + b"\0" * 4)
+    path = tmp_path / "bad.wav"
+    path.write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+    with pytest.raises(ValueError):
+        read_wav_info(str(path))
+
+
+@pytest.mark.parametrize("from_rate", [8000, 22050, 44100, 48000])
+def test_resampler_preserves_tone_and_streams(from_rate):
+    """A 1 kHz tone survives resampling, and chunked processing matches one-shot output."""
+    tone = np.sin(2 * np.pi * 1000 * np.arange(from_rate) / from_rate).astype(np.float32)
+    resampled = resample_poly(tone, from_rate, 16000)
+    expected = np.sin(2 * np.pi * 1000 * np.arange(len(resampled)) / 16000)
+    assert len(resampled) == 16000
+    assert np.abs(resampled[100:-100] - expected[100:-100]).max() < 0.01
+
+    resampler = PolyphaseResampler(from_rate, 16000)
+    parts = [resampler.process(tone[i:i + 1234]) for i in range(0, len(tone), 1234)]
+    chunked = np.concatenate(parts + [resampler.flush()])
+    np.testing.assert_allclose(chunked, resampled, atol=1e-4)
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from src.utils.waveform_pyramid import WaveformPyramid
+
+
+@pytest.fixture
+def pyramid():
+    rng = np.random.default_rng(0)
+    samples = (rng.standard_normal(16000 * 60) * 3000).astype(np.int16)
+    return WaveformPyramid(samples, 16000)
+
+
+@pytest.mark.parametrize("start_time, end_time", [(0, 60), (12.3, 47.9), (30, 30.5)])
+def test_envelope_keeps_peaks_within_budget(pyramid, start_time, end_time):
+    """The envelope stays within the point budget and preserves the true extremes."""
+    times, values = pyramid.envelope(start_time, end_time, max_points=2000)
+    visible = pyramid.samples[int(start_time * 16000):int(np.ceil(end_time * 16000)) + 1]
+
+    assert len(times) == len(values) <= 2000
+    assert values.min() == visible.min()
+    assert values.max() == visible.max()
+    assert times[0] <= start_time + 1e-9 and times[-1] <= end_time + 1e-3
+
+
+def test_envelope_returns_raw_samples_when_zoomed_in(pyramid):
+    """Zooming below the point budget draws the original samples."""
+    times, values = pyramid.envelope(1.0, 1.01, max_points=2000)
+    np.testing.assert_array_equal(values, pyramid.samples[16000:16000 + len(values)])
+    assert times[1] - times[0] == pytest.approx(1 / 16000)
+
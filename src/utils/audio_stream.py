@@ -0,0 +1,11 @@
+from src.constants.app_constants import STREAM_CHUNK_FRAMES
+from src.utils.wav_reader import iter_wav_chunks  # noqa: F401  Re-exported streaming file source
+
+
+def iter_byte_chunks(stream, chunk_size=STREAM_CHUNK_FRAMES * 2):
+    """Yield raw PCM chunks from any binary file-like object (socket file, stdin, pipe)."""
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        yield data
@@ -0,0 +1,96 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from src.constants.app_constants import (
+    VAD_GATE_RATIO, VAD_GATE_MIN_RMS, VAD_GATE_MAX_RMS, VAD_GATE_WINDOW_FRAMES,
+    VAD_GATE_HANGOVER_FRAMES
+)
+
+
+def frame_rms(samples, frame_size, step_size, count=None):
+    """RMS of frames i * step_size .. i * step_size + frame_size of samples, as float32.
+
+    Frames are a strided view into samples, so no frame is copied. count limits the number
+    of frames (e.g. to the frames VAD framing has finalized so far).
+    """
+    if len(samples) < frame_size:
+        return np.empty(0, dtype=np.float32)
+    frames = sliding_window_view(samples, frame_size)[::step_size]
+    if count is not None:
+        frames = frames[:count]
+    # float32 accumulation is exact enough for a level estimate and twice as fast as float64
+    energy = np.einsum('ij,ij->i', frames, frames, dtype=np.float32)
+    return np.sqrt(energy / frame_size)
+
+
+class FrameEnergy:
+    """Per-frame RMS of a whole file on the VAD frame grid, for plotting and the energy gate."""
+
+    def __init__(self, rms, frame_rate, frame_size, step_size):
+        self.rms = rms
+        self.frame_rate = frame_rate
+        self.frame_size = frame_size
+        self.step_size = step_size
+
+    @classmethod
+    def from_audio(cls, audio_data, frame_rate, frame_size, step_size):
+        return cls(frame_rms(audio_data, frame_size, step_size), frame_rate, frame_size, step_size)
+
+    def envelope(self, start_time, end_time, max_points):
+        """Return (times, values) of frame RMS over the range, at most about max_points points.
+
+        Times are frame centres; when zoomed out, each point is the loudest frame it covers.
+        """
+        centre = self.frame_size / 2
+        first = max(int(np.floor((start_time * self.frame_rate - centre) / self.step_size)), 0)
+        last = min(int(np.ceil((end_time * self.frame_rate - centre) / self.step_size)) + 1,
+                   len(self.rms))
+        last = max(last, first)
+        group = max(-(-(last - first) // max(max_points, 1)), 1)
+        starts = np.arange(first, last, group)
+        values = np.maximum.reduceat(self.rms[first:last], starts - first) if len(starts) else \
+            self.rms[first:last]
+        return (starts * self.step_size + centre) / self.frame_rate, values
+
+
+class EnergyGate:
+    """Adaptive noise-floor gate that marks frames too quiet to be worth a VAD call.
+
+    The noise floor of a frame is the lowest RMS over it and the window_frames - 1 frames
+    before it (minimum statistics), so it follows changing background noise. A frame is loud
+    when its RMS reaches ratio times that floor, clipped to [min_rms, max_rms] so digital
+    silence is always skipped and clearly audible frames never are. Loud frames and the
+    hangover_frames after them go to the VAD, which keeps webrtcvad's own hangover intact.
+    History is carried between calls, so the result does not depend on how frames are batched.
+    """
+
+    def __init__(self, ratio=VAD_GATE_RATIO, min_rms=VAD_GATE_MIN_RMS, max_rms=VAD_GATE_MAX_RMS,
+                 window_frames=VAD_GATE_WINDOW_FRAMES, hangover_frames=VAD_GATE_HANGOVER_FRAMES):
+        self.ratio = ratio
+        self.min_rms = min_rms
+        self.max_rms = max_rms
+        self.window_frames = window_frames
+        self.hangover_frames = hangover_frames
+        # RMS of the most recent frames; +inf before any frame, so early floors use what exists
+        self.history = np.full(window_frames - 1, np.inf, dtype=np.float32)
+        self.recent_loud = np.zeros(hangover_frames, dtype=bool)
+        self.frames = 0
+        self.skipped = 0
+
+    def update(self, rms):
+        """Return a bool array, True for each frame of rms that should go to the VAD."""
+        rms = np.asarray(rms, dtype=np.float32)
+        if len(rms) == 0:
+            return np.empty(0, dtype=bool)
+
+        window = np.concatenate((self.history, rms))
+        noise_floor = sliding_window_view(window, self.window_frames).min(axis=1)
+        self.history = window[len(window) - (self.window_frames - 1):]
+        loud = rms >= np.clip(noise_floor * self.ratio, self.min_rms, self.max_rms)
+
+        loud = np.concatenate((self.recent_loud, loud))
+        voiced = sliding_window_view(loud, self.hangover_frames + 1).any(axis=1)
+        self.recent_loud = loud[len(loud) - self.hangover_frames:]
+
+        self.frames += len(rms)
+        self.skipped += int(len(rms) - np.count_nonzero(voiced))
+        return voiced
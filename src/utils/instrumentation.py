@@ -0,0 +1,151 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+from src.constants.app_constants import PROFILE_ENV_VAR, PROFILE_MAX_EVENTS, PROFILE_MAX_SAMPLES
+
+
+class _NullSpan:
+    """Shared do-nothing context manager handed out while profiling is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class Profiler:
+    """Named timing spans and counters for the hot paths, off unless enabled.
+
+    Spans go both into per-name duration samples (for p50/p95 summaries) and into a bounded
+    event log that can be exported as a Chrome trace (chrome://tracing, Perfetto). Very hot
+    calls such as per-frame VAD decisions use observe(), which keeps durations but no events.
+    While disabled, span() returns a shared no-op object and the other methods return at once.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.events = deque(maxlen=PROFILE_MAX_EVENTS)  # (name, start, end, thread id)
+        self.durations = {}  # name -> recent durations in seconds
+        self.totals = {}  # name -> [calls, seconds] over the whole session
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.origin = time.perf_counter()
+            self.events.clear()
+            self.durations.clear()
+            self.totals.clear()
+            self.counters.clear()
+
+    def span(self, name):
+        """Context manager timing the enclosed block under name."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, start, end):
+        """Record an already timed block (perf_counter start and end)."""
+        if not self.enabled:
+            return
+        self.events.append((name, start, end, threading.get_ident()))
+        self._add_sample(name, end - start)
+
+    def observe(self, name, seconds):
+        """Add a duration sample without a trace event, for calls made thousands of times."""
+        if self.enabled:
+            self._add_sample(name, seconds)
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def get_summary(self):
+        """Per-name call count, total and p50/p95/max in ms, plus the counters.
+
+        Counts and totals cover the whole session; percentiles use the most recent samples.
+        """
+        with self._lock:  # Other threads may be recording
+            snapshot = [(name, list(samples), tuple(self.totals[name]))
+                        for name, samples in sorted(self.durations.items())]
+            counters = dict(sorted(self.counters.items()))
+
+        spans = {}
+        for name, samples, (calls, seconds) in snapshot:
+            samples_ms = np.array(samples) * 1000
+            spans[name] = {
+                "count": calls,
+                "total_ms": seconds * 1000,
+                "p50_ms": float(np.percentile(samples_ms, 50)),
+                "p95_ms": float(np.percentile(samples_ms, 95)),
+                "max_ms": float(samples_ms.max()),
+            }
+        return {"spans": spans, "counters": counters}
+
+    def format_summary(self):
+        """The summary as a plain-text table for logs."""
+        summary = self.get_summary()
+        lines = [f"{'span':<24} {'count':>8} {'total ms':>10} {'p50 ms':>9} {'p95 ms':>9}"]
+        for name, stats in summary["spans"].items():
+            lines.append(f"{name:<24} {stats['count']:>8} {stats['total_ms']:>10.1f} "
+                         f"{stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f}")
+        lines.extend(f"{name:<24} {value:>8}" for name, value in summary["counters"].items())
+        return "\n".join(lines)
+
+    def export_chrome_trace(self, file_path):
+        """Write the recorded spans as Chrome trace-event JSON; counters go into metadata."""
+        pid = os.getpid()
+        trace_events = [
+            {"name": name, "cat": name.split(".")[0], "ph": "X", "pid": pid, "tid": tid,
+             "ts": (start - self.origin) * 1e6, "dur": (end - start) * 1e6}
+            for name, start, end, tid in list(self.events)
+        ]
+        with open(file_path, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms",
+                       "metadata": {"counters": dict(self.counters)}}, trace_file)
+
+    def _add_sample(self, name, seconds):
+        with self._lock:
+            if name not in self.durations:
+                self.durations[name] = deque(maxlen=PROFILE_MAX_SAMPLES)
+                self.totals[name] = [0, 0.0]
+            self.durations[name].append(seconds)
+            totals = self.totals[name]
+            totals[0] += 1
+            totals[1] += seconds
+
+
+# Process-wide profiler; set VAD_PROFILE=1 to enable it from the start
+profiler = Profiler(enabled=os.environ.get(PROFILE_ENV_VAR) == "1")
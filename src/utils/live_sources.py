@@ -0,0 +1,92 @@
+import socket
+import sys
+import threading
+import time
+
+from src.constants.app_constants import LIVE_CHUNK_MS, LIVE_SOCKET_TIMEOUT_S, VAD_SAMPLE_RATE
+
+
+class StdinSource:
+    """Raw mono 16-bit little-endian PCM piped into the process."""
+
+    def __init__(self, frame_rate=VAD_SAMPLE_RATE, stream=None):
+        self.frame_rate = frame_rate
+        self.stream = stream or sys.stdin.buffer
+        self.read_size = int(frame_rate * LIVE_CHUNK_MS / 1000) * 2
+
+    def read_chunks(self):
+        # read1 returns whatever is available instead of waiting for a full chunk
+        read = getattr(self.stream, "read1", self.stream.read)
+        while True:
+            data = read(self.read_size)
+            if not data:
+                break
+            yield data
+
+    def close(self):
+        pass  # Closing stdin would not wake a blocked read; the reader thread is a daemon
+
+
+class SocketSource:
+    """Raw mono 16-bit PCM sent by the first client connecting to a local TCP port."""
+
+    def __init__(self, host="127.0.0.1", port=0, frame_rate=VAD_SAMPLE_RATE):
+        self.frame_rate = frame_rate
+        self.server = socket.create_server((host, port))
+        self.server.settimeout(LIVE_SOCKET_TIMEOUT_S)
+        self.address = self.server.getsockname()  # Useful when port 0 picked a free port
+        self.read_size = int(frame_rate * LIVE_CHUNK_MS / 1000) * 2
+        self.connection = None
+        self.stop_event = threading.Event()
+
+    def read_chunks(self):
+        while self.connection is None and not self.stop_event.is_set():
+            try:
+                self.connection, _ = self.server.accept()
+            except socket.timeout:
+                continue  # Wake up regularly so close() can stop the wait
+        if self.connection is None:
+            return
+
+        self.connection.settimeout(LIVE_SOCKET_TIMEOUT_S)
+        while not self.stop_event.is_set():
+            try:
+                data = self.connection.recv(self.read_size)
+            except socket.timeout:
+                continue
+            if not data:
+                break
+            yield data
+
+    def close(self):
+        self.stop_event.set()
+        if self.connection:
+            self.connection.close()
+        self.server.close()
+
+
+class FileReplaySource:
+    """Replays an audio file at real-time pace (or speed times faster), for testing."""
+
+    def __init__(self, file_path, frame_rate=VAD_SAMPLE_RATE, speed=1.0):
+        self.file_path = file_path
+        self.frame_rate = frame_rate
+        self.speed = speed
+        self.chunk_samples = int(frame_rate * LIVE_CHUNK_MS / 1000)
+        self.stop_event = threading.Event()
+
+    def read_chunks(self):
+        from src.models.audio_model import decode_audio
+
+        audio_data, _ = decode_audio(self.file_path, self.frame_rate)
+        start = time.perf_counter()
+        for first in range(0, len(audio_data), self.chunk_samples):
+            # A chunk is released once its last sample would have been captured
+            end = min(first + self.chunk_samples, len(audio_data))
+            if self.stop_event.wait(max(start + end / self.frame_rate / self.speed
+                                        - time.perf_counter(), 0)):
+                break
+            yield audio_data[first:end].tobytes()
+
+    def close(self):
+        self.stop_event.set()
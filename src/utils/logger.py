@@ -4,6 +4,8 @@ import logging
 def get_logger(name):
     """Set up application-wide logger."""
     logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger  # Already configured; adding another handler would duplicate every line
     logger.setLevel(logging.DEBUG)
 
     # Create console handler and set level to debug
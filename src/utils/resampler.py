@@ -0,0 +1,113 @@
+from math import gcd
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from src.constants.app_constants import (
+    RESAMPLE_HALF_LENGTH, RESAMPLE_KAISER_BETA, RESAMPLE_BLOCK_ROWS, RESAMPLE_MIN_ROW_OUTPUTS
+)
+
+
+class PolyphaseResampler:
+    """Streaming rational resampler (up / down) with a Kaiser-windowed sinc low-pass filter.
+
+    Output sample n is the filter applied to the zero-stuffed input around n * down, so each
+    output only touches taps_per_phase input samples. Outputs are produced in rows of
+    row_outputs samples that advance the input by row_inputs samples; every row reads a fixed
+    window of the input, so process() can be fed chunks of any size.
+    """
+
+    def __init__(self, from_rate, to_rate):
+        divisor = gcd(from_rate, to_rate)
+        self.up = to_rate // divisor
+        self.down = from_rate // divisor
+
+        # Same design as scipy.signal.resample_poly: cutoff at the lower Nyquist rate
+        half_len = RESAMPLE_HALF_LENGTH * max(self.up, self.down)
+        cutoff = 1.0 / max(self.up, self.down)
+        taps = np.arange(2 * half_len + 1) - half_len
+        fir = np.sinc(cutoff * taps) * np.kaiser(2 * half_len + 1, RESAMPLE_KAISER_BETA)
+        fir *= self.up / fir.sum()
+
+        self.taps_per_phase = -(-len(fir) // self.up)
+        padded = np.zeros(self.taps_per_phase * self.up)
+        padded[:len(fir)] = fir
+        phase_major = padded.reshape(self.taps_per_phase, self.up).T
+
+        # Rows span several filter periods when up is small, so matrix products stay wide
+        periods = -(-RESAMPLE_MIN_ROW_OUTPUTS // self.up)
+        self.row_outputs = self.up * periods
+        self.row_inputs = self.down * periods
+
+        # Output p of a row reads taps_per_phase inputs from window_starts[p]
+        offsets = np.arange(self.row_outputs) * self.down + half_len
+        window_starts = offsets // self.up
+        taps_by_output = phase_major[offsets % self.up, ::-1].astype(np.float32)
+        self.row_span = int(window_starts[-1]) + self.taps_per_phase
+        self.bands = self._build_bands(window_starts, taps_by_output)
+
+        # The input is preceded by taps_per_phase - 1 zeros so early outputs see a full window
+        self._buffer = np.zeros(self.taps_per_phase - 1, dtype=np.float32)
+        self._consumed = 0  # Input samples received
+        self._emitted = 0  # Output samples produced
+
+    def process(self, samples):
+        """Resample the next chunk, returning every output sample it completes."""
+        self._consumed += len(samples)
+        self._buffer = np.concatenate((self._buffer, np.asarray(samples, dtype=np.float32)))
+        return self._emit_rows()
+
+    def flush(self):
+        """Return the remaining output samples once the input is exhausted."""
+        total = -(-self._consumed * self.up // self.down)
+        rows = -(-(total - self._emitted) // self.row_outputs)
+        needed = max((rows - 1) * self.row_inputs + self.row_span - len(self._buffer), 0)
+        self._buffer = np.concatenate((self._buffer, np.zeros(needed, dtype=np.float32)))
+        return self._emit_rows(limit=total - self._emitted)
+
+    def _build_bands(self, window_starts, taps_by_output):
+        """Group neighbouring outputs of a row into dense (window, outputs) tap matrices.
+
+        Neighbouring outputs read overlapping input windows, so each band is applied with one
+        matrix product; bands are sized so the zero padding stays comparable to the taps.
+        """
+        outputs_per_band = max(int(round(self.taps_per_phase * self.up / self.down)), 1)
+        bands = []
+        for first in range(0, self.row_outputs, outputs_per_band):
+            last = min(first + outputs_per_band, self.row_outputs)
+            offset = int(window_starts[first])
+            span = int(window_starts[last - 1]) - offset + self.taps_per_phase
+            matrix = np.zeros((span, last - first), dtype=np.float32)
+            for column, output in enumerate(range(first, last)):
+                start = int(window_starts[output]) - offset
+                matrix[start:start + self.taps_per_phase, column] = taps_by_output[output]
+            bands.append((first, last, offset, matrix))
+        return bands
+
+    def _emit_rows(self, limit=None):
+        rows = max((len(self._buffer) - self.row_span) // self.row_inputs + 1, 0)
+        output = np.empty((rows, self.row_outputs), dtype=np.float32)
+        item = self._buffer.itemsize
+
+        # Work through the rows in blocks so the gathered windows stay cache-sized
+        for row in range(0, rows, RESAMPLE_BLOCK_ROWS):
+            block_rows = min(RESAMPLE_BLOCK_ROWS, rows - row)
+            for first, last, offset, matrix in self.bands:
+                windows = as_strided(self._buffer[row * self.row_inputs + offset:],
+                                     shape=(block_rows, len(matrix)),
+                                     strides=(self.row_inputs * item, item), writeable=False)
+                output[row:row + block_rows, first:last] = windows @ matrix
+
+        self._buffer = self._buffer[rows * self.row_inputs:]
+        output = output.ravel()
+        if limit is not None:
+            output = output[:limit]
+        self._emitted += len(output)
+        return output
+
+
+def resample_poly(samples, from_rate, to_rate):
+    """Resample a whole signal from from_rate to to_rate, returning float32 samples."""
+    if from_rate == to_rate:
+        return np.asarray(samples, dtype=np.float32)
+    resampler = PolyphaseResampler(from_rate, to_rate)
+    return np.concatenate((resampler.process(samples), resampler.flush()))
@@ -0,0 +1,74 @@
+import threading
+from collections import deque
+
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-size int16 sample buffer shared by one writer thread and one reader.
+
+    Samples are addressed by their absolute index since the stream started. The writer never
+    blocks: once the buffer is full the oldest samples are overwritten, and readers asking
+    for them get None. The arrival time of every write is kept so a reader can measure how
+    long a sample waited before it was processed.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.buffer = np.zeros(capacity, dtype=np.int16)
+        self.written = 0  # Samples written since the stream started
+        self.closed = False
+        self.arrivals = deque()  # (end index, arrival time) per write still in the buffer
+        self.condition = threading.Condition()
+
+    @property
+    def oldest(self):
+        """Absolute index of the oldest sample still held."""
+        return max(self.written - self.capacity, 0)
+
+    def write(self, samples, arrival_time):
+        samples = np.asarray(samples, dtype=np.int16)
+        with self.condition:
+            end = self.written + len(samples)
+            kept = samples[-self.capacity:]  # A write larger than the buffer keeps its tail
+            first = (end - len(kept)) % self.capacity
+            head = min(len(kept), self.capacity - first)
+            self.buffer[first:first + head] = kept[:head]
+            self.buffer[:len(kept) - head] = kept[head:]
+            self.written = end
+
+            self.arrivals.append((end, arrival_time))
+            while self.arrivals and self.arrivals[0][0] <= self.oldest:
+                self.arrivals.popleft()
+            self.condition.notify_all()
+
+    def close(self):
+        """Mark the end of the stream and wake up a waiting reader."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def wait_for(self, end, timeout=None):
+        """Block until sample end - 1 has been written; False on timeout or end of stream."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.written >= end or self.closed, timeout)
+            return self.written >= end
+
+    def read(self, start, length):
+        """Copy of samples [start, start + length), or None if they were overwritten."""
+        with self.condition:
+            if start < self.oldest or start + length > self.written:
+                return None
+            first = start % self.capacity
+            head = min(length, self.capacity - first)
+            if head == length:
+                return self.buffer[first:first + length].copy()
+            return np.concatenate((self.buffer[first:], self.buffer[:length - head]))
+
+    def arrival_time(self, end):
+        """When sample end - 1 arrived, or None if it is no longer buffered."""
+        with self.condition:
+            for write_end, arrival_time in self.arrivals:
+                if write_end >= end:
+                    return arrival_time
+        return None
@@ -0,0 +1,136 @@
+import time
+from collections import deque
+
+import numpy as np
+from src.constants.app_constants import (
+    TICK_MIN_INTERVAL_MS, TICK_MAX_INTERVAL_MS, TICK_HIDDEN_INTERVAL_MS, TICK_RENDER_SHARE,
+    TICK_COST_SMOOTHING, TICK_STATS_WINDOW
+)
+from src.utils.instrumentation import profiler
+
+
+class TickScheduler:
+    """One UI refresh loop for every view that follows a clock, e.g. the playback position.
+
+    Each tick reads the clock once and hands the value to all subscribers, so the plot cursor,
+    slider and time labels always show the same instant. start() does nothing while the loop
+    runs, so toggling playback cannot stack up loops; the loop stops by itself after the first
+    tick at which is_active() is false, having drawn that final value.
+
+    The interval adapts to the measured redraw cost, so redraws take about TICK_RENDER_SHARE
+    of the Tk thread, within TICK_MIN_INTERVAL_MS and TICK_MAX_INTERVAL_MS. While is_visible()
+    is false nothing is drawn and ticks slow down to TICK_HIDDEN_INTERVAL_MS. A tick whose
+    clock value has not changed draws nothing, and refresh() requests made between ticks
+    (e.g. while the seek slider is dragged) are merged into one redraw.
+    """
+
+    def __init__(self, widget, clock, is_active, is_visible=None, timer=time.perf_counter):
+        self.widget = widget  # Anything with Tk's after(), after_idle() and after_cancel()
+        self.clock = clock
+        self.is_active = is_active
+        self.is_visible = is_visible or (lambda: True)
+        self.timer = timer
+        self.subscribers = []
+        self.after_id = None  # Pending tick, None while stopped
+        self.due = 0.0  # Timer value the pending tick should run at
+        self.interval_ms = TICK_MIN_INTERVAL_MS
+        self.refresh_pending = False
+        self.last_value = None  # Clock value last handed to the subscribers
+        self.render_cost = None  # Running average of a redraw's cost, in seconds
+
+        self.stats = {"ticks": 0, "renders": 0, "unchanged": 0, "hidden": 0, "coalesced": 0,
+                      "dropped_frames": 0}
+        self.jitters = deque(maxlen=TICK_STATS_WINDOW)  # Seconds each tick ran late
+        self.render_times = deque(maxlen=TICK_STATS_WINDOW)  # Seconds spent per redraw
+
+    @property
+    def running(self):
+        return self.after_id is not None
+
+    def subscribe(self, callback):
+        """Call callback(value) with the clock value on every redraw."""
+        self.subscribers.append(callback)
+
+    def start(self):
+        if self.after_id is None:
+            self._schedule(0)
+
+    def stop(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def refresh(self):
+        """Redraw once with the current clock value as soon as the Tk loop is idle."""
+        if self.refresh_pending:
+            self.stats["coalesced"] += 1
+            return
+        self.refresh_pending = True
+        self.widget.after_idle(self._refresh_now)
+
+    def get_stats(self):
+        """Counters, the current interval and jitter/redraw-cost percentiles in ms."""
+        stats = dict(self.stats, running=self.running, interval_ms=self.interval_ms)
+        for name, samples in (("jitter", self.jitters), ("render", self.render_times)):
+            samples_ms = np.array(samples) * 1000
+            has_samples = len(samples_ms) > 0
+            stats[f"{name}_p50_ms"] = float(np.percentile(samples_ms, 50)) if has_samples else 0.0
+            stats[f"{name}_p95_ms"] = float(np.percentile(samples_ms, 95)) if has_samples else 0.0
+            stats[f"{name}_max_ms"] = float(samples_ms.max()) if has_samples else 0.0
+        return stats
+
+    def _schedule(self, delay_ms):
+        self.due = self.timer() + delay_ms / 1000
+        self.after_id = self.widget.after(delay_ms, self._tick)
+
+    def _tick(self):
+        late = max(self.timer() - self.due, 0.0)
+        self.jitters.append(late)
+        self.stats["ticks"] += 1
+        dropped = int(late * 1000 // self.interval_ms)  # Ticks that should have run meanwhile
+        if dropped:
+            self.stats["dropped_frames"] += dropped
+            profiler.count("ui.dropped_frames", dropped)
+
+        active = self.is_active()
+        if active and not self.is_visible():
+            self.stats["hidden"] += 1
+            self.last_value = None  # Draw again as soon as the window is back
+            self.interval_ms = TICK_HIDDEN_INTERVAL_MS
+        else:
+            value = self.clock()
+            if value == self.last_value:
+                self.stats["unchanged"] += 1
+            else:
+                self._render(value)
+            self.interval_ms = self._adapted_interval()
+
+        if active:
+            self._schedule(self.interval_ms)
+        else:
+            self.after_id = None
+
+    def _refresh_now(self):
+        self.refresh_pending = False
+        self._render(self.clock())
+
+    def _render(self, value):
+        start = self.timer()
+        for callback in self.subscribers:
+            callback(value)
+        end = self.timer()
+        profiler.record("ui.render", start, end)
+
+        cost = end - start
+        self.render_times.append(cost)
+        if self.render_cost is None:
+            self.render_cost = cost
+        else:
+            self.render_cost += TICK_COST_SMOOTHING * (cost - self.render_cost)
+        self.last_value = value
+        self.stats["renders"] += 1
+
+    def _adapted_interval(self):
+        """Interval (ms) at which redraws take TICK_RENDER_SHARE of the time, within bounds."""
+        interval = (self.render_cost or 0.0) * 1000 / TICK_RENDER_SHARE
+        return int(min(max(interval, TICK_MIN_INTERVAL_MS), TICK_MAX_INTERVAL_MS))
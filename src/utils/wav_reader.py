@@ -0,0 +1,238 @@
+import io
+import struct
+import time
+from collections import namedtuple
+
+import numpy as np
+from src.constants.app_constants import VAD_SAMPLE_RATE, DECODE_CHUNK_FRAMES
+from src.utils.instrumentation import profiler
+from src.utils.resampler import PolyphaseResampler
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+WavInfo = namedtuple("WavInfo", ["format_tag", "channels", "frame_rate", "sample_width",
+                                 "data_offset", "num_frames"])
+
+# Scale factors bringing each sample type to the int16 range
+_INT16_SCALE = {1: 256.0, 2: 1.0, 3: 1.0 / 256, 4: 1.0 / 65536}
+
+
+def read_wav_info(file_path):
+    """Parse the RIFF header of a WAV file without reading the sample data.
+
+    Raises ValueError for files that are not PCM or IEEE-float WAVs, so callers can fall
+    back to a general-purpose decoder.
+    """
+    with open(file_path, "rb") as wav_file:
+        return parse_wav_header(wav_file, file_path)
+
+
+def parse_wav_header(wav_file, name="WAV data"):
+    """read_wav_info for an open binary file object, e.g. an io.BytesIO of an upload."""
+    header = wav_file.read(12)
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:] != b"WAVE":
+        raise ValueError(f"{name} is not a RIFF/WAVE file")
+
+    fmt = None
+    while True:
+        header = wav_file.read(8)
+        if len(header) < 8:
+            raise ValueError(f"{name} has no data chunk")
+        chunk_id, chunk_size = struct.unpack("<4sI", header)
+
+        if chunk_id == b"fmt ":
+            fmt = wav_file.read(chunk_size)
+            wav_file.seek(chunk_size % 2, 1)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError(f"{name} has no fmt chunk before its data")
+            data_offset = wav_file.tell()
+            break
+        else:
+            wav_file.seek(chunk_size + chunk_size % 2, 1)  # Chunks are word aligned
+
+    file_size = wav_file.seek(0, 2)
+
+    if len(fmt) < 16:
+        raise ValueError(f"{name} has a truncated fmt chunk")
+    format_tag, channels, frame_rate, _, block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+    if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        format_tag = struct.unpack("<H", fmt[24:26])[0]  # First field of the sub-format GUID
+
+    sample_width = bits // 8
+    supported = ((format_tag == WAVE_FORMAT_PCM and sample_width in (1, 2, 3, 4)) or
+                 (format_tag == WAVE_FORMAT_IEEE_FLOAT and sample_width in (4, 8)))
+    if not supported or channels < 1 or block_align != channels * sample_width:
+        raise ValueError(f"Unsupported WAV encoding in {name}: "
+                         f"format {format_tag}, {bits} bits")
+    if frame_rate <= 0:
+        raise ValueError(f"{name} has an invalid sample rate of {frame_rate} Hz")
+
+    # Some writers leave the data size at 0 or 0xFFFFFFFF when streaming; trust the file size
+    data_size = file_size - data_offset
+    if chunk_size not in (0, 0xFFFFFFFF):
+        data_size = min(chunk_size, data_size)
+    return WavInfo(format_tag, channels, frame_rate, sample_width, data_offset,
+                   data_size // block_align)
+
+
+def map_wav_samples(file_path, info=None):
+    """Memory-map the sample data as a (frames, channels) array in its stored encoding."""
+    info = info or read_wav_info(file_path)
+    dtype, shape = _sample_layout(info)
+    if info.num_frames == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(file_path, dtype=dtype, mode="r", offset=info.data_offset, shape=shape)
+
+
+def wav_samples_from_bytes(data, info):
+    """map_wav_samples for a WAV held in memory: a read-only view of data, not a copy."""
+    dtype, shape = _sample_layout(info)
+    return np.frombuffer(data, dtype=dtype, count=int(np.prod(shape)),
+                         offset=info.data_offset).reshape(shape)
+
+
+def _sample_layout(info):
+    """(dtype, shape) of the sample data as stored; 24-bit samples are kept as byte triples."""
+    if info.sample_width == 3:
+        return np.uint8, (info.num_frames, info.channels, 3)
+    if info.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        return f"<f{info.sample_width}", (info.num_frames, info.channels)
+    dtype = np.uint8 if info.sample_width == 1 else f"<i{info.sample_width}"
+    return dtype, (info.num_frames, info.channels)
+
+
+def to_mono_float(block, info):
+    """Convert a block of mapped frames to mono float32 samples on the int16 scale."""
+    if info.sample_width == 3:
+        # Assemble little-endian 24-bit samples into the top of an int32, keeping the sign
+        wide = block.astype(np.int32)
+        block = (wide[..., 0] << 8 | wide[..., 1] << 16 | wide[..., 2] << 24) >> 8
+
+    if info.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        scale, offset = 32768.0, 0.0
+    else:
+        scale, offset = _INT16_SCALE[info.sample_width], 128.0 if info.sample_width == 1 else 0.0
+
+    # Summing channel columns one at a time is much faster than mean() over the strided axis
+    mono = block[:, 0].astype(np.float32)
+    for channel in range(1, info.channels):
+        mono += block[:, channel]
+    if offset:
+        mono -= offset * info.channels
+    scale /= info.channels
+    if scale != 1.0:
+        mono *= scale
+    return mono
+
+
+def to_int16(samples):
+    """Round float samples on the int16 scale to int16, clipping out-of-range values."""
+    return np.clip(np.rint(samples), -32768, 32767).astype(np.int16)
+
+
+def iter_wav_chunks(file_path, target_rate=VAD_SAMPLE_RATE, chunk_frames=DECODE_CHUNK_FRAMES,
+                    timings=None):
+    """Decode a WAV file incrementally into mono int16 chunks at target_rate.
+
+    Only one chunk of the mapped file is converted at a time and the resampler carries its
+    state across chunks, so memory stays bounded by chunk_frames. If timings is a dict,
+    seconds spent per stage (read, convert, resample, quantize) are accumulated into it.
+    """
+    timings = {} if timings is None else timings
+    for stage in ("read", "convert", "resample", "quantize"):
+        timings.setdefault(stage, 0.0)
+
+    start = time.perf_counter()
+    info = read_wav_info(file_path)
+    samples = map_wav_samples(file_path, info)
+    _add_time(timings, "read", start)
+    yield from _iter_sample_chunks(samples, info, target_rate, chunk_frames, timings)
+
+
+def load_wav(file_path, target_rate=VAD_SAMPLE_RATE, timings=None):
+    """Load a whole WAV file as mono int16 at target_rate.
+
+    Uses the same chunked conversion as iter_wav_chunks, so both produce identical samples.
+    Returns (samples, target_rate); native mono 16-bit files come back as a read-only view
+    of the memory-mapped file.
+    """
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    info = read_wav_info(file_path)
+    samples = map_wav_samples(file_path, info)
+    _add_time(timings, "read", start)
+    return _load_samples(samples, info, target_rate, timings), target_rate
+
+
+def load_wav_bytes(data, target_rate=VAD_SAMPLE_RATE, info=None, timings=None):
+    """load_wav for a whole WAV file held in memory (bytes), e.g. an HTTP upload."""
+    info = info or parse_wav_header(io.BytesIO(data))
+    samples = wav_samples_from_bytes(data, info)
+    return _load_samples(samples, info, target_rate, {} if timings is None else timings), \
+        target_rate
+
+
+def _iter_sample_chunks(samples, info, target_rate, chunk_frames, timings):
+    """Mono int16 chunks at target_rate from a (frames, channels) array of stored samples."""
+    # Mono 16-bit PCM already at the target rate is served straight from the samples
+    if _is_native(info, target_rate):
+        for first in range(0, info.num_frames, chunk_frames):
+            yield samples[first:first + chunk_frames, 0]
+        return
+
+    resampler = None
+    if info.frame_rate != target_rate:
+        resampler = PolyphaseResampler(info.frame_rate, target_rate)
+    for first in range(0, info.num_frames, chunk_frames):
+        yield _decode_block(samples[first:first + chunk_frames], info, resampler, timings)
+    if resampler:
+        start = time.perf_counter()
+        tail = resampler.flush()
+        _add_time(timings, "resample", start)
+        yield _quantize(tail, timings)
+
+
+def _load_samples(samples, info, target_rate, timings):
+    if _is_native(info, target_rate):
+        return samples[:, 0]
+
+    output = np.empty(-(-info.num_frames * target_rate // info.frame_rate), dtype=np.int16)
+    filled = 0
+    for chunk in _iter_sample_chunks(samples, info, target_rate, DECODE_CHUNK_FRAMES, timings):
+        output[filled:filled + len(chunk)] = chunk
+        filled += len(chunk)
+    return output[:filled]
+
+
+def _is_native(info, target_rate):
+    return (info.format_tag == WAVE_FORMAT_PCM and info.sample_width == 2 and info.channels == 1
+            and info.frame_rate == target_rate)
+
+
+def _decode_block(block, info, resampler, timings):
+    start = time.perf_counter()
+    mono = to_mono_float(block, info)
+    _add_time(timings, "convert", start)
+
+    if resampler:
+        start = time.perf_counter()
+        mono = resampler.process(mono)
+        _add_time(timings, "resample", start)
+    return _quantize(mono, timings)
+
+
+def _quantize(samples, timings):
+    start = time.perf_counter()
+    quantized = to_int16(samples)
+    _add_time(timings, "quantize", start)
+    return quantized
+
+
+def _add_time(timings, stage, start):
+    """Accumulate a stage's time since start and report it as a decode.<stage> span."""
+    end = time.perf_counter()
+    timings[stage] = timings.get(stage, 0.0) + end - start
+    profiler.record(f"decode.{stage}", start, end)
@@ -0,0 +1,56 @@
+import struct
+
+from src.utils.wav_reader import WAVE_FORMAT_IEEE_FLOAT
+
+HEADER_SIZE = 44  # RIFF header, 16-byte fmt chunk and data chunk header
+_UNKNOWN_SIZE = 0xFFFFFFFF  # What streaming writers put in size fields that do not fit
+
+
+def wav_header(info, num_frames):
+    """RIFF/WAVE header for num_frames frames in the encoding of info (a WavInfo).
+
+    Sizes beyond the 4 GiB RIFF limit are written as 0xFFFFFFFF, which read_wav_info (like
+    most readers) takes as "up to the end of the file".
+    """
+    block_align = info.channels * info.sample_width
+    data_size = num_frames * block_align
+    riff_size = data_size + HEADER_SIZE - 8
+    # IEEE float data is tagged as such; everything else read_wav_info accepts is integer PCM
+    format_tag = WAVE_FORMAT_IEEE_FLOAT if info.format_tag == WAVE_FORMAT_IEEE_FLOAT else 1
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", min(riff_size, _UNKNOWN_SIZE), b"WAVE",
+        b"fmt ", 16, format_tag, info.channels, info.frame_rate,
+        info.frame_rate * block_align, block_align, info.sample_width * 8,
+        b"data", min(data_size, _UNKNOWN_SIZE))
+
+
+class RawWavWriter:
+    """Writes frames already in the target encoding (e.g. bytes copied from another WAV).
+
+    The header is written up front with a zero length and completed by close(), so frames
+    can be appended without knowing the final length.
+    """
+
+    def __init__(self, path, info):
+        self.info = info
+        self.num_frames = 0
+        self.file = open(path, "wb")
+        self.file.write(wav_header(info, 0))
+
+    def write(self, data):
+        self.file.write(data)
+        self.num_frames += len(data) // (self.info.channels * self.info.sample_width)
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.seek(0)
+        self.file.write(wav_header(self.info, self.num_frames))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,79 @@
+import numpy as np
+from src.constants.app_constants import PYRAMID_REDUCTION_FACTOR, PYRAMID_MIN_BLOCKS
+
+
+class WaveformPyramid:
+    """Multi-resolution min/max envelope of a signal, built once per file.
+
+    Level k holds the min and max of consecutive blocks of PYRAMID_REDUCTION_FACTOR ** (k + 1)
+    samples, so any visible range can be drawn with a number of points proportional to the
+    plot width instead of the file length.
+    """
+
+    def __init__(self, samples, frame_rate, factor=PYRAMID_REDUCTION_FACTOR):
+        self.samples = samples
+        self.frame_rate = frame_rate
+        self.factor = factor
+        self.levels = []  # (block_size, mins, maxs), finest first
+
+        mins, maxs, block_size = samples, samples, 1
+        while len(mins) > PYRAMID_MIN_BLOCKS:
+            starts = np.arange(0, len(mins), factor)
+            mins = np.minimum.reduceat(mins, starts)
+            maxs = np.maximum.reduceat(maxs, starts)
+            block_size *= factor
+            self.levels.append((block_size, mins, maxs))
+
+    @property
+    def nbytes(self):
+        """Memory held by the envelope levels (the samples belong to the caller)."""
+        return sum(mins.nbytes + maxs.nbytes for _, mins, maxs in self.levels)
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.frame_rate
+
+    def envelope(self, start_time, end_time, max_points):
+        """Return (times, values) for [start_time, end_time] using at most about max_points points.
+
+        Each block contributes its min and max, so peaks stay visible at every zoom level.
+        """
+        first, last = self._sample_range(start_time, end_time)
+        if last - first <= max_points:
+            times = np.arange(first, last) / self.frame_rate
+            return times, self.samples[first:last]
+
+        (block_starts, block_size), mins, maxs = self._blocks(first, last, max(max_points // 2, 1))
+        times = np.repeat(block_starts / self.frame_rate, 2)
+        times[1::2] += block_size / 2 / self.frame_rate  # Max sits mid-block, after the min
+        values = np.empty(2 * len(mins), dtype=self.samples.dtype)
+        values[0::2] = mins
+        values[1::2] = maxs
+        return times, values
+
+    def _sample_range(self, start_time, end_time):
+        first = max(int(np.floor(start_time * self.frame_rate)), 0)
+        last = min(int(np.ceil(end_time * self.frame_rate)) + 1, len(self.samples))
+        return first, max(last, first)
+
+    def _blocks(self, first, last, max_blocks):
+        """Min/max of the blocks covering [first, last), regrouped to at most max_blocks blocks.
+
+        Returns ((block_start_samples, block_size), mins, maxs).
+        """
+        ideal_block = int(np.ceil((last - first) / max_blocks))
+        block_size, mins, maxs = 1, self.samples, self.samples
+        for level_block, level_mins, level_maxs in self.levels:
+            if level_block > ideal_block:
+                break
+            block_size, mins, maxs = level_block, level_mins, level_maxs
+
+        # Regroup the chosen level on the fly so the point count matches the budget closely
+        group = max(-(-ideal_block // block_size), 1)
+        lo = first // (block_size * group) * group
+        hi = min(-(-last // block_size), len(mins))
+        starts = np.arange(lo, hi, group) - lo
+        mins = np.minimum.reduceat(mins[lo:hi], starts)
+        maxs = np.maximum.reduceat(maxs[lo:hi], starts)
+        block_starts = (lo + starts) * block_size
+        return (block_starts, block_size * group), mins, maxs
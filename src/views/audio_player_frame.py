@@ -1,7 +1,10 @@
-import os
 import customtkinter as ctk
-from tkinter import filedialog, Listbox
-from src.constants.app_constants import PLAY_BUTTON_LABEL, LOAD_BUTTON_LABEL
+from tkinter import filedialog
+from src.constants.app_constants import (
+    PLAY_BUTTON_LABEL, LOAD_BUTTON_LABEL, LIVE_BUTTON_LABEL, STOP_LIVE_BUTTON_LABEL,
+    SENSITIVITY_LABEL, VAD_MODES, PREFETCH_RADIUS, EXPORT_BUTTON_LABEL
+)
+from src.views.library_list import LibraryList
 
 
 class AudioPlayerFrame(ctk.CTkFrame):
@@ -10,14 +13,18 @@ class AudioPlayerFrame(ctk.CTkFrame):
 
         self.play_pause_btn = None
         self.load_btn = None
+        self.live_btn = None
+        self.export_btn = None
+        self.sensitivity_selector = None
         self.controller = controller
-        self.file_list = []  # List to hold the file names
-        self.audio_listbox = None  # Listbox to display files
+        self.library_list = None  # Files of the opened folder, from the library index
         self.folder_path = ''
         self.current_time_label = None
         self.total_time_label = None
         self.progress_slider = None
+        self.status_label = None  # Shows background loading progress
         self.slider_updating = False  # To prevent updating the slider during manual change
+        self.shown_times = None  # (current, total) texts of the time labels
 
         self.create_ui()
 
@@ -28,33 +35,75 @@ class AudioPlayerFrame(ctk.CTkFrame):
         self.load_btn = ctk.CTkButton(master=self, text=LOAD_BUTTON_LABEL, command=self.on_load_folder)
         self.load_btn.pack(pady=10)
 
-        # Listbox to display audio files
-        self.audio_listbox = Listbox(self, height=20, width=50)
-        self.audio_listbox.pack(pady=10)
-        self.audio_listbox.bind('<<ListboxSelect>>', self.on_select_audio)
+        # Sortable, filterable list of the folder's files with their length and speech content
+        self.library_list = LibraryList(self, on_select=self.on_select_audio)
+        self.library_list.pack(pady=10, fill="x")
 
         # Button to play selected audio
         self.play_pause_btn = ctk.CTkButton(master=self, text=PLAY_BUTTON_LABEL, command=self.on_play_audio)
         self.play_pause_btn.pack(pady=10)
 
+        # Button to replay the selected file in real time through live VAD
+        self.live_btn = ctk.CTkButton(master=self, text=LIVE_BUTTON_LABEL, command=self.on_toggle_live)
+        self.live_btn.pack(pady=10)
+
+        # Button to write the speech of the selected file to a folder
+        self.export_btn = ctk.CTkButton(master=self, text=EXPORT_BUTTON_LABEL, command=self.on_export)
+        self.export_btn.pack(pady=10)
+
+        # VAD aggressiveness; switching re-highlights the loaded file without re-analysis
+        ctk.CTkLabel(master=self, text=SENSITIVITY_LABEL).pack()
+        self.sensitivity_selector = ctk.CTkSegmentedButton(
+            master=self, values=[str(mode) for mode in VAD_MODES], command=self.on_sensitivity_change)
+        self.sensitivity_selector.pack(pady=(0, 10))
+
+        # Loading / analysis status of the selected file
+        self.status_label = ctk.CTkLabel(master=self, text="")
+        self.status_label.pack(pady=5)
+
         # Progress bar (slider) and time labels
         self.create_progress_bar()
 
     def on_load_folder(self):
-        """Load audio files from a folder and display in the listbox."""
+        """Open a folder; its files are listed at once and filled in as they are indexed."""
         self.folder_path = filedialog.askdirectory()  # Prompt user to select folder
         if self.folder_path:
-            self.file_list = [f for f in os.listdir(self.folder_path) if f.endswith(".wav")]
-            self.audio_listbox.delete(0, 'end')  # Clear current list
-            for file in self.file_list:
-                self.audio_listbox.insert('end', file)  # Add files to the listbox
-
-    def on_select_audio(self, event):
-        """Handle selection of an audio file from the list."""
-        selected_index = self.audio_listbox.curselection()
-        if selected_index:
-            selected_file = self.file_list[selected_index[0]]
-            self.controller.load_audio(os.path.join(self.folder_path, selected_file))
+            self.controller.open_folder(self.folder_path)
+
+    def show_folder(self, index, folder):
+        self.library_list.show_folder(index, folder)
+
+    def refresh_library(self, status):
+        """Pick up newly indexed files and metadata while a scan runs."""
+        self.library_list.refresh()
+        self.library_list.set_status(status)
+
+    def on_select_audio(self, file_path):
+        """Handle selection of an audio file from the list; its neighbours are prefetched."""
+        self.controller.load_audio(file_path, self.library_list.adjacent_files(PREFETCH_RADIUS))
+
+    def on_toggle_live(self):
+        """Start or stop the live replay of the selected file."""
+        self.set_live_active(self.controller.toggle_live())
+
+    def on_export(self):
+        """Export the speech of the selected file to a chosen folder."""
+        output_dir = filedialog.askdirectory()
+        if output_dir:
+            self.controller.export_speech(output_dir)
+
+    def set_live_active(self, active):
+        self.live_btn.configure(text=STOP_LIVE_BUTTON_LABEL if active else LIVE_BUTTON_LABEL)
+
+    def on_sensitivity_change(self, value):
+        self.controller.set_sensitivity(int(value))
+
+    def set_sensitivity(self, sensitivity):
+        self.sensitivity_selector.set(str(sensitivity))
+
+    def set_status(self, text):
+        """Show a short status message, or clear it with an empty string."""
+        self.status_label.configure(text=text)
 
     def on_play_audio(self):
         """Play the selected audio file."""
@@ -75,10 +124,15 @@ class AudioPlayerFrame(ctk.CTkFrame):
         """Update the progress bar and time labels."""
         self.slider_updating = True
         self.progress_slider.set(current_time / total_time * 100)
-        self.current_time_label.configure(text=self.format_time(current_time))
-        self.total_time_label.configure(text=self.format_time(total_time))
         self.slider_updating = False
 
+        # The labels only change once a second; reconfiguring them every tick would redraw them
+        times = (self.format_time(current_time), self.format_time(total_time))
+        if times != self.shown_times:
+            self.current_time_label.configure(text=times[0])
+            self.total_time_label.configure(text=times[1])
+            self.shown_times = times
+
     def format_time(self, seconds):
         """Convert seconds to a MM:SS string format."""
         if seconds < 0:
@@ -89,7 +143,7 @@ class AudioPlayerFrame(ctk.CTkFrame):
 
     def on_slider_change(self, value):
         """Handle manual slider change."""
-        if not self.slider_updating and self.controller.model.is_playing:
+        if not self.slider_updating and self.controller.model.audio_data is not None:
             # Seek to the corresponding position in the audio based on slider value
             total_time = self.controller.model.get_audio_duration()
             new_time = value / 100 * total_time
@@ -0,0 +1,170 @@
+import customtkinter as ctk
+from tkinter import ttk
+from src.constants.app_constants import LIBRARY_VISIBLE_ROWS, LIBRARY_FILTER_HINT
+
+# Column id, heading, width, and how a value is shown (None while the scan has not reached it)
+COLUMNS = (
+    ("name", "File", 220, str),
+    ("duration_s", "Length", 60, lambda v: f"{int(v // 60):02d}:{int(v % 60):02d}"),
+    ("frame_rate", "Rate", 55, lambda v: f"{v / 1000:g}k"),
+    ("channels", "Ch", 30, str),
+    ("speech_ratio", "Speech", 55, lambda v: f"{v * 100:.0f}%"),
+    ("num_segments", "Segs", 45, str),
+)
+
+
+class LibraryList(ctk.CTkFrame):
+    """Sortable, filterable list of a folder's files, backed by a LibraryIndex.
+
+    Only the visible rows exist as widgets. The sorted, filtered order is kept as a list of
+    index row ids, rebuilt by refresh() when the sort, filter or index contents change;
+    scrolling only fetches the rows of the new page, so it stays as fast for 50k files as
+    for 50.
+    """
+
+    def __init__(self, parent, on_select, visible_rows=LIBRARY_VISIBLE_ROWS):
+        super().__init__(parent)
+        self.on_select = on_select
+        self.visible_rows = visible_rows
+        self.index = None
+        self.folder = None
+        self.sort_by = "name"
+        self.descending = False
+        self.offset = 0
+        self.row_ids = []  # Index row ids of the listed files, in display order
+        self.selected_path = None
+
+        self.filter_entry = ctk.CTkEntry(master=self, placeholder_text=LIBRARY_FILTER_HINT)
+        self.filter_entry.pack(fill="x", pady=(0, 5))
+        self.filter_entry.bind("<KeyRelease>", lambda event: self.refresh(offset=0))
+
+        body = ctk.CTkFrame(master=self)
+        body.pack(fill="both", expand=True)
+        self.tree = ttk.Treeview(body, columns=[column[0] for column in COLUMNS], show="headings",
+                                 height=visible_rows, selectmode="browse")
+        for column, heading, width, _ in COLUMNS:
+            self.tree.heading(column, text=heading, command=lambda c=column: self.sort(c))
+            self.tree.column(column, width=width, stretch=column == "name",
+                             anchor="w" if column == "name" else "e")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
+        # Arrow keys walk the whole list, not just the rows on screen
+        self.tree.bind("<Down>", lambda event: self.select_relative(1))
+        self.tree.bind("<Up>", lambda event: self.select_relative(-1))
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll_by(-1 if event.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-1))  # X11 wheel
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(1))
+
+        self.status_label = ctk.CTkLabel(master=self, text="")
+        self.status_label.pack()
+
+    def show_folder(self, index, folder):
+        self.index = index
+        self.folder = folder
+        self.selected_path = None
+        self.refresh(offset=0)
+
+    def set_status(self, text):
+        self.status_label.configure(text=text)
+
+    def sort(self, column):
+        """Sort by column; clicking the current sort column reverses the order."""
+        self.descending = not self.descending if column == self.sort_by else False
+        self.sort_by = column
+        self.refresh(offset=0)
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+
+    def scroll_to(self, offset):
+        self.offset = offset
+        self._draw()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.row_ids)))
+        elif unit == "pages":
+            self.scroll_by(int(amount) * self.visible_rows)
+        else:
+            self.scroll_by(int(amount))
+
+    def refresh(self, offset=None):
+        """Re-sort and re-filter the list, e.g. when the scan has added files or metadata."""
+        if self.index is None:
+            return
+        self.row_ids = self.index.ordered_ids(self.folder, self.filter_entry.get(), self.sort_by,
+                                              self.descending)
+        if offset is not None:
+            self.offset = offset
+        self._draw()
+
+    def _draw(self):
+        """Show the page of rows starting at offset."""
+        if self.index is None:
+            return
+        total = len(self.row_ids)
+        self.offset = max(min(self.offset, total - self.visible_rows), 0)
+        rows = self.index.entries(self.row_ids[self.offset:self.offset + self.visible_rows])
+
+        self.tree.delete(*self.tree.get_children())
+        for row in rows:
+            values = [self._format(getattr(row, column), formatter)
+                      for column, _, _, formatter in COLUMNS]
+            self.tree.insert("", "end", iid=row.path, values=values)
+        if self.selected_path and self.tree.exists(self.selected_path):
+            self.tree.selection_set(self.selected_path)
+
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + len(rows)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def select_relative(self, step):
+        """Select the file step rows away from the current one, scrolling it into view."""
+        position = self._selected_position()
+        if position is None:
+            return "break"
+        position = max(min(position + step, len(self.row_ids) - 1), 0)
+        if not self.offset <= position < self.offset + self.visible_rows:
+            self.scroll_to(position - (self.visible_rows - 1 if step > 0 else 0))
+        page = self.tree.get_children()
+        if 0 <= position - self.offset < len(page):
+            self.tree.selection_set(page[position - self.offset])
+            self.tree.see(page[position - self.offset])
+        return "break"  # Replaces the Treeview's own handling
+
+    def adjacent_files(self, radius):
+        """Paths of up to radius files after and before the selection, nearest first."""
+        position = self._selected_position()
+        if position is None:
+            return []
+        after = self.index.entries(self.row_ids[position + 1:position + 1 + radius])
+        before = self.index.entries(self.row_ids[max(position - radius, 0):position])[::-1]
+        # Reviewing usually moves forward, so each next file comes before its previous twin
+        paths = []
+        for distance in range(radius):
+            for entries in (after, before):
+                if distance < len(entries):
+                    paths.append(entries[distance].path)
+        return paths
+
+    def _selected_position(self):
+        """Position of the selected file in the whole list, if it is on the current page."""
+        page = self.tree.get_children()
+        if self.selected_path not in page:
+            return None
+        return self.offset + page.index(self.selected_path)
+
+    def on_tree_select(self, event):
+        selection = self.tree.selection()
+        # Re-selecting the current file after a refresh must not load it again
+        if selection and selection[0] != self.selected_path:
+            self.selected_path = selection[0]
+            self.on_select(self.selected_path)
+
+    @staticmethod
+    def _format(value, formatter):
+        return "…" if value is None else formatter(value)
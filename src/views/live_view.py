@@ -0,0 +1,77 @@
+from collections import deque
+
+import numpy as np
+from src.constants.app_constants import LIVE_PLOT_BLOCK_MS, LIVE_PLOT_SECONDS
+
+
+class LiveView:
+    """Scrolling waveform and VAD trace for a live stream.
+
+    Incoming samples are reduced to one min/max pair per block as they arrive, so each
+    refresh only touches the new audio and the drawn point count stays fixed by the window.
+    """
+
+    def __init__(self, ax_waveform, ax_speech, frame_rate, window_seconds=LIVE_PLOT_SECONDS):
+        self.frame_rate = frame_rate
+        self.window_seconds = window_seconds
+        self.block_size = max(int(frame_rate * LIVE_PLOT_BLOCK_MS / 1000), 1)
+        self.max_blocks = int(window_seconds * frame_rate / self.block_size)
+        self.mins = np.empty(0, dtype=np.int16)
+        self.maxs = np.empty(0, dtype=np.int16)
+        self.first_block = 0  # Absolute block index of mins[0]
+        self.tail = np.empty(0, dtype=np.int16)  # Samples of the block still being filled
+        self.tail_start = None  # Absolute index of tail[0]
+        self.decisions = deque()  # (time in seconds, is_speech)
+
+        self.ax_waveform = ax_waveform
+        self.ax_speech = ax_speech
+        self.waveform_line, = ax_waveform.plot([], [], color='blue', alpha=0.7, label="Waveform")
+        self.speech_line, = ax_speech.plot([], [], color='red', drawstyle='steps-post',
+                                           label="Speech")
+        ax_waveform.set_ylim(-32768, 32767)
+        ax_speech.set_ylim(-0.1, 1.1)
+        ax_speech.set_yticks([0, 1], ["Silence", "Speech"])
+        self._scroll(0.0)
+
+    def append(self, start_sample, samples, decisions):
+        """Add newly received samples (starting at absolute start_sample) and decisions."""
+        if len(samples):
+            self._append_samples(start_sample, samples)
+        for decision in decisions:
+            self.decisions.append((decision.start_sample / self.frame_rate, decision.is_speech))
+
+        end_time = (self.first_block + len(self.mins)) * self.block_size / self.frame_rate
+        while self.decisions and self.decisions[0][0] < end_time - self.window_seconds:
+            self.decisions.popleft()
+
+        times = (self.first_block + np.repeat(np.arange(len(self.mins)), 2)) * self.block_size
+        values = np.column_stack((self.mins, self.maxs)).ravel()
+        self.waveform_line.set_data(times / self.frame_rate, values)
+        if self.decisions:
+            self.speech_line.set_data(*zip(*self.decisions))
+        self._scroll(end_time)
+
+    def _append_samples(self, start_sample, samples):
+        if self.tail_start is None or start_sample != self.tail_start + len(self.tail):
+            # First samples, or a gap after audio was overwritten: restart the trace there
+            self.first_block = start_sample // self.block_size
+            self.tail_start = self.first_block * self.block_size
+            self.tail = np.zeros(start_sample - self.tail_start, dtype=np.int16)
+            self.mins = self.maxs = np.empty(0, dtype=np.int16)
+
+        samples = np.concatenate((self.tail, samples))
+        full = len(samples) // self.block_size * self.block_size
+        blocks = samples[:full].reshape(-1, self.block_size)
+        self.mins = np.concatenate((self.mins, blocks.min(axis=1)))
+        self.maxs = np.concatenate((self.maxs, blocks.max(axis=1)))
+        self.tail = samples[full:]
+        self.tail_start += full
+
+        excess = len(self.mins) - self.max_blocks
+        if excess > 0:
+            self.mins, self.maxs = self.mins[excess:], self.maxs[excess:]
+            self.first_block += excess
+
+    def _scroll(self, end_time):
+        start_time = max(end_time - self.window_seconds, 0.0)
+        self.ax_waveform.set_xlim(start_time, start_time + self.window_seconds)
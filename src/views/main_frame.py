@@ -1,21 +1,24 @@
+import time
+
 import customtkinter as ctk
 from src.views.audio_player_frame import AudioPlayerFrame
 from src.views.plot_frame import PlotFrame
 from src.controllers.audio_controller import AudioPlayerController
 from src.models.audio_model import AudioPlayerModel
 from src.services.vad_service import VADService
-from src.models.audio_model import AudioPlayerModel
-from src.controllers.audio_controller import AudioPlayerController
-from src.services.vad_service import VADService
+from src.services.cache_service import AudioCache
+from src.services.library_service import LibraryIndex
 from src.config.config import AppConfig
+from src.utils.instrumentation import profiler
+from src.utils.logger import get_logger
 from src.constants.app_constants import (
-    PLAY_BUTTON_LABEL, PAUSE_BUTTON_LABEL, LOAD_BUTTON_LABEL, AUDIO_FILE_TYPES,
-    WINDOW_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT, SEEKBAR_MIN, SEEKBAR_MAX
+    WINDOW_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT, PROFILE_TRACE_FILE
 )
 
 
 class MainFrame(ctk.CTk):
-    def __init__(self):
+    def __init__(self, started_at=None):
+        """started_at: perf_counter() at process start, to log how long startup took."""
         super().__init__()
 
         # Set window properties
@@ -28,7 +31,7 @@ class MainFrame(ctk.CTk):
 
         # Initialize the VAD service and model
         vad_service = VADService(sensitivity=config.get_vad_sensitivity())
-        model = AudioPlayerModel(vad_service)
+        model = AudioPlayerModel(vad_service, cache=AudioCache())
 
         # Create frames
         self.audio_frame = AudioPlayerFrame(self, None)
@@ -38,8 +41,33 @@ class MainFrame(ctk.CTk):
         self.plot_frame.pack(side='right', fill='both', expand=True, padx=10, pady=10)
 
         # Initialize controller with both frames
-        controller = AudioPlayerController(model, self.audio_frame, self.plot_frame)
+        controller = AudioPlayerController(model, self.audio_frame, self.plot_frame,
+                                           library=LibraryIndex())
+        self.controller = controller
 
         # Set controller in frames
         self.audio_frame.controller = controller
         self.plot_frame.controller = controller
+        self.audio_frame.set_sensitivity(vad_service.sensitivity)
+
+        # Stop the background loader before the window goes away
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        if started_at is not None:
+            self.after_idle(self._report_startup, started_at)
+
+    @staticmethod
+    def _report_startup(started_at):
+        """Log the time from process start until the event loop first goes idle."""
+        now = time.perf_counter()
+        profiler.record("startup", started_at, now)
+        get_logger(__name__).info(f"Window ready {(now - started_at) * 1000:.0f} ms after start.")
+
+    def on_close(self):
+        self.controller.shutdown()
+        if profiler.enabled:
+            # Session summary in the log, full timeline for chrome://tracing or Perfetto
+            logger = get_logger(__name__)
+            logger.info(f"Timing summary for this session:\n{profiler.format_summary()}")
+            profiler.export_chrome_trace(PROFILE_TRACE_FILE)
+            logger.info(f"Wrote Chrome trace to {PROFILE_TRACE_FILE}.")
+        self.destroy()
@@ -0,0 +1,74 @@
+import time
+from collections import deque
+
+import numpy as np
+from src.constants.app_constants import CURSOR_STATS_WINDOW
+from src.utils.instrumentation import profiler
+
+
+class BlitCursor:
+    """Playback cursor that moves its lines by blitting over a cached static background.
+
+    The background is captured on every full canvas draw (initial plot, resize, zoom/pan),
+    so each tick only restores pixels and redraws the cursor lines instead of re-rendering
+    the waveform, energy trace and VAD highlights.
+    """
+
+    def __init__(self, canvas, lines):
+        self.canvas = canvas
+        self.lines = lines
+        self.background = None
+        self.frame_times = deque(maxlen=CURSOR_STATS_WINDOW)  # Seconds spent per update
+        self.frame_stamps = deque(maxlen=CURSOR_STATS_WINDOW)  # perf_counter at each update
+
+        for line in self.lines:
+            line.set_animated(True)  # Keep the lines out of the cached background
+        self._draw_cid = self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def update(self, x_position):
+        """Move every cursor line to x_position and repaint only the affected axes."""
+        start = time.perf_counter()
+        for line in self.lines:
+            line.set_xdata([x_position])
+
+        if self.background is None:
+            # No full draw has happened yet; the draw_event will cache the background
+            self.canvas.draw_idle()
+        else:
+            self.canvas.restore_region(self.background)
+            self._draw_lines()
+            for axes in {line.axes for line in self.lines}:
+                self.canvas.blit(axes.bbox)
+
+        end = time.perf_counter()
+        profiler.record("plot.cursor", start, end)
+        self.frame_times.append(end - start)
+        self.frame_stamps.append(end)
+
+    def disconnect(self):
+        """Stop listening to canvas draws, e.g. before the axes are cleared for a new file."""
+        self.canvas.mpl_disconnect(self._draw_cid)
+        self.background = None
+
+    def get_frame_stats(self):
+        """Summarize recent cursor updates: render cost in ms and the achieved update rate."""
+        if not self.frame_times:
+            return {"frames": 0, "mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0, "updates_per_s": 0.0}
+
+        frame_ms = np.array(self.frame_times) * 1000
+        span = self.frame_stamps[-1] - self.frame_stamps[0]
+        return {
+            "frames": len(frame_ms),
+            "mean_ms": float(frame_ms.mean()),
+            "p95_ms": float(np.percentile(frame_ms, 95)),
+            "max_ms": float(frame_ms.max()),
+            "updates_per_s": (len(self.frame_stamps) - 1) / span if span > 0 else 0.0,
+        }
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_lines()
+
+    def _draw_lines(self):
+        for line in self.lines:
+            line.axes.draw_artist(line)
@@ -1,49 +1,131 @@
 import tkinter as tk
 import customtkinter as ctk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
 import numpy as np
+from src.constants.app_constants import FRAME_DURATION_MS, WAVEFORM_POINTS_PER_PIXEL
+from src.services.vad_service import VADService
+from src.utils.frame_energy import FrameEnergy
+from src.utils.instrumentation import profiler
+from src.utils.waveform_pyramid import WaveformPyramid
+from src.views.live_view import LiveView
+from src.views.playback_cursor import BlitCursor
+
+
+def profiled_tk_canvas(figure, master):
+    """Tk canvas for figure whose full redraws are recorded as canvas.draw spans."""
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+    class ProfiledTkCanvas(FigureCanvasTkAgg):
+        def draw(self):
+            with profiler.span("canvas.draw"):
+                super().draw()
+
+    return ProfiledTkCanvas(figure, master=master)
 
 
 class PlotFrame(ctk.CTkFrame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
-        self.playback_line_waveform = None  # Line for playback position in waveform plot
-        self.playback_line_energy = None  # Line for playback position in energy plot
+        self._init_plot_state()
+        self.fig = self.canvas = self.toolbar = None
 
         # Create a standard tk.Frame to hold the matplotlib plot
         self.plot_container = tk.Frame(self)
         self.plot_container.pack(fill='both', expand=True, padx=20, pady=20)
 
+        # matplotlib takes longer to import than the rest of the app takes to start, so the
+        # figure is built once the window is on screen, or when a plot is needed before that
+        self.plot_container.bind('<Map>', lambda event: self.after_idle(self._build_canvas))
+
+    @classmethod
+    def create_headless(cls):
+        """A PlotFrame drawing to an off-screen Agg canvas, without Tk (benchmarks, tests)."""
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        frame = cls.__new__(cls)
+        frame.controller = None
+        frame._init_plot_state()
+        frame._create_figure()
+        frame.canvas = FigureCanvasAgg(frame.fig)
+        return frame
+
+    def _build_canvas(self):
+        """Create the figure and its Tk canvas and toolbar; does nothing once they exist."""
+        if self.canvas is not None:
+            return
+        from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
+
+        with profiler.span("plot.build"):
+            self._create_figure()
+            self.canvas = profiled_tk_canvas(self.fig, self.plot_container)
+            self.canvas.get_tk_widget().pack(fill='both', expand=True)
+
+            # Toolbar for zoom/pan; the envelope is re-sampled whenever the visible range changes
+            self.toolbar = NavigationToolbar2Tk(self.canvas, self.plot_container)
+            self.toolbar.update()
+            self.canvas.mpl_connect('resize_event', lambda event: self._refresh_envelope())
+
+    def _init_plot_state(self):
+        self.playback_line_waveform = None  # Line for playback position in waveform plot
+        self.playback_line_energy = None  # Line for playback position in energy plot
+        self.pyramid = None  # Min/max envelope pyramid of the current file
+        self.frame_energy = None  # Per-frame RMS of the current file, for the energy trace
+        self.waveform_line = None
+        self.energy_line = None
+        self.cursor = None  # Blitted playback cursor for the current plot
+        self.speech_highlight = None  # Compound patch marking the detected speech segments
+        self.live_view = None  # Scrolling view while a live stream is shown
+
+    def _create_figure(self):
+        """Create the matplotlib figure, independent of any Tk widget.
+
+        Kept separate from the canvas so the figure can be driven headless with an Agg canvas.
+        """
+        import matplotlib.pyplot as plt
+
         # Create the matplotlib figure with two subplots
         self.fig, (self.ax_waveform, self.ax_energy) = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
 
-        # Create the canvas and attach it to the tk.Frame
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_container)
-        self.canvas.get_tk_widget().pack(fill='both', expand=True)
-
-    def plot_waveform(self, audio_data, frame_rate, vad_result):
-        """Plot the waveform and energy plot with VAD results."""
+    def plot_waveform(self, audio_data, frame_rate, speech_segments, pyramid=None,
+                      frame_energy=None):
+        """Plot the waveform and energy plot with VAD speech segments (sample pairs).
+
+        A pyramid and frame energy already built for audio_data (e.g. on a loader thread) can
+        be passed in.
+        """
+        self._build_canvas()
+        with profiler.span("plot.waveform"):
+            self._plot_waveform(audio_data, frame_rate, speech_segments, pyramid, frame_energy)
+
+    def _plot_waveform(self, audio_data, frame_rate, speech_segments, pyramid, frame_energy):
+        if self.cursor:
+            self.cursor.disconnect()
+        self.live_view = None
         self.ax_waveform.clear()
         self.ax_energy.clear()
 
-        # Time axis in seconds
-        time_axis = np.linspace(0, len(audio_data) / frame_rate, num=len(audio_data))
+        # Build the envelope pyramid once; only about two points per pixel are drawn
+        self.pyramid = pyramid or WaveformPyramid(audio_data, frame_rate)
+        self.frame_energy = frame_energy or FrameEnergy.from_audio(
+            audio_data, frame_rate, *VADService.frame_geometry(frame_rate, FRAME_DURATION_MS))
+        duration = self.pyramid.duration
+        times, values = self.pyramid.envelope(0, duration, self._max_points())
+        energy_times, energy = self.frame_energy.envelope(0, duration, self._max_points() // 2)
 
         # Plot waveform in the first subplot (ax_waveform)
-        self.ax_waveform.plot(time_axis, audio_data, color='blue', label="Waveform", alpha=0.7)
+        self.waveform_line, = self.ax_waveform.plot(times, values, color='blue', label="Waveform",
+                                                    alpha=0.7)
         self.ax_waveform.set_ylabel("Amplitude", fontsize=12)
         self.ax_waveform.set_title(
-            f"Audio Waveform with VAD - Total Duration: {len(audio_data) / frame_rate:.2f} seconds", fontsize=14,
+            f"Audio Waveform with VAD - Total Duration: {duration:.2f} seconds", fontsize=14,
             fontweight='bold')
 
         # Highlight speech segments based on VAD results
-        self._highlight_vad_segments(time_axis, audio_data, vad_result, frame_rate)
+        self._highlight_vad_segments(speech_segments, frame_rate)
 
-        # Calculate and plot energy in the second subplot (ax_energy)
-        energy = np.abs(audio_data)
-        self.ax_energy.plot(time_axis, energy, color='green', label="Energy", alpha=0.7)
+        # Plot the per-frame RMS energy (the VAD frame grid) in the second subplot (ax_energy)
+        self.energy_line, = self.ax_energy.plot(energy_times, energy, color='green', label="Energy",
+                                                alpha=0.7)
         self.ax_energy.set_ylabel("Energy", fontsize=12)
         self.ax_energy.set_xlabel("Time (seconds)", fontsize=12)
 
@@ -52,62 +134,108 @@ class PlotFrame(ctk.CTkFrame):
         self.ax_energy.grid(True)
 
         # Link the x-axis for both plots
-        self.ax_waveform.set_xlim(0, len(audio_data) / frame_rate)
-        self.ax_energy.set_xlim(0, len(audio_data) / frame_rate)
+        self.ax_waveform.set_xlim(0, duration)
+        self.ax_energy.set_xlim(0, duration)
+
+        # Axes.clear() drops callbacks, so reconnect the zoom/pan hook for this plot
+        self.ax_waveform.callbacks.connect('xlim_changed', lambda ax: self._refresh_envelope())
 
         # Create playback indicator line, initially at time 0, in both subplots
         self.playback_line_waveform = self.ax_waveform.axvline(0, color='red', linestyle='-', label='Playback Position')
         self.playback_line_energy = self.ax_energy.axvline(0, color='red', linestyle='-')
+        self.cursor = BlitCursor(self.canvas, [self.playback_line_waveform, self.playback_line_energy])
 
         # Redraw the canvas
         self.fig.tight_layout()
         # self.canvas.draw()
         self.canvas.draw_idle()
 
+    def highlight_speech_segments(self, speech_segments, frame_rate):
+        """Replace the speech highlights of the current plot, e.g. once background VAD finishes."""
+        if self.pyramid is None:
+            return
+        with profiler.span("plot.highlight"):
+            if self.speech_highlight:
+                self.speech_highlight.remove()
+            self._highlight_vad_segments(speech_segments, frame_rate)
+        self.canvas.draw_idle()
+
+    def start_live_view(self, frame_rate):
+        """Replace the file plot with a scrolling view of a live stream."""
+        self._build_canvas()
+        if self.cursor:
+            self.cursor.disconnect()
+            self.cursor = None
+        self.pyramid = self.frame_energy = self.waveform_line = self.energy_line = None
+        self.ax_waveform.clear()
+        self.ax_energy.clear()
+
+        self.live_view = LiveView(self.ax_waveform, self.ax_energy, frame_rate)
+        self.ax_waveform.set_title("Live Stream with VAD", fontsize=14, fontweight='bold')
+        self.ax_waveform.set_ylabel("Amplitude", fontsize=12)
+        self.ax_energy.set_ylabel("VAD", fontsize=12)
+        self.ax_energy.set_xlabel("Time (seconds)", fontsize=12)
+        self.ax_waveform.grid(True)
+        self.ax_energy.grid(True)
+        self.fig.tight_layout()
+        self.canvas.draw_idle()
+
+    def update_live_view(self, start_sample, samples, decisions):
+        """Append live samples and VAD decisions, then scroll to the newest audio."""
+        if self.live_view is None:
+            return
+        with profiler.span("plot.live"):
+            self.live_view.append(start_sample, samples, decisions)
+        self.canvas.draw_idle()
+
+    def stop_live_view(self):
+        self.live_view = None
+
     def update_playback_position(self, current_time):
         """Update the position of the playback line in both the waveform and energy plots."""
-        if self.playback_line_waveform and self.playback_line_energy:
-            # Update the position of both playback lines
-            self.playback_line_waveform.set_xdata([current_time])  # Move the line to the current time in waveform plot
-            self.playback_line_energy.set_xdata([current_time])  # Move the line to the current time in energy plot
-            self.canvas.draw()
-
-    def _highlight_vad_segments(self, time_axis, audio_data, vad_result, frame_rate):
-        """Highlight the detected speech and non-speech segments in the waveform plot."""
+        if self.cursor:
+            # Only the two cursor lines are repainted; the static plot comes from the cached background
+            self.cursor.update(current_time)
+
+    def _max_points(self):
+        """Point budget for the current axes width in pixels."""
+        return max(int(self.ax_waveform.bbox.width * WAVEFORM_POINTS_PER_PIXEL), 2)
+
+    def _refresh_envelope(self):
+        """Re-sample both traces for the visible time range at the current resolution."""
+        if self.pyramid is None or self.waveform_line is None:
+            return
+        with profiler.span("plot.envelope"):
+            start_time, end_time = self.ax_waveform.get_xlim()
+            max_points = self._max_points()
+            self.waveform_line.set_data(*self.pyramid.envelope(start_time, end_time, max_points))
+            self.energy_line.set_data(*self.frame_energy.envelope(start_time, end_time,
+                                                                  max_points // 2))
+        self.canvas.draw_idle()
+
+    def _highlight_vad_segments(self, speech_segments, frame_rate):
+        """Highlight the detected speech segments in the waveform plot with a single artist."""
+        from matplotlib.patches import PathPatch
+        from matplotlib.path import Path
+
         speech_color = 'red'
         speech_alpha = 0.2
 
-        # Convert VAD result list into segments with start and end times
-        speech_segments = []
-        segment_start = None
-
-        for i, is_speech in enumerate(vad_result):
-            if is_speech and segment_start is None:
-                segment_start = i
-            elif not is_speech and segment_start is not None:
-                speech_segments.append((segment_start, i))
-                segment_start = None
-
-        if segment_start is not None:
-            speech_segments.append((segment_start, len(vad_result)))
-
-        # Highlight detected speech segments in the waveform plot
-        for start, end in speech_segments:
-            start_time = start * (len(audio_data) / len(vad_result)) / frame_rate
-            end_time = end * (len(audio_data) / len(vad_result)) / frame_rate
-            self.ax_waveform.axvspan(start_time, end_time, color=speech_color, alpha=speech_alpha,
-                                     label="Speech" if start == 0 else "")
-
-        # Display markers for speech start and end boundaries
-        # for start, end in speech_segments:
-        #     start_time = start * (len(audio_data) / len(vad_result)) / frame_rate
-        #     end_time = end * (len(audio_data) / len(vad_result)) / frame_rate
-        #     self.ax_waveform.axvline(start_time, color='black', linestyle='--',
-        #                              label="Speech Start" if start == 0 else "")
-        #     self.ax_waveform.axvline(end_time, color='black', linestyle='--',
-        #                              label="Speech End" if end == len(vad_result) else "")
+        # All segments form one compound path of rectangles (x in seconds, y in axes units),
+        # so highlighting costs a single artist regardless of how many segments there are
+        times = np.asarray(speech_segments, dtype=np.float64).reshape(-1, 2) / frame_rate
+        vertices = np.empty((len(times), 5, 2))
+        vertices[:, :, 0] = times[:, [0, 0, 1, 1, 0]]
+        vertices[:, :, 1] = [0, 1, 1, 0, 0]
+        codes = np.tile([Path.MOVETO, Path.LINETO, Path.LINETO, Path.LINETO, Path.CLOSEPOLY],
+                        len(times))
+        highlights = PathPatch(Path(vertices.reshape(-1, 2), codes), facecolor=speech_color,
+                               alpha=speech_alpha, edgecolor='none', label="Speech",
+                               transform=self.ax_waveform.get_xaxis_transform())
+        self.ax_waveform.add_artist(highlights)
+        self.speech_highlight = highlights
 
         # Add label only once to avoid repetition in the legend
         handles, labels = self.ax_waveform.get_legend_handles_labels()
         by_label = dict(zip(labels, handles))  # Remove duplicate labels
-        self.ax_waveform.legend(by_label.values(), by_label.keys())
+        self.ax_waveform.legend(by_label.values(), by_label.keys(), loc='upper right')  # 'best' is slow